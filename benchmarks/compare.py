@@ -0,0 +1,54 @@
+"""
+Compare two benchmark results written by `benchmarks/run.py --output`.
+    
+    python benchmarks/compare.py baseline.json candidate.json
+"""
+from pathlib import Path
+from typing import Any
+import argparse
+import json
+
+METRICS: list[tuple[str, bool]] = [
+    # (metric, higher is better)
+    ("throughput", True),
+    ("p50", False),
+    ("p99", False),
+    ("peak_memory", False)
+]
+
+def describe(report: dict[str, Any]) -> str:
+    meta: dict[str, Any] = report["meta"]
+    commit: str = (meta.get("commit") or "unknown")[:10]
+    return commit + (" (dirty)" if meta.get("dirty") else "")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+    
+    baseline: dict[str, Any] = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate: dict[str, Any] = json.loads(args.candidate.read_text(encoding="utf-8"))
+    
+    if baseline["meta"]["parameters"] != candidate["meta"]["parameters"]:
+        print("warning: the runs used different parameters\n")
+    
+    print(f"{'scenario':<28} {'metric':<12} {describe(baseline):>16} {describe(candidate):>16} {'change':>9}")
+    for scenario, before in baseline["results"].items():
+        after: dict[str, Any] | None = candidate["results"].get(scenario)
+        if after is None:
+            continue
+        
+        for metric, higher_is_better in METRICS:
+            if metric not in before or metric not in after or not before[metric]:
+                continue
+            
+            change: float = (after[metric] - before[metric]) / before[metric] * 100
+            better: bool = change > 0 if higher_is_better else change < 0
+            print(
+                f"{scenario:<28} {metric:<12} {before[metric]:>16.6g} {after[metric]:>16.6g}"
+                f" {change:>+8.1f}%{'' if abs(change) < 5 else (' better' if better else ' worse')}"
+                )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
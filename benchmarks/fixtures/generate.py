@@ -0,0 +1,331 @@
+"""
+Generate the benchmark fixtures.
+
+The fixtures follow the markup of nyaa.si and sukebei.nyaa.si pages, with deterministic contents
+so results stay comparable across commits. Regenerate with `python benchmarks/fixtures/generate.py`.
+"""
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+import random
+
+FIXTURES_DIR: Path = Path(__file__).parent
+SEED: int = 29
+
+SITES: dict[str, dict] = {
+    "fun": {
+        "base_url": "https://nyaa.si",
+        "title": "Nyaa",
+        "icons": "nyaa",
+        "categories": {
+            "1_2": "Anime - English-translated",
+            "1_3": "Anime - Non-English-translated",
+            "1_4": "Anime - Raw",
+            "2_1": "Audio - Lossless",
+            "3_1": "Literature - English-translated",
+            "4_4": "Live Action - Raw",
+            "6_2": "Software - Games"
+        }
+    },
+    "fap": {
+        "base_url": "https://sukebei.nyaa.si",
+        "title": "Sukebei",
+        "icons": "sukebei",
+        "categories": {
+            "1_1": "Art - Anime",
+            "1_2": "Art - Doujinshi",
+            "1_3": "Art - Games",
+            "1_4": "Art - Manga",
+            "2_2": "Real Life - Videos"
+        }
+    }
+}
+
+TORRENT_TYPES: list[tuple[str, str, str]] = [
+    # (row class, nyaa:trusted, nyaa:remake)
+    ("default", "No", "No"),
+    ("success", "Yes", "No"),
+    ("danger", "No", "Yes")
+]
+USER_TITLES: list[str] = ["User", "User", "User", "Trusted", "Moderator", "Administrator", "User BANNED"]
+WORDS: list[str] = [
+    "Shingeki", "Kyojin", "Frieren", "Sousou", "Dungeon", "Meshi", "Spy", "Family", "Bocchi", "Rock",
+    "Oshi", "Ko", "Mushoku", "Tensei", "Vinland", "Saga", "Chainsaw", "Man", "Kaguya", "Sama"
+]
+GROUPS: list[str] = ["SubsPlease", "Erai-raws", "EMBER", "Judas", "ASW", "Anime Time", "Yameii", "DKB"]
+
+def make_name(rng: random.Random, view_id: int) -> str:
+    words: str = " ".join(rng.sample(WORDS, 3))
+    return f"[{rng.choice(GROUPS)}] {words} - {view_id % 24 + 1:02d} (1080p) [{rng.getrandbits(32):08X}].mkv"
+
+def make_size(rng: random.Random) -> str:
+    unit: str = rng.choice(["MiB", "GiB", "KiB"])
+    return f"{rng.uniform(1, 1000):.1f} {unit}"
+
+def make_info_hash(rng: random.Random) -> str:
+    return f"{rng.getrandbits(160):040x}"
+
+def search_page(site: str, rng: random.Random) -> str:
+    config: dict = SITES[site]
+    rows: list[str] = []
+    for index in range(75):
+        view_id: int = 1_800_000 - index
+        row_class, _, _ = rng.choice(TORRENT_TYPES)
+        category_id, category_title = rng.choice(list(config["categories"].items()))
+        name: str = escape(make_name(rng, view_id))
+        comments: int = rng.choice([0, 0, 0, 1, 2, 5, 12])
+        comments_link: str = (
+            f'<a href="/view/{view_id}#comments" class="comments" title="{comments} comments">'
+            f'<i class="fa fa-comments-o"></i>{comments}</a>'
+            ) if comments else ""
+        rows.append(f"""<tr class="{row_class}">
+<td>
+<a href="/?c={category_id}" title="{category_title}">
+<img src="/static/img/icons/{config["icons"]}/{category_id}.png" alt="{category_title}" class="category-icon">
+</a>
+</td>
+<td colspan="2">
+{comments_link}
+<a href="/view/{view_id}" title="{name}">{name}</a>
+</td>
+<td class="text-center">
+<a href="/download/{view_id}.torrent"><i class="fa fa-fw fa-download"></i></a>
+<a href="magnet:?xt=urn:btih:{make_info_hash(rng)}&amp;dn={name}&amp;tr=http%3A%2F%2Fnyaa.tracker.wf%3A7777%2Fannounce"><i class="fa fa-fw fa-magnet"></i></a>
+</td>
+<td class="text-center">{make_size(rng)}</td>
+<td class="text-center" data-timestamp="{1_700_000_000 - index * 600}">2023-11-14 22:13</td>
+<td class="text-center">{rng.randint(0, 3000)}</td>
+<td class="text-center">{rng.randint(0, 300)}</td>
+<td class="text-center">{rng.randint(0, 50000)}</td>
+</tr>""")
+    
+    pages: str = "\n".join(f'<li><a href="/?p={page}">{page}</a></li>' for page in range(2, 7))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{config["title"]}</title>
+<link rel="stylesheet" href="/static/css/main.css">
+</head>
+<body>
+<nav class="navbar navbar-default navbar-static-top navbar-inverse"><div class="container"><a class="navbar-brand" href="/">{config["title"]}</a></div></nav>
+<div class="container">
+<div class="table-responsive">
+<table class="table table-bordered table-hover table-striped torrent-list">
+<thead>
+<tr>
+<th class="hdr-category text-center" style="width:80px;">Category</th>
+<th class="hdr-name" style="width:auto;">Name</th>
+<th class="hdr-comments sorting text-center" title="Comments" style="width:50px;"><a href="/?s=comments&amp;o=desc"></a><i class="fa fa-comments-o"></i></th>
+<th class="hdr-link text-center" style="width:70px;">Link</th>
+<th class="hdr-size sorting text-center" style="width:100px;"><a href="/?s=size&amp;o=desc"></a>Size</th>
+<th class="hdr-date sorting_desc text-center" title="In UTC" style="width:140px;"><a href="/?s=id&amp;o=asc"></a>Date</th>
+<th class="hdr-seeders sorting text-center" title="Seeders" style="width:50px;"><a href="/?s=seeders&amp;o=desc"></a><i class="fa fa-arrow-up" aria-hidden="true"></i></th>
+<th class="hdr-leechers sorting text-center" title="Leechers" style="width:50px;"><a href="/?s=leechers&amp;o=desc"></a><i class="fa fa-arrow-down" aria-hidden="true"></i></th>
+<th class="hdr-downloads sorting text-center" title="Completed downloads" style="width:50px;"><a href="/?s=downloads&amp;o=desc"></a><i class="fa fa-check" aria-hidden="true"></i></th>
+</tr>
+</thead>
+<tbody>
+{chr(10).join(rows)}
+</tbody>
+</table>
+</div>
+<div class="center">
+<div class="pagination-page-info">Displaying results 1-75 out of 1000 results.<br>
+Please refine your search results if you can't find what you were looking for.</div>
+<ul class="pagination">
+<li class="disabled"><a href="#">&laquo;</a></li>
+<li class="active"><a href="#">1 <span class="sr-only">(current)</span></a></li>
+{pages}
+<li><a href="/?p=14">14</a></li>
+<li class="next"><a rel="next" href="/?p=2">&raquo;</a></li>
+</ul>
+</div>
+</div>
+</body>
+</html>"""
+
+def file_tree(rng: random.Random, depth: int, breadth: int) -> str:
+    items: list[str] = []
+    for index in range(breadth):
+        if depth > 0 and index % 3 == 0:
+            items.append(
+                f'<li><a href="" class="folder"><i class="fa fa-folder-open"></i>Folder {depth}-{index}</a>\n'
+                f'{file_tree(rng, depth - 1, breadth)}</li>'
+                )
+        else:
+            items.append(
+                f'<li><i class="fa fa-file"></i>{escape(make_name(rng, index))} '
+                f'<span class="file-size">({make_size(rng)})</span></li>'
+                )
+    return "<ul>\n" + "\n".join(items) + "\n</ul>"
+
+def view_page(site: str, rng: random.Random) -> str:
+    config: dict = SITES[site]
+    view_id: int = 1_800_000
+    category_id, category_title = rng.choice(list(config["categories"].items()))
+    main_category_id: str = category_id.split("_")[0] + "_0"
+    main_title, sub_title = category_title.split(" - ")
+    name: str = escape(make_name(rng, view_id))
+    
+    comments: list[str] = []
+    for index in range(150):
+        comment_id: int = 900_000 + index
+        username: str = f"user{rng.randint(1, 5000)}"
+        title: str = rng.choice(USER_TITLES)
+        avatar: str = (
+            "/static/img/avatar/default.png" if index % 2
+            else f"https://www.gravatar.com/avatar/{make_info_hash(rng)[:32]}?s=120"
+            )
+        uploader: str = " (uploader)" if index % 10 == 0 else ""
+        text: str = escape(" ".join(rng.choices(WORDS, k=rng.randint(5, 60))))
+        comments.append(f"""<div class="panel panel-default comment-panel" id="com-{comment_id}">
+<div class="panel-body">
+<div class="col-md-2">
+<p>
+<a class="text-default" href="/user/{username}" data-toggle="tooltip" title="{title}">{username}</a>{uploader}
+</p>
+<img class="avatar" src="{avatar}" alt="{title}">
+</div>
+<div class="col-md-10 comment">
+<div class="row comment-details">
+<a href="#com-{comment_id}"><small data-timestamp-swap data-timestamp="{1_700_000_000 + index * 60}">2023-11-14 22:13 UTC</small></a>
+<div class="comment-actions"></div>
+</div>
+<div class="row comment-body">
+<div markdown-text class="comment-content" id="torrent-comment{comment_id}">{text}</div>
+</div>
+</div>
+</div>
+</div>""")
+    
+    description: str = escape("\n".join(" ".join(rng.choices(WORDS, k=12)) for _ in range(40)))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{name} :: {config["title"]}</title>
+</head>
+<body>
+<div class="container">
+<div class="panel panel-success">
+<div class="panel-heading">
+<h3 class="panel-title">
+{name}
+</h3>
+</div>
+<div class="panel-body">
+<div class="row">
+<div class="col-md-1">Category:</div>
+<div class="col-md-5">
+<a href="/?c={main_category_id}">{main_title}</a> - <a href="/?c={category_id}">{sub_title}</a>
+</div>
+<div class="col-md-1">Date:</div>
+<div class="col-md-5" data-timestamp="1700000000">2023-11-14 22:13 UTC</div>
+</div>
+<div class="row">
+<div class="col-md-1">Submitter:</div>
+<div class="col-md-5">
+<a class="text-success" href="/user/{rng.choice(GROUPS).replace(" ", "")}" data-toggle="tooltip" title="Trusted">{rng.choice(GROUPS)}</a>
+</div>
+<div class="col-md-1">Seeders:</div>
+<div class="col-md-5"><span style="color: green;">{rng.randint(0, 3000)}</span></div>
+</div>
+<div class="row">
+<div class="col-md-1">Information:</div>
+<div class="col-md-5">
+<a href="https://example.org/">https://example.org/</a>
+</div>
+<div class="col-md-1">Leechers:</div>
+<div class="col-md-5"><span style="color: red;">{rng.randint(0, 300)}</span></div>
+</div>
+<div class="row">
+<div class="col-md-1">File size:</div>
+<div class="col-md-5">{make_size(rng)}</div>
+<div class="col-md-1">Completed:</div>
+<div class="col-md-5">{rng.randint(0, 50000)}</div>
+</div>
+<div class="row">
+<div class="col-md-1">Info hash:</div>
+<div class="col-md-5"><kbd>{make_info_hash(rng)}</kbd></div>
+</div>
+</div>
+<div class="panel-footer clearfix">
+<a href="/download/{view_id}.torrent"><i class="fa fa-download fa-fw"></i>Download Torrent</a> or <a href="magnet:?xt=urn:btih:{make_info_hash(rng)}&amp;dn={name}" class="card-footer-item"><i class="fa fa-magnet fa-fw"></i>Magnet</a>
+</div>
+</div>
+<div class="panel panel-default">
+<div markdown-text class="panel-body" id="torrent-description">{description}</div>
+</div>
+<div class="panel panel-default">
+<div class="panel-heading">
+<h3 class="panel-title">File list</h3>
+</div>
+<div class="torrent-file-list panel-body">
+{file_tree(rng, depth=2, breadth=20)}
+</div>
+</div>
+<div id="comments" class="panel panel-default">
+<div class="panel-heading">
+<a class="collapsed" data-toggle="collapse" href="#collapse-comments" role="button" aria-expanded="false" aria-controls="collapse-comments">
+<h3 class="panel-title">
+Comments - {len(comments)}
+</h3>
+</a>
+</div>
+<div class="collapse" id="collapse-comments">
+{chr(10).join(comments)}
+</div>
+</div>
+</div>
+</body>
+</html>"""
+
+def rss_feed(site: str, rng: random.Random) -> str:
+    config: dict = SITES[site]
+    items: list[str] = []
+    for index in range(75):
+        view_id: int = 1_800_000 - index
+        _, trusted, remake = rng.choice(TORRENT_TYPES)
+        category_id, category_title = rng.choice(list(config["categories"].items()))
+        name: str = escape(make_name(rng, view_id))
+        size: str = make_size(rng)
+        published: str = datetime.fromtimestamp(1_700_000_000 - index * 600, tz=timezone.utc).strftime("%a, %d %b %Y %H:%M:%S -0000")
+        items.append(f"""<item>
+<title>{name}</title>
+<link>{config["base_url"]}/download/{view_id}.torrent</link>
+<guid isPermaLink="true">{config["base_url"]}/view/{view_id}</guid>
+<pubDate>{published}</pubDate>
+<nyaa:seeders>{rng.randint(0, 3000)}</nyaa:seeders>
+<nyaa:leechers>{rng.randint(0, 300)}</nyaa:leechers>
+<nyaa:downloads>{rng.randint(0, 50000)}</nyaa:downloads>
+<nyaa:infoHash>{make_info_hash(rng)}</nyaa:infoHash>
+<nyaa:categoryId>{category_id}</nyaa:categoryId>
+<nyaa:category>{category_title}</nyaa:category>
+<nyaa:size>{size}</nyaa:size>
+<nyaa:comments>{rng.choice([0, 0, 1, 3])}</nyaa:comments>
+<nyaa:trusted>{trusted}</nyaa:trusted>
+<nyaa:remake>{remake}</nyaa:remake>
+<description><![CDATA[<a href="{config["base_url"]}/view/{view_id}">#{view_id} | {name}</a> | {size} | {category_title} | {view_id:X}]]></description>
+</item>""")
+    
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<rss xmlns:atom="http://www.w3.org/2005/Atom" xmlns:nyaa="https://nyaa.si/xmlns/nyaa" version="2.0">
+<channel>
+<title>{config["title"]} - Home - Torrent File RSS</title>
+<description>RSS Feed for Home</description>
+<link>{config["base_url"]}/</link>
+<atom:link href="{config["base_url"]}/?page=rss" rel="self" type="application/rss+xml" />
+{chr(10).join(items)}
+</channel>
+</rss>"""
+
+def main() -> None:
+    for site in SITES:
+        rng = random.Random(f"{SEED}-{site}")
+        (FIXTURES_DIR / f"search_{site}.html").write_text(search_page(site, rng), encoding="utf-8")
+        (FIXTURES_DIR / f"view_{site}.html").write_text(view_page(site, rng), encoding="utf-8")
+        (FIXTURES_DIR / f"rss_{site}.xml").write_text(rss_feed(site, rng), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
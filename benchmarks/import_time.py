@@ -0,0 +1,109 @@
+"""
+Import-time benchmark of the package, measured with `python -X importtime` in fresh interpreters.
+    
+    python benchmarks/import_time.py --output import.json
+
+Exits with status 1 if a statement imports a heavy dependency it should not need,
+or if its median import time exceeds its budget.
+
+Budgets are relative to the median time of `import httpx` measured in the same run, since absolute
+import times depend on the machine. The check of the loaded modules does not depend on timing at all.
+"""
+from pathlib import Path
+from typing import Any
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES: tuple[str, ...] = ("bs4", "soupsieve", "feedparser", "httpx")
+
+# The unavoidable dependency of the clients, which the budgets are relative to.
+BASELINE: str = "import httpx"
+
+# (statement, modules it must not import, budget as a ratio of the baseline time)
+CASES: dict[str, tuple[str, tuple[str, ...], float]] = {
+    "package": ("import nyaascraper", HEAVY_MODULES, 0.05),
+    "enums": ("from nyaascraper import SITE, QualityFilter, FunCategory", HEAVY_MODULES, 0.05),
+    "models": ("import nyaascraper.models", HEAVY_MODULES, 0.5),
+    "client": ("from nyaascraper import NyaaClient", ("bs4", "soupsieve", "feedparser"), 1.5),
+    "rss": ("from nyaascraper import NyaaRSSClient", ("bs4", "soupsieve", "feedparser"), 1.5),
+    "cli": ("import nyaascraper.cli", HEAVY_MODULES, 0.15)
+}
+
+IMPORT_TIME_PATTERN: re.Pattern = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+def measure(statement: str) -> tuple[float, list[str]]:
+    """
+    Measure a statement in a fresh interpreter.
+    
+    Returns:
+        tuple[float, list[str]]: The cumulative time in milliseconds of its top-level imports, and the loaded heavy modules.
+    """
+    check: str = f"import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}\n{check}"],
+        cwd=ROOT / "src",
+        capture_output=True,
+        text=True,
+        check=True
+        )
+    
+    total_us: int = 0
+    for line in completed.stderr.splitlines():
+        if (matches := IMPORT_TIME_PATTERN.match(line)) and len(matches.group(3)) == 1:
+            # Only top-level imports, whose cumulative time includes their dependencies.
+            if matches.group(4).startswith("nyaascraper") or matches.group(4) in HEAVY_MODULES:
+                total_us += int(matches.group(2))
+    
+    loaded: list[str] = [module for module in completed.stdout.strip().split(",") if module]
+    return total_us / 1000, loaded
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters per case.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+    
+    baseline_timings: list[float] = [measure(BASELINE)[0] for _ in range(args.runs)]
+    baseline_ms: float = statistics.median(baseline_timings)
+    print(f"{'baseline':<8} {baseline_ms:>8.2f} ms ({BASELINE})", file=sys.stderr)
+    
+    failed: bool = False
+    results: dict[str, Any] = {"import/baseline": {"p50": baseline_ms / 1000, "max": max(baseline_timings) / 1000}}
+    for name, (statement, forbidden, budget) in CASES.items():
+        timings: list[float] = []
+        loaded: list[str] = []
+        for _ in range(args.runs):
+            elapsed_ms, loaded = measure(statement)
+            timings.append(elapsed_ms)
+        
+        median: float = statistics.median(timings)
+        ratio: float = median / baseline_ms if baseline_ms else 0.0
+        leaked: list[str] = [module for module in loaded if module in forbidden]
+        ok: bool = not leaked and ratio <= budget
+        failed = failed or not ok
+        
+        results[f"import/{name}"] = {"p50": median / 1000, "max": max(timings) / 1000, "ratio": ratio, "loaded": loaded}
+        print(
+            f"{name:<8} {median:>8.2f} ms {ratio:>5.2f}x baseline (budget {budget:>4.2f}x)"
+            f"{'  leaked: ' + ', '.join(leaked) if leaked else ''}  {'ok' if ok else 'FAIL'}",
+            file=sys.stderr
+            )
+    
+    if args.output is not None:
+        commit: str = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        report: dict[str, Any] = {
+            "meta": {"commit": commit or None, "python": sys.version.split()[0], "parameters": {"runs": args.runs}},
+            "results": results
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
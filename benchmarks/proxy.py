@@ -0,0 +1,192 @@
+"""
+Forwarding HTTP proxy stand-in, to exercise `ProxyPool` offline.
+
+Plain HTTP requests sent through it are answered by the stand-in server in-process, or forwarded over the network with --forward.
+Tunnels for HTTPS (CONNECT) are refused, so send requests to an HTTP base URL, such as one of a `MirrorPool`.
+It can answer every request with a status instead, such as 429 or 403, like a proxy whose IP address the site throttles.
+    
+    python benchmarks/proxy.py --port 3128 --status 429 --retry-after 30
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+import argparse
+import asyncio
+import sys
+
+import httpx
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.server import NyaaStandIn
+
+# Headers of a single connection, which a proxy does not forward.
+HOP_BY_HOP_HEADERS: frozenset[str] = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection", "te", "trailer", "transfer-encoding", "upgrade"
+})
+
+@dataclass
+class ProxyStandInConfig:
+    """
+    Behaviour of the proxy stand-in.
+    
+    Attributes:
+        status (int | None): The status to answer every request with instead of forwarding it, such as 429 or 403. None to forward.
+        retry_after (str | None): The Retry-After header of the responses with `status`. None for no header.
+        latency (float): The delay in seconds added to each request.
+    """
+    status: int | None = None
+    retry_after: str | None = None
+    latency: float = 0.0
+
+class ProxyStandIn:
+    """
+    HTTP proxy served over TCP, forwarding requests to the stand-in server in-process or to another transport.
+    """
+    def __init__(self: Self, config: ProxyStandInConfig | None = None, upstream: httpx.AsyncBaseTransport | None = None) -> None:
+        """
+        Initialize proxy stand-in.
+        
+        Parameters:
+            config (ProxyStandInConfig | None, optional): The behaviour of the proxy. Defaults to None.
+            upstream (httpx.AsyncBaseTransport | None, optional): The transport to forward requests with. If None, the stand-in server in-process. Defaults to None.
+        """
+        self.config = config if config is not None else ProxyStandInConfig()
+        
+        # Method and URL of each request received.
+        self.requests: list[tuple[str, str]] = []
+        self._upstream = httpx.AsyncClient(transport=upstream if upstream is not None else httpx.ASGITransport(app=NyaaStandIn()))
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+    
+    @property
+    def url(self: Self) -> str:
+        """
+        Getter property for the URL of the proxy, to give to a `ProxyPool`.
+        
+        Returns:
+            str: The URL of the proxy.
+        """
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+    
+    async def start(self: Self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start listening.
+        
+        Parameters:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. If 0, a free port. Defaults to 0.
+        
+        Returns:
+            str: The URL of the proxy.
+        """
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self.url
+    
+    async def aclose(self: Self) -> None:
+        """
+        Stop listening, and close the connections and the upstream client.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in self._writers:
+                writer.close()
+            await self._server.wait_closed()
+        await self._upstream.aclose()
+    
+    async def __aenter__(self: Self) -> Self:
+        await self.start()
+        return self
+    
+    async def __aexit__(self: Self, *args) -> None:
+        await self.aclose()
+    
+    async def _serve(self: Self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the requests of a connection until the client closes it.
+        """
+        self._writers.add(writer)
+        try:
+            while (request_line := await reader.readline()).strip():
+                method, url, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: list[tuple[str, str]] = []
+                while (line := await reader.readline()).strip():
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers.append((name.strip(), value.strip()))
+                length: int = next((int(value) for name, value in headers if name.lower() == "content-length"), 0)
+                body: bytes = await reader.readexactly(length) if length else b""
+                
+                self.requests.append((method, url))
+                if self.config.latency:
+                    await asyncio.sleep(self.config.latency)
+                status, response_headers, content = await self._respond(method, url, headers, body)
+                
+                head: str = f"HTTP/1.1 {status} {httpx.codes.get_reason_phrase(status)}\r\n"
+                head += "".join(f"{name}: {value}\r\n" for name, value in response_headers)
+                head += f"Content-Length: {len(content)}\r\n\r\n"
+                writer.write(head.encode("latin-1") + (content if method != "HEAD" else b""))
+                await writer.drain()
+                if method == "CONNECT":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+    
+    async def _respond(self: Self, method: str, url: str, headers: list[tuple[str, str]], body: bytes) -> tuple[int, list[tuple[str, str]], bytes]:
+        """
+        Get the response to a request.
+        
+        Returns:
+            tuple[int, list[tuple[str, str]], bytes]: The status, headers and body of the response.
+        """
+        if method == "CONNECT" or not url.startswith("http://"):
+            return 501, [("Content-Type", "text/plain")], b"Only plain HTTP requests are forwarded"
+        if self.config.status is not None:
+            response_headers: list[tuple[str, str]] = [("Content-Type", "text/plain")]
+            if self.config.retry_after is not None:
+                response_headers.append(("Retry-After", self.config.retry_after))
+            return self.config.status, response_headers, httpx.codes.get_reason_phrase(self.config.status).encode()
+        
+        forwarded: list[tuple[str, str]] = [(name, value) for name, value in headers if name.lower() not in HOP_BY_HOP_HEADERS]
+        try:
+            response: httpx.Response = await self._upstream.request(method, url, headers=forwarded, content=body)
+        except httpx.HTTPError as error:
+            return 502, [("Content-Type", "text/plain")], str(error).encode()
+        
+        # The body is decoded by the upstream client, so its length and encoding change.
+        skipped: frozenset[str] = HOP_BY_HOP_HEADERS | {"content-length", "content-encoding"}
+        return response.status_code, [(name, value) for name, value in response.headers.items() if name.lower() not in skipped], response.content
+
+async def serve(proxy: ProxyStandIn, host: str, port: int) -> None:
+    print(f"Proxy listening on {await proxy.start(host, port)}", file=sys.stderr)
+    try:
+        await proxy._server.serve_forever()
+    finally:
+        await proxy.aclose()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=3128, help="Port to listen on.")
+    parser.add_argument("--status", type=int, default=None, help="Answer every request with this status, such as 429 or 403.")
+    parser.add_argument("--retry-after", default=None, help="Retry-After header of the responses with --status.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay in seconds added to each request.")
+    parser.add_argument("--forward", action="store_true", help="Forward requests over the network instead of to the stand-in server.")
+    args = parser.parse_args()
+    
+    proxy = ProxyStandIn(
+        ProxyStandInConfig(status=args.status, retry_after=args.retry_after, latency=args.latency),
+        httpx.AsyncHTTPTransport() if args.forward else None
+        )
+    try:
+        asyncio.run(serve(proxy, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
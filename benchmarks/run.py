@@ -0,0 +1,317 @@
+"""
+End-to-end benchmarks of the clients against the local stand-in server.
+    
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --src ../nyaascraper-baseline/src --output baseline.json
+    python benchmarks/compare.py baseline.json bench.json
+
+Results are written as JSON together with the commit they were measured at, so runs of different commits can be compared.
+Only the public API of the first benchmarked release is required: scenarios needing newer features are skipped
+when benchmarking an older source tree with --src.
+"""
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+def source_dir(argv: list[str] | None = None) -> Path:
+    # Parsed before importing the package, since it decides which source tree is imported.
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--src", type=Path, default=ROOT / "src")
+    return parser.parse_known_args(argv)[0].src.resolve()
+
+# Benchmark a source tree rather than an installed version: the checkout, or the one given with --src.
+SRC: Path = source_dir()
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(ROOT))
+
+from bs4 import BeautifulSoup
+import feedparser
+import httpx
+
+from nyaascraper import NyaaClient, NyaaRSSClient
+from nyaascraper.enums import SITE
+from nyaascraper.version import __version__
+
+# Features benchmarked by some scenarios only, which older source trees do not have.
+try:
+    from nyaascraper import RequestScheduler
+    from nyaascraper.enums import Priority
+except ImportError:
+    RequestScheduler = Priority = None
+try:
+    from nyaascraper.parsers import extract_search_result, extract_torrent_info, extract_feed
+except ImportError:
+    extract_search_result = extract_torrent_info = extract_feed = None
+
+from benchmarks.server import FIXTURES_DIR, NyaaStandIn, StandInConfig
+
+SITES: dict[str, SITE] = {"fun": SITE.FUN, "fap": SITE.FAP}
+
+Scenario = Callable[[argparse.Namespace, SITE, "ClientFactory"], Awaitable[list[float]]]
+
+class ClientFactory:
+    """
+    Build clients talking to the stand-in server.
+    """
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.config = StandInConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            rate_limit=args.rate_limit,
+            burst=args.burst,
+            error_rate=args.error_rate,
+            seed=args.seed
+            )
+        self.app = NyaaStandIn(self.config)
+        self.apps: list[NyaaStandIn] = [self.app]
+        self._servers: list[Any] = []
+        self._tasks: list[asyncio.Task] = []
+    
+    async def start(self) -> None:
+        if self.args.transport != "tcp":
+            return
+        
+        import uvicorn
+        
+        self.apps = [NyaaStandIn(self.config, site=site) for site in SITES]
+        for offset, app in enumerate(self.apps):
+            server = uvicorn.Server(uvicorn.Config(
+                app,
+                port=self.args.port + offset,
+                log_level="warning",
+                lifespan="off"
+                ))
+            self._servers.append(server)
+            self._tasks.append(asyncio.create_task(server.serve()))
+        
+        while not all(server.started for server in self._servers):
+            await asyncio.sleep(0.01)
+    
+    @property
+    def requests(self) -> int:
+        return sum(app.requests for app in self.apps)
+    
+    async def stop(self) -> None:
+        for server in self._servers:
+            server.should_exit = True
+        await asyncio.gather(*self._tasks)
+    
+    def make(self, client_class: type[NyaaClient] | type[NyaaRSSClient], site: SITE) -> NyaaClient | NyaaRSSClient:
+        client = client_class(site)
+        if self.args.transport == "tcp":
+            client.base_url = f"http://127.0.0.1:{self.args.port + list(SITES.values()).index(site)}"
+        else:
+            client._http_client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self.app),
+                timeout=client.timeout
+                )
+        return client
+
+async def timed(latencies: list[float], call: Callable[[], Awaitable[Any]]) -> Any:
+    started: float = time.perf_counter()
+    try:
+        return await call()
+    except httpx.HTTPError:
+        return None
+    finally:
+        latencies.append(time.perf_counter() - started)
+
+async def single_search(args: argparse.Namespace, site: SITE, factory: ClientFactory) -> list[float]:
+    client: NyaaClient = factory.make(NyaaClient, site)
+    latencies: list[float] = []
+    for _ in range(args.iterations):
+        await timed(latencies, lambda: client.search(term="frieren"))
+    return latencies
+
+async def paginated_crawl(args: argparse.Namespace, site: SITE, factory: ClientFactory) -> list[float]:
+    client: NyaaClient = factory.make(NyaaClient, site)
+    latencies: list[float] = []
+    for _ in range(max(1, args.iterations // args.pages)):
+        page: int | None = 1
+        while page is not None and page <= args.pages:
+            result = await timed(latencies, lambda: client.search(term="frieren", page=page))
+            page = page + 1 if result is None or result.next_page is not None else None
+    return latencies
+
+async def bulk_torrent_info(args: argparse.Namespace, site: SITE, factory: ClientFactory) -> list[float]:
+    client: NyaaClient = factory.make(NyaaClient, site)
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    
+    async def fetch(view_id: int) -> None:
+        async with semaphore:
+            await timed(latencies, lambda: client.get_torrent_info(view_id))
+    
+    await asyncio.gather(*(fetch(1_800_000 - index) for index in range(args.iterations)))
+    return latencies
+
+async def rss_watch(args: argparse.Namespace, site: SITE, factory: ClientFactory) -> list[float]:
+    client: NyaaRSSClient = factory.make(NyaaRSSClient, site)
+    latencies: list[float] = []
+    seen: set[int] = set()
+    for _ in range(args.iterations):
+        feed = await timed(latencies, lambda: client.get_feed())
+        if feed is not None:
+            seen.update(torrent.view_id for torrent in feed.torrents)
+    return latencies
+
+async def mixed_priority(args: argparse.Namespace, site: SITE, factory: ClientFactory) -> list[float]:
+    # Latency of interactive searches while background requests saturate a shared client. The background requests
+    # barely parse, so the latency measures scheduling rather than the parsing of other requests on the event loop.
+    client: NyaaClient = factory.make(NyaaClient, site)
+    client.scheduler = RequestScheduler(max_concurrency=args.concurrency)
+    
+    background: list[asyncio.Task] = [
+        asyncio.create_task(client.search_count(term=f"frieren {index}", priority=Priority.BACKGROUND))
+        for index in range(args.iterations * 4)
+    ]
+    latencies: list[float] = []
+    try:
+        for _ in range(args.iterations):
+            await timed(latencies, lambda: client.search(term="frieren", priority=Priority.INTERACTIVE))
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+    return latencies
+
+async def parse_only(args: argparse.Namespace, site: SITE, factory: ClientFactory) -> list[float]:
+    name: str = "fun" if site is SITE.FUN else "fap"
+    search: bytes = (FIXTURES_DIR / f"search_{name}.html").read_bytes()
+    view: bytes = (FIXTURES_DIR / f"view_{name}.html").read_bytes()
+    rss: str = (FIXTURES_DIR / f"rss_{name}.xml").read_text(encoding="utf-8")
+    
+    latencies: list[float] = []
+    for _ in range(max(1, args.iterations // 10)):
+        started: float = time.perf_counter()
+        extract_search_result(BeautifulSoup(search, "html.parser"), site, site.value)
+        extract_torrent_info(BeautifulSoup(view, "html.parser"), site, site.value)
+        extract_feed(feedparser.parse(rss), site, False)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+SCENARIOS: dict[str, Scenario] = {
+    "single_search": single_search,
+    "paginated_crawl": paginated_crawl,
+    "bulk_torrent_info": bulk_torrent_info,
+    "rss_watch": rss_watch,
+    "mixed_priority": mixed_priority,
+    "parse_only": parse_only
+}
+
+# Scenarios the benchmarked source tree cannot run, with the reason.
+UNAVAILABLE: dict[str, str] = {}
+if RequestScheduler is None:
+    UNAVAILABLE["mixed_priority"] = "nyaascraper.RequestScheduler is not available"
+if extract_search_result is None:
+    UNAVAILABLE["parse_only"] = "nyaascraper.parsers is not available"
+
+def percentile(ordered: list[float], percent: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))]
+
+async def run_scenario(args: argparse.Namespace, name: str, site: SITE, factory: ClientFactory) -> dict[str, Any]:
+    requests_before: int = factory.requests
+    started: float = time.perf_counter()
+    latencies: list[float] = await SCENARIOS[name](args, site, factory)
+    elapsed: float = time.perf_counter() - started
+    
+    ordered: list[float] = sorted(latencies)
+    result: dict[str, Any] = {
+        "operations": len(ordered),
+        "elapsed": elapsed,
+        "throughput": len(ordered) / elapsed if elapsed else 0.0,
+        "p50": percentile(ordered, 50),
+        "p90": percentile(ordered, 90),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1],
+        "server_requests": factory.requests - requests_before
+    }
+    
+    if args.memory:
+        tracemalloc.start()
+        await SCENARIOS[name](args, site, factory)
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    
+    return result
+
+def git_revision() -> dict[str, Any]:
+    # The revision of the benchmarked source tree, which is not the checkout of this script with --src.
+    try:
+        commit: str = subprocess.run(["git", "rev-parse", "HEAD"], cwd=SRC, capture_output=True, text=True, check=True).stdout.strip()
+        dirty: bool = bool(subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=SRC, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    factory = ClientFactory(args)
+    await factory.start()
+    try:
+        results: dict[str, Any] = {}
+        for name in args.scenarios:
+            if name in UNAVAILABLE:
+                print(f"{name:<28} skipped: {UNAVAILABLE[name]}", file=sys.stderr)
+                continue
+            for site_name in args.sites:
+                result = await run_scenario(args, name, SITES[site_name], factory)
+                results[f"{name}/{site_name}"] = result
+                print(
+                    f"{name + '/' + site_name:<28} {result['throughput']:>9.1f} ops/s"
+                    f"  p50 {result['p50'] * 1000:>8.2f} ms  p99 {result['p99'] * 1000:>8.2f} ms"
+                    + (f"  peak {result['peak_memory'] / 1024 / 1024:>7.1f} MiB" if "peak_memory" in result else ""),
+                    file=sys.stderr
+                    )
+    finally:
+        await factory.stop()
+    
+    return {
+        "meta": {
+            **git_revision(),
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "src")},
+            "server": asdict(factory.config),
+            "skipped": sorted(UNAVAILABLE.keys() & set(args.scenarios))
+        },
+        "results": results
+    }
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES))
+    parser.add_argument("--transport", choices=["asgi", "tcp"], default="asgi", help="In-process ASGI transport, or TCP through uvicorn.")
+    parser.add_argument("--port", type=int, default=8765, help="First port of the TCP stand-in servers.")
+    parser.add_argument("--iterations", type=int, default=100, help="Operations per scenario.")
+    parser.add_argument("--pages", type=int, default=10, help="Pages per paginated crawl.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent requests of bulk scenarios.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random server latency added, in seconds.")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Server requests per second before responding with 429.")
+    parser.add_argument("--burst", type=int, default=10, help="Server burst allowance of the rate limit.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Ratio of server responses that are 503 errors.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the peak memory pass.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON to this file.")
+    parser.add_argument("--src", type=Path, default=ROOT / "src", help="Source tree of the package to benchmark, such as the src directory of a worktree of another commit.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    arguments: argparse.Namespace = parse_args()
+    report: dict[str, Any] = asyncio.run(main(arguments))
+    if arguments.output is not None:
+        arguments.output.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
\ No newline at end of file
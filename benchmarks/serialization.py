@@ -0,0 +1,97 @@
+"""
+Encode/decode throughput of the model codecs, against `dataclasses.asdict` plus `json` as a baseline.
+    
+    python benchmarks/serialization.py --output serialization.json
+
+Every model is round-tripped before it is timed, and the benchmark exits with status 1 if a decoded model differs.
+"""
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+# Benchmark the checkout rather than an installed version.
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+
+from nyaascraper.enums import SITE, SerializationFormat
+from nyaascraper.models import SearchResult, TorrentInfo, NyaaRSSFeed
+from nyaascraper.parsers import parse_html, parse_rss, extract_search_result, extract_torrent_info, extract_feed
+from nyaascraper import serialization
+
+from benchmarks.server import FIXTURES_DIR
+
+SITES: dict[str, SITE] = {"fun": SITE.FUN, "fap": SITE.FAP}
+
+def load_models(name: str, site: SITE) -> dict[str, SearchResult | TorrentInfo | NyaaRSSFeed]:
+    return {
+        "search": extract_search_result(parse_html((FIXTURES_DIR / f"search_{name}.html").read_bytes()), site, site.value),
+        "view": extract_torrent_info(parse_html((FIXTURES_DIR / f"view_{name}.html").read_bytes()), site, site.value),
+        "rss": extract_feed(parse_rss((FIXTURES_DIR / f"rss_{name}.xml").read_text(encoding="utf-8")), site, False)
+    }
+
+def codecs() -> dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    available: dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+        # Not a round trip: asdict plus json loses the model types.
+        "asdict+json": (lambda model: json.dumps(asdict(model), default=str).encode(), json.loads),
+        "json": (lambda model: serialization.to_bytes(model, SerializationFormat.JSON), serialization.from_bytes)
+    }
+    if serialization.msgpack is not None:
+        available["msgpack"] = (lambda model: serialization.to_bytes(model, SerializationFormat.MSGPACK), serialization.from_bytes)
+    return available
+
+def throughput(call: Callable[[], Any], duration: float) -> float:
+    operations: int = 0
+    started: float = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < duration:
+        call()
+        operations += 1
+    return operations / elapsed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES))
+    parser.add_argument("--duration", type=float, default=1.0, help="Seconds per measurement.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+    
+    failed: bool = False
+    results: dict[str, Any] = {}
+    for site_name in args.sites:
+        for model_name, model in load_models(site_name, SITES[site_name]).items():
+            for codec_name, (encode, decode) in codecs().items():
+                data: bytes = encode(model)
+                if codec_name != "asdict+json" and decode(data) != model:
+                    print(f"{codec_name}/{model_name}/{site_name}: round trip differs", file=sys.stderr)
+                    failed = True
+                    continue
+                
+                result: dict[str, float] = {
+                    "size": len(data),
+                    "encode": throughput(lambda: encode(model), args.duration),
+                    "decode": throughput(lambda: decode(data), args.duration)
+                }
+                results[f"{codec_name}/{model_name}/{site_name}"] = result
+                print(
+                    f"{codec_name + '/' + model_name + '/' + site_name:<28} {result['size']:>9} B"
+                    f"  encode {result['encode']:>9.1f} ops/s  decode {result['decode']:>9.1f} ops/s",
+                    file=sys.stderr
+                    )
+    
+    if args.output is not None:
+        commit: str = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        report: dict[str, Any] = {
+            "meta": {"commit": commit or None, "python": sys.version.split()[0], "parameters": {"duration": args.duration}},
+            "results": results
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Local ASGI stand-in for nyaa.si and sukebei.nyaa.si serving the recorded fixtures.
+
+It can be mounted in-process with `httpx.ASGITransport`, or served over TCP with uvicorn:
+    
+    uvicorn benchmarks.server:app --port 8000
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Self
+from urllib.parse import parse_qs
+import asyncio
+import random
+import re
+import time
+
+FIXTURES_DIR: Path = Path(__file__).parent / "fixtures"
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+@dataclass
+class StandInConfig:
+    """
+    Behaviour of the stand-in server.
+    
+    Attributes:
+        latency (float): The delay in seconds before each response.
+        jitter (float): The maximum random delay in seconds added to the latency.
+        rate_limit (float | None): The number of requests per second allowed before responding with 429. None for no limit.
+        burst (int): The number of requests allowed at once before the rate limit applies.
+        error_rate (float): The ratio of requests answered with a 503 error.
+        seed (int): The seed of the jitter and errors, so runs are reproducible.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    rate_limit: float | None = None
+    burst: int = 10
+    error_rate: float = 0.0
+    seed: int = 0
+
+class NyaaStandIn:
+    """
+    ASGI application serving search, view and RSS fixtures.
+    
+    The site is chosen from the Host header: hosts starting with "sukebei" get the SITE.FAP fixtures,
+    other hosts the SITE.FUN fixtures. With `site` set, the Host header is ignored.
+    """
+    VIEW_PATH_PATTERN: re.Pattern = re.compile(r"^/view/(\d+)$")
+    
+    def __init__(self: Self, config: StandInConfig | None = None, site: str | None = None) -> None:
+        """
+        Initialize stand-in server.
+        
+        Parameters:
+            config (StandInConfig | None, optional): The behaviour of the server. Defaults to None.
+            site (str | None, optional): "fun" or "fap" to always serve that site. Defaults to None.
+        """
+        self.config = config if config is not None else StandInConfig()
+        self.site = site
+        
+        self.requests: int = 0
+        self._random = random.Random(self.config.seed)
+        self._tokens: float = float(self.config.burst)
+        self._refilled_at: float = time.monotonic()
+        self._pages: dict[str, bytes] = {
+            path.stem: path.read_bytes()
+            for path in FIXTURES_DIR.iterdir()
+            if path.suffix in (".html", ".xml")
+        }
+    
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await receive()
+            await send({"type": "lifespan.startup.complete"})
+            await receive()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+        
+        self.requests += 1
+        status, content_type, body = self.route(scope)
+        
+        delay: float = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type.encode()),
+                (b"content-length", str(len(body)).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+    
+    def route(self: Self, scope: Scope) -> tuple[int, str, bytes]:
+        """
+        Route a request to a fixture.
+        
+        Parameters:
+            scope (Scope): The ASGI HTTP scope.
+        
+        Returns:
+            tuple[int, str, bytes]: The status, content type and body of the response.
+        """
+        if not self._take_token():
+            return 429, "text/plain", b"Too Many Requests"
+        
+        if self.config.error_rate and self._random.random() < self.config.error_rate:
+            return 503, "text/plain", b"Service Unavailable"
+        
+        site: str = self.site or self._site_from_host(scope)
+        path: str = scope["path"]
+        query: dict[str, list[str]] = parse_qs(scope.get("query_string", b"").decode())
+        
+        if path in ("/", "") and query.get("page") == ["rss"]:
+            return 200, "application/xml", self._pages[f"rss_{site}"]
+        if path in ("/", "") or path.startswith("/user/"):
+            return 200, "text/html; charset=utf-8", self._pages[f"search_{site}"]
+        if self.VIEW_PATH_PATTERN.match(path):
+            return 200, "text/html; charset=utf-8", self._pages[f"view_{site}"]
+        return 404, "text/html", b"<h1>404 Not Found</h1>"
+    
+    def _site_from_host(self: Self, scope: Scope) -> str:
+        for name, value in scope.get("headers", []):
+            if name == b"host":
+                return "fap" if value.startswith(b"sukebei") else "fun"
+        return "fun"
+    
+    def _take_token(self: Self) -> bool:
+        if self.config.rate_limit is None:
+            return True
+        
+        now: float = time.monotonic()
+        self._tokens = min(float(self.config.burst), self._tokens + (now - self._refilled_at) * self.config.rate_limit)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        
+        self._tokens -= 1
+        return True
+
+app = NyaaStandIn()
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Ingest speed, memory use and query latency of `StatsHistory` on a synthetic crawl, against a list of full snapshot rows as a baseline.
+    
+    python benchmarks/stats_history.py --torrents 300000 --days 30 --output stats_history.json
+
+Every hour, a share of the torrents changes. The trending query is checked against the baseline, and the benchmark exits with status 1 if they differ.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+import argparse
+import heapq
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+# Benchmark the checkout rather than an installed version.
+sys.path.insert(0, str(ROOT / "src"))
+
+from nyaascraper.history import StatsHistory
+
+HOUR: int = 3600
+
+@dataclass
+class SnapshotRow:
+    view_id: int
+    timestamp: float
+    seeders: int
+    leechers: int
+    completed: int
+
+def row_size() -> int:
+    # A dataclass instance with its dict, and the list slot, not counting shared small ints.
+    row = SnapshotRow(1_000_000, 1.7e9, 1000, 1000, 100_000)
+    return sys.getsizeof(row) + sys.getsizeof(row.__dict__) + sys.getsizeof(row.timestamp) + 3 * sys.getsizeof(100_000) + 8
+
+def baseline_trending(completed_by_hour: list[dict[int, int]], first: int, k: int) -> list[tuple[int, int]]:
+    totals: dict[int, int] = {}
+    for hour in range(first, len(completed_by_hour)):
+        for view_id, delta in completed_by_hour[hour].items():
+            totals[view_id] = totals.get(view_id, 0) + delta
+    return heapq.nlargest(k, totals.items(), key=lambda item: (item[1], -item[0]))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--torrents", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--change-rate", type=float, default=0.05, help="Share of the torrents changing each hour.")
+    parser.add_argument("--trending-hours", type=float, default=24.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    hours: int = args.days * 24
+    completed: list[int] = [rng.randint(0, 1000) for _ in range(args.torrents)]
+    completed_by_hour: list[dict[int, int]] = [{} for _ in range(hours)]
+    history = StatsHistory()
+    snapshots: int = 0
+    
+    ingest: float = 0.0
+    for hour in range(hours):
+        changed: range | list[int] = range(args.torrents) if hour == 0 else rng.sample(range(args.torrents), int(args.torrents * args.change_rate))
+        batch: list[tuple[int, int, int, int]] = []
+        for view_id in changed:
+            if hour:
+                delta: int = rng.randint(1, 20)
+                completed[view_id] += delta
+                completed_by_hour[hour][view_id] = delta
+            batch.append((view_id, rng.randint(0, 50), rng.randint(0, 50), completed[view_id]))
+        
+        started: float = time.perf_counter()
+        for view_id, seeders, leechers, completed_count in batch:
+            history.add(view_id, seeders, leechers, completed_count, hour * HOUR)
+        ingest += time.perf_counter() - started
+        snapshots += len(batch)
+    history.seal()
+    
+    started = time.perf_counter()
+    trending = history.trending(args.trending_hours, 10, now=hours * HOUR)
+    trending_ms: float = (time.perf_counter() - started) * 1000
+    expected = baseline_trending(completed_by_hour, max(1, hours - int(args.trending_hours)), 10)
+    failed: bool = [torrent.completed_delta for torrent in trending] != [total for _, total in expected]
+    if failed:
+        print("trending differs from the baseline", file=sys.stderr)
+    
+    started = time.perf_counter()
+    for view_id in range(0, args.torrents, max(1, args.torrents // 1000)):
+        history.history(view_id)
+    history_ms: float = (time.perf_counter() - started) * 1000 / min(1000, args.torrents)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path: Path = Path(directory) / "history.bin"
+        started = time.perf_counter()
+        history.save(path)
+        save_s: float = time.perf_counter() - started
+        file_size: int = path.stat().st_size
+        started = time.perf_counter()
+        StatsHistory.load(path)
+        load_s: float = time.perf_counter() - started
+    
+    results: dict[str, float] = {
+        "snapshots": snapshots,
+        "ingest_per_second": snapshots / ingest,
+        "memory_bytes": history.memory_usage,
+        "baseline_memory_bytes": snapshots * row_size(),
+        "trending_ms": trending_ms,
+        "history_ms": history_ms,
+        "save_seconds": save_s,
+        "load_seconds": load_s,
+        "file_bytes": file_size
+    }
+    for name, value in results.items():
+        print(f"{name:<24} {value:>16.2f}", file=sys.stderr)
+    
+    if args.output is not None:
+        commit: str = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        report: dict[str, Any] = {
+            "meta": {"commit": commit or None, "python": sys.version.split()[0], "parameters": vars(args) | {"output": None}},
+            "results": results
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
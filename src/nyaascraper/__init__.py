@@ -1,4 +1,56 @@
+from typing import Any
+import importlib
+
 from .version import __version__
 
-from .client import NyaaClient
-from .rss import NyaaRSSClient
\ No newline at end of file
+# Public names and the modules they are defined in. Modules are only imported on first access,
+# so importing the package does not import the HTTP client, the HTML parser or feedparser.
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "NyaaClient": ".client",
+    "NyaaRSSClient": ".rss",
+    "SyncNyaaClient": ".sync",
+    "SyncNyaaRSSClient": ".sync",
+    "ParseMemo": ".memo",
+    "Metrics": ".metrics",
+    "HistogramMetrics": ".metrics",
+    "OpenTelemetryMetrics": ".metrics",
+    "SITE": ".enums",
+    "QualityFilter": ".enums",
+    "FunCategory": ".enums",
+    "FapCategory": ".enums",
+    "SortBy": ".enums",
+    "SortOrder": ".enums",
+    "TorrentType": ".enums",
+    "UserLevel": ".enums",
+    "DownloadStatus": ".enums",
+    "SerializationFormat": ".enums",
+    "Priority": ".enums",
+    "CircuitState": ".enums",
+    "DirectorySink": ".download",
+    "JSONLSink": ".export",
+    "CSVSink": ".export",
+    "ParquetSink": ".export",
+    "PageArchive": ".archive",
+    "RequestScheduler": ".scheduler",
+    "MirrorPool": ".mirrors",
+    "ProxyPool": ".proxies",
+    "CircuitBreaker": ".circuit",
+    "StaleCache": ".circuit",
+    "StatsHistory": ".history",
+    "DedupIndex": ".dedup",
+    "BloomFilter": ".dedup",
+    "ScalableBloomFilter": ".dedup"
+}
+
+__all__ = ["__version__", *_LAZY_ATTRIBUTES]
+
+def __getattr__(name: str) -> Any:
+    if (module_name := _LAZY_ATTRIBUTES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value: Any = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
\ No newline at end of file
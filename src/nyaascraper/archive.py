@@ -0,0 +1,351 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, Self
+from urllib.parse import urlparse, parse_qs
+import os
+import uuid
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if TYPE_CHECKING:
+    import httpx
+
+from .enums import SITE
+from .models import ArchiveEntry, ArchivedPage, ReplayResult, SearchResult, TorrentInfo, NyaaRSSFeed
+
+class PageArchive:
+    """
+    Append-only archive of raw responses, to extract models again without requesting the pages again.
+    
+    Responses are stored as WARC response records in segment files `segment-<index>.warc.zst`. Each record is compressed
+    as an independent zstd frame, or gzip member in `.warc.gz` segments, so a record is read by its offset without
+    decompressing the rest of the segment. Each segment has an index `segment-<index>.idx` with a tab-separated line
+    per record: offset, length, endpoint, site, base URL and URL.
+    
+    A segment is closed once it exceeds `segment_size`. Each archive instance writes to new segments,
+    so archives of several runs can share a directory. Bodies are archived with their content encoding removed.
+    """
+    SEGMENT_SIZE: int = 1024 ** 3
+    COMPRESSION_LEVEL: int = 3
+    REPLAY_BATCH_SIZE: int = 64
+    
+    SEGMENT_SUFFIXES: dict[str, str] = {"zstd": ".warc.zst", "gzip": ".warc.gz"}
+    
+    # Headers describing the encoded body, which does not match the archived body.
+    _DROPPED_HEADERS: frozenset[bytes] = frozenset({b"content-encoding", b"content-length", b"transfer-encoding"})
+    
+    def __init__(
+        self: Self,
+        directory: str | os.PathLike,
+        segment_size: int = SEGMENT_SIZE,
+        compression: str | None = None,
+        level: int = COMPRESSION_LEVEL
+        ) -> None:
+        """
+        Initialize page archive.
+        
+        Parameters:
+            directory (str | os.PathLike): The directory of the segments. Created if missing.
+            segment_size (int, optional): The size in bytes after which a segment is closed. Defaults to SEGMENT_SIZE.
+            compression (str | None, optional): "zstd" or "gzip". If None, zstd is used if zstandard is installed, otherwise gzip. Defaults to None.
+            level (int, optional): The compression level. Defaults to COMPRESSION_LEVEL.
+        
+        Raises:
+            ValueError: If the compression is unknown.
+            ImportError: If the compression is "zstd" and zstandard is not installed.
+        """
+        if compression is None:
+            compression = "zstd" if zstandard is not None else "gzip"
+        if compression not in self.SEGMENT_SUFFIXES:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required for zstd compression: pip install zstandard")
+        
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self.compression = compression
+        self.level = level
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        self._compressor = zstandard.ZstdCompressor(level=level) if compression == "zstd" else None
+        self._segment_number: int = max((int(path.stem.split("-")[1]) for path in self.directory.glob("segment-*.idx")), default=-1)
+        self._segment_name: str | None = None
+        self._segment_file: BinaryIO | None = None
+        self._index_file: BinaryIO | None = None
+    
+    def __enter__(self: Self) -> Self:
+        return self
+    
+    def __exit__(self: Self, *exc_info: object) -> None:
+        self.close()
+    
+    def add(self: Self, endpoint: str, site: SITE, base_url: str, response: httpx.Response) -> ArchiveEntry:
+        """
+        Archive a response.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request, such as "search", "view" or "rss".
+            site (SITE): The site the response was scraped from.
+            base_url (str): The base URL of the client.
+            response (httpx.Response): The response, with its body read.
+        
+        Returns:
+            ArchiveEntry: The index entry of the response.
+        """
+        http_block: bytes = b"".join((
+            f"{response.http_version} {response.status_code} {response.reason_phrase}\r\n".encode("latin-1"),
+            *(name + b": " + value + b"\r\n" for name, value in response.headers.raw if name.lower() not in self._DROPPED_HEADERS),
+            f"Content-Length: {len(response.content)}\r\n\r\n".encode("latin-1"),
+            response.content
+            ))
+        url: str = str(response.url)
+        warc_headers: str = (
+            "WARC/1.1\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {datetime.now(timezone.utc):%Y-%m-%dT%H:%M:%SZ}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            "Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(http_block)}\r\n"
+            f"Nyaa-Endpoint: {endpoint}\r\n"
+            f"Nyaa-Site: {site.value}\r\n"
+            f"Nyaa-Base-URL: {base_url}\r\n"
+            "\r\n"
+        )
+        compressed: bytes = self.__compress(warc_headers.encode() + http_block + b"\r\n\r\n")
+        
+        if self._segment_file is None or self._segment_file.tell() >= self.segment_size:
+            self.__open_segment()
+        
+        offset: int = self._segment_file.tell()
+        self._segment_file.write(compressed)
+        self._segment_file.flush()
+        
+        entry = ArchiveEntry(self._segment_name, offset, len(compressed), endpoint, site, base_url, url)
+        # The index line is written after the record, so an indexed record is always complete.
+        self._index_file.write(f"{offset}\t{len(compressed)}\t{endpoint}\t{site.value}\t{base_url}\t{url}\n".encode())
+        self._index_file.flush()
+        return entry
+    
+    def entries(self: Self, endpoints: Iterable[str] | None = None) -> Iterator[ArchiveEntry]:
+        """
+        Iterate the index entries of the archived responses, in the order they were archived.
+        
+        Parameters:
+            endpoints (Iterable[str] | None, optional): Only the responses of these endpoints. If None, every response. Defaults to None.
+        
+        Yields:
+            ArchiveEntry: The index entries.
+        """
+        wanted: set[str] | None = set(endpoints) if endpoints is not None else None
+        for index_path in sorted(self.directory.glob("segment-*.idx")):
+            segment: str | None = next(
+                (index_path.stem + suffix for suffix in self.SEGMENT_SUFFIXES.values() if (index_path.parent / (index_path.stem + suffix)).exists()),
+                None
+                )
+            if segment is None:
+                continue
+            
+            with open(index_path, "rb") as index_file:
+                for line in index_file:
+                    fields: list[str] = line.decode().rstrip("\n").split("\t")
+                    if len(fields) != 6 or not line.endswith(b"\n"):
+                        # Line cut short by a crash.
+                        continue
+                    if wanted is not None and fields[2] not in wanted:
+                        continue
+                    yield ArchiveEntry(segment, int(fields[0]), int(fields[1]), fields[2], SITE(fields[3]), fields[4], fields[5])
+    
+    def read(self: Self, entry: ArchiveEntry) -> ArchivedPage:
+        """
+        Read an archived response.
+        
+        Parameters:
+            entry (ArchiveEntry): The index entry of the response.
+        
+        Returns:
+            ArchivedPage: The archived response.
+        """
+        with open(self.directory / entry.segment, "rb") as file:
+            return _read_page(file, entry)
+    
+    def replay(
+        self: Self,
+        endpoints: Iterable[str] | None = None,
+        workers: int | None = None,
+        batch_size: int = REPLAY_BATCH_SIZE
+        ) -> Iterator[ReplayResult]:
+        """
+        Extract the models of the archived responses again, with the current parsers and without network.
+        
+        Responses are extracted in batches by worker processes, one per core by default.
+        Only a few batches per worker are pending at a time, so archives of any size are replayed in bounded memory.
+        
+        Parameters:
+            endpoints (Iterable[str] | None, optional): Only the responses of these endpoints. If None, every response. Defaults to None.
+            workers (int | None, optional): The number of worker processes. If 0, responses are extracted in this process. If None, the number of cores. Defaults to None.
+            batch_size (int, optional): The number of responses per batch sent to a worker. Defaults to REPLAY_BATCH_SIZE.
+        
+        Yields:
+            ReplayResult: The results, in the order the responses were archived.
+        """
+        batches: Iterator[tuple[str, list[ArchiveEntry]]] = self.__batches(endpoints, batch_size)
+        if workers == 0:
+            for segment, batch in batches:
+                yield from _replay_batch(str(self.directory / segment), batch)
+            return
+        
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending: deque[Future] = deque()
+        try:
+            for segment, batch in batches:
+                pending.append(executor.submit(_replay_batch, str(self.directory / segment), batch))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+    
+    def close(self: Self) -> None:
+        """
+        Close the open segment.
+        """
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._index_file.close()
+            self._segment_file = self._index_file = None
+    
+    def __open_segment(self: Self) -> None:
+        """
+        Close the open segment and open the next one.
+        """
+        self.close()
+        self._segment_number += 1
+        stem: str = f"segment-{self._segment_number:05d}"
+        self._segment_name = stem + self.SEGMENT_SUFFIXES[self.compression]
+        self._segment_file = open(self.directory / self._segment_name, "ab")
+        self._index_file = open(self.directory / f"{stem}.idx", "ab")
+    
+    def __compress(self: Self, record: bytes) -> bytes:
+        """
+        Compress a record as an independent zstd frame or gzip member.
+        
+        Parameters:
+            record (bytes): The record.
+        
+        Returns:
+            bytes: The compressed record.
+        """
+        if self._compressor is not None:
+            return self._compressor.compress(record)
+        
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(record) + compressor.flush()
+    
+    def __batches(self: Self, endpoints: Iterable[str] | None, batch_size: int) -> Iterator[tuple[str, list[ArchiveEntry]]]:
+        """
+        Group the index entries in batches of a single segment.
+        
+        Parameters:
+            endpoints (Iterable[str] | None): Only the responses of these endpoints. If None, every response.
+            batch_size (int): The maximum number of entries per batch.
+        
+        Yields:
+            tuple[str, list[ArchiveEntry]]: The segment and the entries of each batch.
+        """
+        segment: str | None = None
+        batch: list[ArchiveEntry] = []
+        for entry in self.entries(endpoints):
+            if batch and (entry.segment != segment or len(batch) >= batch_size):
+                yield segment, batch
+                batch = []
+            segment = entry.segment
+            batch.append(entry)
+        if batch:
+            yield segment, batch
+
+def _read_page(file: BinaryIO, entry: ArchiveEntry) -> ArchivedPage:
+    """
+    Read and decode an archived response from its segment.
+    
+    Parameters:
+        file (BinaryIO): The segment.
+        entry (ArchiveEntry): The index entry of the response.
+    
+    Returns:
+        ArchivedPage: The archived response.
+    """
+    file.seek(entry.offset)
+    data: bytes = file.read(entry.length)
+    if entry.segment.endswith(".zst"):
+        record: bytes = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        record = zlib.decompress(data, 31)
+    
+    warc_end: int = record.index(b"\r\n\r\n")
+    warc_headers: dict[str, str] = dict(line.split(": ", 1) for line in record[:warc_end].decode().split("\r\n")[1:])
+    block: bytes = record[warc_end + 4:warc_end + 4 + int(warc_headers["Content-Length"])]
+    
+    http_end: int = block.index(b"\r\n\r\n")
+    status_line, *header_lines = block[:http_end].decode("latin-1").split("\r\n")
+    return ArchivedPage(
+        entry=entry,
+        archived_at=datetime.strptime(warc_headers["WARC-Date"], "%Y-%m-%dT%H:%M:%SZ"),
+        status_code=int(status_line.split(" ", 2)[1]),
+        headers=[tuple(line.split(": ", 1)) for line in header_lines],
+        body=block[http_end + 4:]
+        )
+
+def _extract(page: ArchivedPage) -> SearchResult | TorrentInfo | NyaaRSSFeed:
+    """
+    Extract the model of an archived response, as the client would have.
+    
+    Parameters:
+        page (ArchivedPage): The archived response.
+    
+    Raises:
+        ValueError: If the endpoint is not one of the parsed endpoints.
+    
+    Returns:
+        SearchResult | TorrentInfo | NyaaRSSFeed: The model.
+    """
+    from .parsers import parse_html, parse_rss, extract_search_result, extract_torrent_info, extract_feed
+    
+    entry: ArchiveEntry = page.entry
+    if entry.endpoint == "search":
+        return extract_search_result(parse_html(page.body), entry.site, entry.base_url)
+    if entry.endpoint == "view":
+        return extract_torrent_info(parse_html(page.body), entry.site, entry.base_url)
+    if entry.endpoint == "rss":
+        magnet_only: bool = "magnets" in parse_qs(urlparse(entry.url).query, keep_blank_values=True)
+        return extract_feed(parse_rss(page.body.decode("utf-8", errors="replace")), entry.site, magnet_only)
+    raise ValueError(f"Unknown endpoint: {entry.endpoint}")
+
+def _replay_batch(path: str, entries: list[ArchiveEntry]) -> list[ReplayResult]:
+    """
+    Extract the models of a batch of archived responses of a segment. Runs in the worker processes.
+    
+    Parameters:
+        path (str): The path of the segment.
+        entries (list[ArchiveEntry]): The index entries of the responses.
+    
+    Returns:
+        list[ReplayResult]: The results.
+    """
+    results: list[ReplayResult] = []
+    with open(path, "rb") as file:
+        for entry in entries:
+            try:
+                results.append(ReplayResult(entry, _extract(_read_page(file, entry))))
+            except Exception as e:
+                results.append(ReplayResult(entry, None, e))
+    return results
\ No newline at end of file
@@ -0,0 +1,725 @@
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, Self, TypeVar
+import time
+
+import httpx
+
+from .archive import PageArchive
+from .circuit import CircuitBreaker, StaleCache
+from .enums import SITE, Priority
+from .exceptions import CircuitOpenError, DeadlineExceededError
+from .memo import ParseMemo
+from .metrics import Metrics, RequestTrace
+from .mirrors import MirrorPool
+from .proxies import ProxyPool
+from .scheduler import RequestScheduler
+
+D = TypeVar("D")
+T = TypeVar("T")
+
+class BaseClient:
+    """
+    Base of the scraper and RSS clients.
+    """
+    DEFAULT_SITE: SITE = SITE.FUN
+    TIMEOUT: int = 30
+    
+    def __init__(
+        self: Self,
+        site: SITE = DEFAULT_SITE,
+        timeout: int = TIMEOUT,
+        memo: ParseMemo | None = None,
+        metrics: Metrics | None = None,
+        archive: PageArchive | None = None,
+        scheduler: RequestScheduler | None = None,
+        mirrors: dict[SITE, MirrorPool] | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        stale_cache: StaleCache | None = None,
+        proxies: ProxyPool | None = None
+        ) -> None:
+        """
+        Initialize client.
+        
+        Parameters:
+            site (SITE, optional): The site to scrape from. Defaults to DEFAULT_SITE.
+            timeout (int, optional): The timeout for HTTP requests. Defaults to TIMEOUT.
+            memo (ParseMemo | None, optional): Memo of parsed models to skip parsing byte-identical responses. Defaults to None.
+            metrics (Metrics | None, optional): Metrics to report request and parse timings to. If None, nothing is reported. Defaults to None.
+            archive (PageArchive | None, optional): Archive to store the raw responses in, to extract them again later. Defaults to None.
+            scheduler (RequestScheduler | None, optional): Scheduler to send requests through, by priority and within its limits. If None, requests are sent right away. Defaults to None.
+            mirrors (dict[SITE, MirrorPool] | None, optional): The base URLs of each site to route requests to, with failover. If None, or for sites without a pool, the URL of the site is used. Defaults to None.
+            circuit_breaker (CircuitBreaker | None, optional): Circuit breaker to fail requests fast with while an endpoint is failing. Defaults to None.
+            stale_cache (StaleCache | None, optional): Cache of the last known good responses, served as stale results while an endpoint is failing. Defaults to None.
+            proxies (ProxyPool | None, optional): Egress proxies to send requests through, each within its own budget. If None, requests are sent directly. Defaults to None.
+        """
+        self.mirrors: dict[SITE, MirrorPool] = mirrors or {}
+        self._site = site
+        self.base_url = self.mirrors[site].primary if site in self.mirrors else site.value
+        self.timeout = timeout
+        self.memo = memo
+        self.metrics: Metrics = metrics if metrics is not None else Metrics()
+        self.archive = archive
+        self.scheduler = scheduler
+        self.circuit_breaker = circuit_breaker
+        self.stale_cache = stale_cache
+        self.proxies = proxies
+        
+        self._http_client: httpx.AsyncClient = httpx.AsyncClient(timeout=self.timeout)
+    
+    @property
+    def site(self: Self) -> SITE:
+        """
+        Getter property for the current site of the client.
+        
+        Returns:
+            SITE: The current site used by the client.
+        """
+        return self._site
+    
+    @site.setter
+    def site(self: Self, new_site: SITE) -> None:
+        """
+        Set the site to scrape from.
+        
+        Changing the site while requests are running affects them. To scrape several sites concurrently,
+        pass the site to each call instead.
+        
+        Parameters:
+            new_site (SITE): The new site to set.
+        """
+        self._site = new_site
+        self.base_url = self.mirrors[new_site].primary if new_site in self.mirrors else new_site.value
+    
+    async def aclose(self: Self) -> None:
+        """
+        Close the HTTP client with its pooled connections. The client cannot send requests anymore.
+        
+        The proxy pool can be shared, so it is not closed.
+        """
+        await self._http_client.aclose()
+    
+    def _resolve_site(self: Self, site: SITE | None) -> tuple[SITE, str]:
+        """
+        Get the site of a call and the base URL of its requests and models.
+        
+        Parameters:
+            site (SITE | None): The site passed to the call. If None, the site of the client.
+        
+        Returns:
+            tuple[SITE, str]: The site and its base URL.
+        """
+        if site is None or site is self._site:
+            return self._site, self.base_url
+        return site, self.mirrors[site].primary if site in self.mirrors else site.value
+    
+    async def _get(
+        self: Self,
+        endpoint: str,
+        url: str,
+        params: dict[str, Any] | None = None,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None
+        ) -> httpx.Response:
+        """
+        Send a GET request and read the response body.
+        
+        If the URL is on a base URL of a mirror pool, the request is routed to the fastest healthy base URL of the pool,
+        and fails over to the next one on connection errors, timeouts, 429 and 5xx responses.
+        With a proxy pool, the request and its failovers are sent through the least loaded healthy proxy with budget left,
+        and sent again through another proxy on connection errors, timeouts, 403 and 429 responses.
+        If the request fails that way, or its circuit is open, the last known good response is returned
+        from the stale cache if there is one, with the "stale" extension set.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics, such as "search".
+            url (str): The URL.
+            params (dict[str, Any] | None, optional): The query parameters. Defaults to None.
+            priority (Priority, optional): The priority of the request in the scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the response must be received. Defaults to None.
+            site (SITE | None, optional): The site of the request for the circuit and the archive. If None, the site of the client. Defaults to None.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request.
+            DeadlineExceededError: If the deadline passes before the response is received.
+            CircuitOpenError: If the circuit of the endpoint is open.
+        
+        Returns:
+            httpx.Response: The response.
+        """
+        site, base_url = self._resolve_site(site)
+        key: str | None = StaleCache.make_key(url, params) if self.stale_cache is not None else None
+        try:
+            with self.__circuit(endpoint, site):
+                async with self.__slot(endpoint, priority, deadline):
+                    response: httpx.Response = await self.__fetch_through_proxies(endpoint, url, params, deadline)
+        except (CircuitOpenError, httpx.HTTPError) as error:
+            if key is None or not self.__is_outage(error) or (stale := self.stale_cache.get(key)) is None:
+                raise
+            self.metrics.count(endpoint, "stale")
+            return stale
+        
+        if key is not None:
+            self.stale_cache.put(key, response)
+        if self.archive is not None:
+            self.archive.add(endpoint, site, base_url, response)
+        return response
+    
+    @asynccontextmanager
+    async def _stream(
+        self: Self,
+        endpoint: str,
+        url: str,
+        params: dict[str, Any] | None = None,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None
+        ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a GET request without reading the response body. The scheduler slot is held until the body is read.
+        
+        Mirror and proxy pools are used as by `_get`, but only until the response headers are received, and requests are not sent again
+        through another proxy. Responses are not stored in the stale cache.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics, such as "search".
+            url (str): The URL.
+            params (dict[str, Any] | None, optional): The query parameters. Defaults to None.
+            priority (Priority, optional): The priority of the request in the scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the response headers must be received. Defaults to None.
+            site (SITE | None, optional): The site of the request for the circuit. If None, the site of the client. Defaults to None.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request.
+            DeadlineExceededError: If the deadline passes before the response headers are received.
+            CircuitOpenError: If the circuit of the endpoint is open.
+        
+        Yields:
+            httpx.Response: The response with the body not read yet.
+        """
+        site, _ = self._resolve_site(site)
+        with self.__circuit(endpoint, site):
+            async with self.__slot(endpoint, priority, deadline), self.__egress(endpoint, deadline, []) as http_client:
+                routes: list[tuple[MirrorPool | None, str | None, str]] = self.__route(url)
+                for attempt, (pool, mirror, route_url) in enumerate(routes):
+                    timeout: float = self.__timeout(endpoint, deadline)
+                    if pool is not None:
+                        pool.started(mirror)
+                    started: float = time.perf_counter()
+                    stack = AsyncExitStack()
+                    try:
+                        response: httpx.Response = await stack.enter_async_context(
+                            self.__open_stream(endpoint, http_client, route_url, params, timeout)
+                            )
+                    except httpx.HTTPError as error:
+                        self.__check_deadline(endpoint, pool, mirror, timeout, error)
+                        if not self.__fail_over(endpoint, pool, mirror, started, error, attempt == len(routes) - 1):
+                            raise
+                        continue
+                    except BaseException:
+                        if pool is not None:
+                            pool.cancelled(mirror)
+                        raise
+                    
+                    if pool is not None:
+                        pool.succeeded(mirror, time.perf_counter() - started)
+                    async with stack:
+                        yield response
+                    return
+    
+    async def __fetch_through_proxies(
+        self: Self,
+        endpoint: str,
+        url: str,
+        params: dict[str, Any] | None,
+        deadline: float | None
+        ) -> httpx.Response:
+        """
+        Send a GET request through the proxy pool, and read the response body.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            url (str): The URL.
+            params (dict[str, Any] | None): The query parameters.
+            deadline (float | None): The `time.monotonic()` time by which the response must be received.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request through the last proxy.
+            DeadlineExceededError: If the deadline passes before the response is received.
+        
+        Returns:
+            httpx.Response: The response.
+        """
+        tried: list[str] = []
+        while True:
+            try:
+                async with self.__egress(endpoint, deadline, tried) as http_client:
+                    return await self.__fetch(endpoint, http_client, url, params, deadline)
+            except httpx.HTTPError as error:
+                if self.proxies is None or len(tried) >= len(self.proxies.urls) or not self.__is_proxy_failure(error):
+                    raise
+                self.metrics.count(endpoint, "retries")
+    
+    async def __fetch(
+        self: Self,
+        endpoint: str,
+        http_client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any] | None,
+        deadline: float | None
+        ) -> httpx.Response:
+        """
+        Send a GET request through the mirror pool of its URL, and read the response body.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            http_client (httpx.AsyncClient): The HTTP client to send the request with.
+            url (str): The URL.
+            params (dict[str, Any] | None): The query parameters.
+            deadline (float | None): The `time.monotonic()` time by which the response must be received.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request on the last base URL.
+            DeadlineExceededError: If the deadline passes before the response is received.
+        
+        Returns:
+            httpx.Response: The response.
+        """
+        routes: list[tuple[MirrorPool | None, str | None, str]] = self.__route(url)
+        for attempt, (pool, mirror, route_url) in enumerate(routes):
+            timeout: float = self.__timeout(endpoint, deadline)
+            if pool is not None:
+                pool.started(mirror)
+            started: float = time.perf_counter()
+            try:
+                response: httpx.Response = await self.__send(endpoint, http_client, route_url, params, timeout)
+            except httpx.HTTPError as error:
+                self.__check_deadline(endpoint, pool, mirror, timeout, error)
+                if not self.__fail_over(endpoint, pool, mirror, started, error, attempt == len(routes) - 1):
+                    raise
+                continue
+            except BaseException:
+                if pool is not None:
+                    pool.cancelled(mirror)
+                raise
+            
+            if pool is not None:
+                pool.succeeded(mirror, time.perf_counter() - started)
+            return response
+    
+    async def __send(
+        self: Self,
+        endpoint: str,
+        http_client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any] | None,
+        timeout: float
+        ) -> httpx.Response:
+        """
+        Send a GET request to a URL and read the response body.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            http_client (httpx.AsyncClient): The HTTP client to send the request with.
+            url (str): The URL.
+            params (dict[str, Any] | None): The query parameters.
+            timeout (float): The connect, read, write and pool timeout in seconds.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request.
+        
+        Returns:
+            httpx.Response: The response.
+        """
+        if not self.metrics.enabled:
+            response: httpx.Response = await http_client.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+            return response
+        
+        trace = RequestTrace()
+        self.metrics.count(endpoint, "requests")
+        try:
+            response = await http_client.get(url, params=params, timeout=timeout, extensions={"trace": trace})
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.metrics.count(endpoint, "errors")
+            raise
+        finally:
+            trace.report(self.metrics, endpoint)
+        
+        self.metrics.count(endpoint, "bytes_received", response.num_bytes_downloaded)
+        return response
+    
+    @asynccontextmanager
+    async def __open_stream(
+        self: Self,
+        endpoint: str,
+        http_client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any] | None,
+        timeout: float
+        ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a GET request to a URL without reading the response body.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            http_client (httpx.AsyncClient): The HTTP client to send the request with.
+            url (str): The URL.
+            params (dict[str, Any] | None): The query parameters.
+            timeout (float): The connect, read, write and pool timeout in seconds.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request.
+        
+        Yields:
+            httpx.Response: The response with the body not read yet.
+        """
+        if not self.metrics.enabled:
+            async with http_client.stream("GET", url, params=params, timeout=timeout) as response:
+                response.raise_for_status()
+                yield response
+            return
+        
+        trace = RequestTrace()
+        self.metrics.count(endpoint, "requests")
+        try:
+            async with http_client.stream("GET", url, params=params, timeout=timeout, extensions={"trace": trace}) as response:
+                response.raise_for_status()
+                yield response
+                self.metrics.count(endpoint, "bytes_received", response.num_bytes_downloaded)
+        except httpx.HTTPError:
+            self.metrics.count(endpoint, "errors")
+            raise
+        finally:
+            trace.report(self.metrics, endpoint)
+    
+    def __route(self: Self, url: str) -> list[tuple[MirrorPool | None, str | None, str]]:
+        """
+        Get the URLs to try a request with, in order.
+        
+        Parameters:
+            url (str): The URL.
+        
+        Returns:
+            list[tuple[MirrorPool | None, str | None, str]]: The mirror pool, base URL and URL of each attempt.
+                The URL as is, without a mirror pool, if it is not on a base URL of a mirror pool.
+        """
+        for pool in self.mirrors.values():
+            for base_url in pool.urls:
+                if url == base_url or url.startswith(base_url + "/"):
+                    # Through the proxies too, so health checks do not reveal the IP address of the client,
+                    # and not waiting longer for a proxy than for the response.
+                    pool.maybe_check(self._http_client if self.proxies is None else lambda: self.__egress(
+                        "health_check",
+                        time.monotonic() + pool.HEALTH_CHECK_TIMEOUT,
+                        []
+                        ))
+                    path: str = url[len(base_url):]
+                    return [(pool, mirror, mirror + path) for mirror in pool.route()]
+        return [(None, None, url)]
+    
+    def __fail_over(
+        self: Self,
+        endpoint: str,
+        pool: MirrorPool | None,
+        mirror: str | None,
+        started: float,
+        error: httpx.HTTPError,
+        last: bool
+        ) -> bool:
+        """
+        Record a failed attempt of a request, and decide whether to try the next base URL.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            pool (MirrorPool | None): The mirror pool of the attempt.
+            mirror (str | None): The base URL of the attempt.
+            started (float): The `time.perf_counter()` time the attempt started.
+            error (httpx.HTTPError): The error of the attempt.
+            last (bool): Whether it was the last base URL.
+        
+        Returns:
+            bool: True to try the next base URL, False to raise the error.
+        """
+        if pool is None:
+            return False
+        
+        if not self.__is_outage(error):
+            # The base URL answered, so the error is not its fault.
+            pool.succeeded(mirror, time.perf_counter() - started)
+            return False
+        
+        pool.failed(mirror)
+        if last:
+            return False
+        self.metrics.count(endpoint, "retries")
+        return True
+    
+    def __timeout(self: Self, endpoint: str, deadline: float | None) -> float:
+        """
+        Get the timeout of a request, capped by the time left until its deadline.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            deadline (float | None): The `time.monotonic()` time by which the response must be received.
+        
+        Raises:
+            DeadlineExceededError: If the deadline passed.
+        
+        Returns:
+            float: The timeout in seconds.
+        """
+        if deadline is None:
+            return self.timeout
+        
+        if (remaining := deadline - time.monotonic()) <= 0:
+            self.metrics.count(endpoint, "deadline_exceeded")
+            raise DeadlineExceededError("Deadline passed before the response was received")
+        return min(self.timeout, remaining)
+    
+    def __check_deadline(
+        self: Self,
+        endpoint: str,
+        pool: MirrorPool | None,
+        mirror: str | None,
+        timeout: float,
+        error: httpx.HTTPError
+        ) -> None:
+        """
+        Raise `DeadlineExceededError` if an attempt of a request timed out because of its deadline.
+        
+        Such a timeout is not counted against the base URL, nor retried on another one, since no time is left.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            pool (MirrorPool | None): The mirror pool of the attempt.
+            mirror (str | None): The base URL of the attempt.
+            timeout (float): The timeout of the attempt.
+            error (httpx.HTTPError): The error of the attempt.
+        
+        Raises:
+            DeadlineExceededError: If the attempt timed out with a timeout capped by the deadline.
+        """
+        if not isinstance(error, httpx.TimeoutException) or timeout >= self.timeout:
+            return
+        
+        if pool is not None:
+            pool.cancelled(mirror)
+        self.metrics.count(endpoint, "deadline_exceeded")
+        raise DeadlineExceededError("Deadline passed before the response was received") from error
+    
+    @contextmanager
+    def __circuit(self: Self, endpoint: str, site: SITE) -> Iterator[None]:
+        """
+        Let a request through the circuit of its endpoint, and record whether it succeeded.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request.
+            site (SITE): The site of the request.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        if self.circuit_breaker is None:
+            yield
+            return
+        
+        name: str = f"{site.name.lower()}.{endpoint}"
+        try:
+            self.circuit_breaker.allow(name)
+        except CircuitOpenError:
+            self.metrics.count(endpoint, "circuit_open")
+            raise
+        
+        try:
+            yield
+        except BaseException as error:
+            if isinstance(error, httpx.HTTPError) and self.__is_outage(error):
+                self.circuit_breaker.failed(name)
+            elif isinstance(error, httpx.HTTPStatusError):
+                # The site answered.
+                self.circuit_breaker.succeeded(name)
+            else:
+                self.circuit_breaker.released(name)
+            raise
+        self.circuit_breaker.succeeded(name)
+    
+    @asynccontextmanager
+    async def __egress(self: Self, endpoint: str, deadline: float | None, tried: list[str]) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Pick the proxy of a request, and record whether the request through it succeeded.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics.
+            deadline (float | None): The `time.monotonic()` time by which the request must be sent.
+            tried (list[str]): The proxies the request was already sent through, which are picked last. The picked proxy is added to it.
+        
+        Raises:
+            DeadlineExceededError: If no proxy can send the request before the deadline.
+        
+        Yields:
+            httpx.AsyncClient: The HTTP client of the proxy, or the HTTP client of the client without a proxy pool.
+        """
+        if self.proxies is None:
+            yield self._http_client
+            return
+        
+        started_ns: int = time.perf_counter_ns()
+        try:
+            proxy: str = await self.proxies.acquire(deadline, tried)
+        except DeadlineExceededError:
+            self.metrics.count(endpoint, "deadline_exceeded")
+            raise
+        self.metrics.timing(endpoint, "proxy_wait", started_ns, time.perf_counter_ns())
+        tried.append(proxy)
+        
+        try:
+            yield self.proxies.http_client(proxy)
+        except httpx.HTTPError as error:
+            if self.__is_throttled(error):
+                self.proxies.throttled(proxy, error.response.headers.get("Retry-After"))
+                self.metrics.count(endpoint, "proxy_throttled")
+            elif self.__is_outage(error):
+                self.proxies.failed(proxy)
+            else:
+                # The request went through the proxy.
+                self.proxies.succeeded(proxy)
+            raise
+        except BaseException:
+            self.proxies.released(proxy)
+            raise
+        self.proxies.succeeded(proxy)
+    
+    @staticmethod
+    def __is_proxy_failure(error: httpx.HTTPError) -> bool:
+        """
+        Check whether an error may be caused by the proxy a request was sent through, so another proxy may succeed.
+        
+        Parameters:
+            error (httpx.HTTPError): The error.
+        
+        Returns:
+            bool: True for connection errors, timeouts, 403 and 429 responses, False otherwise.
+        """
+        return isinstance(error, httpx.TransportError) or BaseClient.__is_throttled(error)
+    
+    @staticmethod
+    def __is_throttled(error: httpx.HTTPError) -> bool:
+        """
+        Check whether an error is a response throttling the IP address the request was sent from.
+        
+        The site answers 403 as well as 429 to IP addresses it blocks, so both quarantine the proxy the request was sent through.
+        
+        Parameters:
+            error (httpx.HTTPError): The error.
+        
+        Returns:
+            bool: True for 403 and 429 responses, False otherwise.
+        """
+        return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in (403, 429)
+    
+    @staticmethod
+    def __is_outage(error: Exception) -> bool:
+        """
+        Check whether an error means that the site, or a base URL of it, is down or overloaded.
+        
+        Parameters:
+            error (Exception): The error.
+        
+        Returns:
+            bool: True for open circuits, connection errors, timeouts, 429 and 5xx responses, False otherwise.
+        """
+        if isinstance(error, (CircuitOpenError, httpx.TransportError)):
+            return True
+        return isinstance(error, httpx.HTTPStatusError) and (error.response.status_code >= 500 or error.response.status_code == 429)
+    
+    @asynccontextmanager
+    async def __slot(self: Self, endpoint: str, priority: Priority, deadline: float | None) -> AsyncIterator[None]:
+        """
+        Wait for the turn of a request in the scheduler, and hold its slot while it is sent.
+        
+        Parameters:
+            endpoint (str): The endpoint of the request for the metrics, such as "search".
+            priority (Priority): The priority of the request.
+            deadline (float | None): The `time.monotonic()` time by which the request must be sent.
+        
+        Raises:
+            DeadlineExceededError: If the deadline passes before the request is sent.
+        """
+        if self.scheduler is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                self.metrics.count(endpoint, "deadline_exceeded")
+                raise DeadlineExceededError("Deadline passed before the request was sent")
+            yield
+            return
+        
+        started_ns: int = time.perf_counter_ns()
+        try:
+            await self.scheduler.acquire(priority, deadline)
+        except DeadlineExceededError:
+            self.metrics.count(endpoint, "deadline_exceeded")
+            raise
+        self.metrics.timing(endpoint, "queue", started_ns, time.perf_counter_ns())
+        
+        try:
+            yield
+        finally:
+            self.scheduler.release(priority)
+    
+    def _parse(
+        self: Self,
+        endpoint: str,
+        body: bytes,
+        parse: Callable[[], D],
+        extract: Callable[[D], T],
+        memo_kind: str | None = None,
+        base_url: str | None = None
+        ) -> T:
+        """
+        Parse a response body into a model, reusing the memoized model if the body was parsed before.
+        
+        Parameters:
+            endpoint (str): The endpoint of the response for the metrics, such as "search".
+            body (bytes): The response body.
+            parse (Callable[[], D]): Builds the document from the response body.
+            extract (Callable[[D], T]): Builds the model from the document.
+            memo_kind (str | None, optional): The kind of page for the memo key. If None, the endpoint is used. Defaults to None.
+            base_url (str | None, optional): The base URL of the page for the memo key. If None, the base URL of the client. Defaults to None.
+        
+        Returns:
+            T: The parsed model.
+        """
+        key: tuple[str, ...] | None = None
+        if self.memo is not None:
+            key = self.memo.make_key(memo_kind or endpoint, base_url or self.base_url, body)
+            if (model := self.memo.get(key)) is not None:
+                self.metrics.count(endpoint, "memo_hits")
+                return model
+        
+        started_ns: int = time.perf_counter_ns()
+        document: D = parse()
+        parsed_ns: int = time.perf_counter_ns()
+        model = extract(document)
+        self.metrics.timing(endpoint, "parse", started_ns, parsed_ns)
+        self.metrics.timing(endpoint, "extract", parsed_ns, time.perf_counter_ns())
+        
+        if key is not None:
+            self.memo.put(key, model, len(body))
+        return model
+    
+    @staticmethod
+    def _mark_stale(response: httpx.Response, model: T) -> T:
+        """
+        Mark a model as stale if its response was served from the stale cache.
+        
+        Parameters:
+            response (httpx.Response): The response the model was parsed from.
+            model (T): The model, which is not shared with the memo.
+        
+        Returns:
+            T: The model, with `stale` set if the response is stale.
+        """
+        if response.extensions.get("stale"):
+            model.stale = True
+        return model
\ No newline at end of file
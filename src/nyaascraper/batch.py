@@ -0,0 +1,317 @@
+from typing import Any, BinaryIO, Callable, Self, TextIO
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .client import NyaaClient
+from .enums import SITE
+from .scheduler import RequestScheduler
+from .utils.categories import get_category_by_id
+from .utils.json_default import json_default
+
+class BatchRunner:
+    """
+    Runs a batch of searches or torrent lookups concurrently, one per input line, and writes the results as JSON lines.
+    
+    Input lines are read in a background thread, so reading from a pipe does not block the requests,
+    and only a few lines ahead of the workers are read at a time. Empty lines and lines starting with "#" are skipped.
+    
+    Search lines are either the search term, or a JSON object of the arguments of `NyaaClient.search`,
+    such as {"term": "...", "category": "1_2", "sort_by": "seeders"}. View lines are the view ID or URL of a torrent.
+    
+    Each search page and torrent is written as {"input": ..., "result": ...} once received,
+    or {"input": ..., "error": ...} if it failed, so the output is in completion order.
+    
+    On the first interrupt, no new requests are started and the ones being sent are waited for.
+    On the second, they are cancelled.
+    """
+    SEARCH_ARGUMENTS: frozenset[str] = frozenset({"term", "username", "quality_filter", "category", "sort_by", "sort_order", "page"})
+    
+    def __init__(
+        self: Self,
+        command: str,
+        site: SITE,
+        concurrency: int,
+        rate: float | None,
+        timeout: float,
+        pages: int = 1
+        ) -> None:
+        """
+        Initialize batch runner.
+        
+        Parameters:
+            command (str): "search" or "view".
+            site (SITE): The site to send the requests to.
+            concurrency (int): The maximum number of requests being sent at a time.
+            rate (float | None): The maximum number of requests sent per second. If None, the rate is not limited.
+            timeout (float): The timeout for HTTP requests.
+            pages (int, optional): The maximum number of pages fetched per search. Defaults to 1.
+        """
+        self.command = command
+        self.site = site
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.pages = pages
+        
+        self.queries: int = 0
+        self.failed_queries: int = 0
+        self.cancelled_queries: int = 0
+        self.latencies: list[float] = []
+        self.failed_requests: int = 0
+        self.interrupted: bool = False
+        self.read_error: Exception | None = None
+        
+        self._queue: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue()
+        self._read_ahead: threading.Semaphore = threading.Semaphore(concurrency * 2)
+        self._output: BinaryIO | None = None
+        self._stopping: bool = False
+        self._workers: list[asyncio.Task] = []
+    
+    async def run(self: Self, input: TextIO, output: BinaryIO) -> float:
+        """
+        Run the batch until the input is exhausted or it is interrupted.
+        
+        Parameters:
+            input (TextIO): The input lines.
+            output (BinaryIO): The output for the JSON lines.
+        
+        Returns:
+            float: The seconds the batch took.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self._output = output
+        
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.__interrupt)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on Windows, where Ctrl-C stops the batch right away.
+            pass
+        
+        threading.Thread(target=self.__read, args=(input, loop), name="nyaascraper-input", daemon=True).start()
+        
+        client = NyaaClient(
+            site=self.site,
+            timeout=self.timeout,
+            scheduler=RequestScheduler(max_concurrency=self.concurrency, rate=self.rate)
+            )
+        started: float = time.perf_counter()
+        try:
+            self._workers = [asyncio.create_task(self.__work(client)) for _ in range(self.concurrency)]
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        finally:
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+            await client.aclose()
+        return time.perf_counter() - started
+    
+    def summary(self: Self, elapsed: float) -> str:
+        """
+        Summarize the throughput and latency of the batch.
+        
+        Parameters:
+            elapsed (float): The seconds the batch took.
+        
+        Returns:
+            str: The summary lines.
+        """
+        requests: int = len(self.latencies)
+        lines: list[str] = [
+            f"{self.queries} queries: {self.queries - self.failed_queries - self.cancelled_queries} ok, "
+            f"{self.failed_queries} failed, {self.cancelled_queries} cancelled" + (" (interrupted)" if self.interrupted else ""),
+            f"{requests} requests in {elapsed:.2f} s: {requests / elapsed if elapsed else 0.0:.1f} requests/s, "
+            f"{self.failed_requests} failed"
+            ]
+        if self.latencies:
+            latencies: list[float] = sorted(self.latencies)
+            percentiles: str = ", ".join(
+                f"p{percent} {latencies[min(len(latencies) - 1, len(latencies) * percent // 100)]:.3f} s"
+                for percent in (50, 90, 99)
+                )
+            lines.append(f"latency {percentiles}, max {latencies[-1]:.3f} s")
+        return "\n".join(lines)
+    
+    def __read(self: Self, input: TextIO, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Read the input lines into the queue, ending it with None. Runs in a background thread.
+        
+        Parameters:
+            input (TextIO): The input lines.
+            loop (asyncio.AbstractEventLoop): The event loop of the workers.
+        """
+        try:
+            try:
+                for number, line in enumerate(input, 1):
+                    if not (line := line.strip()) or line.startswith("#"):
+                        continue
+                    self._read_ahead.acquire()
+                    loop.call_soon_threadsafe(self._queue.put_nowait, (number, line))
+            except (OSError, UnicodeDecodeError) as error:
+                self.read_error = error
+            loop.call_soon_threadsafe(self._queue.put_nowait, None)
+        except (RuntimeError, ValueError):
+            # The event loop or the input is closed, such as after an interrupt.
+            pass
+    
+    def __interrupt(self: Self) -> None:
+        """
+        Stop starting new requests on the first interrupt, and cancel the ones being sent on the second.
+        """
+        if not self._stopping:
+            self.__stop()
+            self.interrupted = True
+            return
+        for worker in self._workers:
+            worker.cancel()
+    
+    def __stop(self: Self) -> None:
+        """
+        Stop starting new requests, waking up the idle workers.
+        """
+        self._stopping = True
+        self._queue.put_nowait(None)
+    
+    async def __work(self: Self, client: NyaaClient) -> None:
+        """
+        Run queries from the queue until it ends or the batch is stopped.
+        
+        Parameters:
+            client (NyaaClient): The shared client.
+        """
+        while not self._stopping:
+            item: tuple[int, str] | None = await self._queue.get()
+            if item is None or self._stopping:
+                # Let the other workers see the end too.
+                self._queue.put_nowait(None)
+                return
+            
+            self._read_ahead.release()
+            _, line = item
+            self.queries += 1
+            try:
+                if self.command == "search":
+                    await self.__search(client, line)
+                else:
+                    await self.__view(client, line)
+            except asyncio.CancelledError:
+                self.cancelled_queries += 1
+                raise
+            except Exception as error:
+                self.failed_queries += 1
+                self.__write({"input": line, "error": error})
+    
+    async def __search(self: Self, client: NyaaClient, line: str) -> None:
+        """
+        Run a search line, writing each of its pages.
+        
+        Parameters:
+            client (NyaaClient): The shared client.
+            line (str): The input line.
+        """
+        arguments: dict[str, Any] = self.__parse_search(line)
+        page: int | None = arguments.pop("page", 1)
+        for _ in range(self.pages):
+            result = await self.__timed(lambda: client.search(**arguments, page=page))
+            self.__write({"input": line, "page": page, "result": result})
+            if (page := result.next_page) is None or self._stopping:
+                break
+    
+    async def __view(self: Self, client: NyaaClient, line: str) -> None:
+        """
+        Run a view line, writing its torrent.
+        
+        Parameters:
+            client (NyaaClient): The shared client.
+            line (str): The input line.
+        """
+        try:
+            view_id: int = int(line.rstrip("/").rsplit("/", 1)[-1])
+        except ValueError:
+            raise ValueError(f"Invalid view ID: {line}") from None
+        
+        torrent = await self.__timed(lambda: client.get_torrent_info(view_id))
+        self.__write({"input": line, "result": torrent})
+    
+    async def __timed(self: Self, request: Callable[[], Any]) -> Any:
+        """
+        Send a request, recording its latency unless it is cancelled.
+        
+        Parameters:
+            request (Callable[[], Any]): Function returning the awaitable of the request.
+        
+        Returns:
+            Any: The result of the request.
+        """
+        started: float = time.perf_counter()
+        try:
+            result: Any = await request()
+        except Exception:
+            self.failed_requests += 1
+            self.latencies.append(time.perf_counter() - started)
+            raise
+        self.latencies.append(time.perf_counter() - started)
+        return result
+    
+    def __parse_search(self: Self, line: str) -> dict[str, Any]:
+        """
+        Get the search arguments of a search line.
+        
+        Parameters:
+            line (str): The input line.
+        
+        Raises:
+            ValueError: If the line is not a valid search.
+        
+        Returns:
+            dict[str, Any]: The arguments of `NyaaClient.search`.
+        """
+        if not line.startswith("{"):
+            return {"term": line}
+        
+        arguments: Any = json.loads(line)
+        if not isinstance(arguments, dict):
+            raise ValueError(f"Invalid search: {line}")
+        if unknown := arguments.keys() - self.SEARCH_ARGUMENTS:
+            raise ValueError(f"Unknown search arguments: {', '.join(sorted(unknown))}")
+        if (category := arguments.get("category")) is not None:
+            try:
+                arguments["category"] = get_category_by_id(self.site, str(category))
+            except KeyError as error:
+                raise ValueError(error.args[0]) from None
+        return arguments
+    
+    def __write(self: Self, record: dict[str, Any]) -> None:
+        """
+        Write a record as a JSON line.
+        
+        Parameters:
+            record (dict[str, Any]): The record.
+        """
+        if self._output is None:
+            return
+        
+        if orjson is not None:
+            line: bytes = orjson.dumps(record, default=json_default) + b"\n"
+        else:
+            line = (json.dumps(record, default=json_default, ensure_ascii=False) + "\n").encode()
+        
+        try:
+            self._output.write(line)
+            self._output.flush()
+        except BrokenPipeError:
+            # The reader of the output is gone, such as `head`: stop, and silence the final flush of stdout.
+            if self._output is sys.stdout.buffer:
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            self._output = None
+            self.__stop()
\ No newline at end of file
@@ -0,0 +1,182 @@
+from typing import Self
+import hashlib
+
+class BencodeError(ValueError):
+    """Raised when a torrent file is not valid bencode."""
+    pass
+
+class InfoHasher:
+    """
+    Incremental bencode parser computing the info hash of a torrent file while it is received.
+    
+    The info hash is the SHA-1 of the raw bencoded `info` value of the top-level dictionary.
+    Chunks are hashed as they are fed, so the torrent file never has to be buffered or read again.
+    """
+    # Parser states.
+    _VALUE: int = 0
+    _INTEGER: int = 1
+    _LENGTH: int = 2
+    _STRING: int = 3
+    
+    def __init__(self: Self) -> None:
+        """
+        Initialize info hasher.
+        """
+        self._sha1 = hashlib.sha1()
+        self._state: int = self._VALUE
+        # Open containers as [kind, expecting a key], where kind is "d" for dictionaries and "l" for lists.
+        self._stack: list[list] = []
+        
+        self._length: int = 0
+        self._remaining: int = 0
+        self._string_is_key: bool = False
+        self._key: bytearray = bytearray()
+        self._last_key: bytes | None = None
+        
+        self._hashing: bool = False
+        self._hashed: bool = False
+        self._complete: bool = False
+    
+    @property
+    def complete(self: Self) -> bool:
+        """
+        Getter property for whether the top-level value was fully parsed.
+        
+        Returns:
+            bool: True if the torrent file is complete.
+        """
+        return self._complete
+    
+    def feed(self: Self, chunk: bytes) -> None:
+        """
+        Feed the next chunk of the torrent file.
+        
+        Parameters:
+            chunk (bytes): The chunk.
+        
+        Raises:
+            BencodeError: If the data is not valid bencode.
+        """
+        index: int = 0
+        size: int = len(chunk)
+        hash_from: int = 0
+        
+        while index < size:
+            if self._complete:
+                raise BencodeError("Data after the end of the torrent file")
+            
+            if self._state == self._STRING:
+                take: int = min(self._remaining, size - index)
+                if self._string_is_key:
+                    self._key += chunk[index:index + take]
+                index += take
+                self._remaining -= take
+                if self._remaining == 0:
+                    self._state = self._VALUE
+                    if self._string_is_key:
+                        self._last_key = bytes(self._key)
+                        self._stack[-1][1] = False
+                    elif self._end_value():
+                        self._sha1.update(chunk[hash_from:index])
+            elif self._state == self._INTEGER:
+                end: int = chunk.find(b"e", index)
+                if end == -1:
+                    index = size
+                else:
+                    index = end + 1
+                    self._state = self._VALUE
+                    if self._end_value():
+                        self._sha1.update(chunk[hash_from:index])
+            elif self._state == self._LENGTH:
+                byte: int = chunk[index]
+                index += 1
+                if 48 <= byte <= 57:
+                    self._length = self._length * 10 + byte - 48
+                elif byte == 58:  # ":"
+                    self._remaining = self._length
+                    self._state = self._STRING
+                    self._key.clear()
+                    if self._remaining == 0:
+                        # Empty strings end without a string chunk.
+                        self._state = self._VALUE
+                        if self._string_is_key:
+                            self._last_key = b""
+                            self._stack[-1][1] = False
+                        elif self._end_value():
+                            self._sha1.update(chunk[hash_from:index])
+                else:
+                    raise BencodeError(f"Invalid byte in string length: {byte!r}")
+            else:
+                byte = chunk[index]
+                if byte == 101:  # "e"
+                    if not self._stack:
+                        raise BencodeError("Unexpected end of container")
+                    self._stack.pop()
+                    index += 1
+                    if self._end_value():
+                        self._sha1.update(chunk[hash_from:index])
+                    continue
+                
+                is_key: bool = bool(self._stack) and self._stack[-1][0] == "d" and self._stack[-1][1]
+                if is_key and not 48 <= byte <= 57:
+                    raise BencodeError("Dictionary keys must be strings")
+                
+                if not is_key and self._begin_value():
+                    hash_from = index
+                
+                if byte == 100 or byte == 108:  # "d" or "l"
+                    self._stack.append(["d" if byte == 100 else "l", byte == 100])
+                    index += 1
+                elif byte == 105:  # "i"
+                    self._state = self._INTEGER
+                    index += 1
+                elif 48 <= byte <= 57:
+                    self._state = self._LENGTH
+                    self._length = 0
+                    self._string_is_key = is_key
+                else:
+                    raise BencodeError(f"Invalid byte: {byte!r}")
+        
+        if self._hashing:
+            self._sha1.update(chunk[hash_from:size])
+    
+    def hexdigest(self: Self) -> str | None:
+        """
+        Get the info hash.
+        
+        Returns:
+            str | None: The info hash as lowercase hex, or None if the info dictionary was not fully received.
+        """
+        return self._sha1.hexdigest() if self._hashed else None
+    
+    def _begin_value(self: Self) -> bool:
+        """
+        Handle the start of a value that is not a dictionary key.
+        
+        Returns:
+            bool: True if hashing starts at this value.
+        """
+        if len(self._stack) == 1 and self._stack[0][0] == "d" and self._last_key == b"info" and not self._hashed:
+            self._hashing = True
+            return True
+        return False
+    
+    def _end_value(self: Self) -> bool:
+        """
+        Handle the end of a value that is not a dictionary key.
+        
+        Returns:
+            bool: True if hashing stops at this value.
+        """
+        if not self._stack:
+            self._complete = True
+            return False
+        
+        if self._stack[-1][0] == "d":
+            self._stack[-1][1] = True
+        
+        if self._hashing and len(self._stack) == 1:
+            self._hashing = False
+            self._hashed = True
+            return True
+        return False
\ No newline at end of file
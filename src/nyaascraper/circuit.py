@@ -0,0 +1,281 @@
+from collections import OrderedDict
+from typing import Self
+import time
+
+import httpx
+
+from .enums import CircuitState
+from .exceptions import CircuitOpenError
+from .models import CircuitStats
+
+class _Circuit:
+    """
+    State of a circuit.
+    """
+    __slots__ = ("state", "failures", "opened_at", "trials", "opened", "rejected")
+    
+    def __init__(self: Self) -> None:
+        self.state: CircuitState = CircuitState.CLOSED
+        self.failures: int = 0
+        self.opened_at: float = 0.0
+        self.trials: int = 0
+        self.opened: int = 0
+        self.rejected: int = 0
+
+class CircuitBreaker:
+    """
+    Fails requests fast while a site is failing, instead of letting each request wait out the timeout.
+    
+    Each site and endpoint of the clients, such as "fun.search" or "fap.view", has its own circuit.
+    A circuit opens after `failure_threshold` consecutive connection errors, timeouts, 429 or 5xx responses.
+    While open, requests raise `CircuitOpenError` right away. After `recovery_timeout` seconds the circuit is half-open:
+    up to `half_open_calls` trial requests are sent, and the circuit closes if they succeed or opens again if one fails.
+    
+    One circuit breaker can be shared by several clients.
+    """
+    FAILURE_THRESHOLD: int = 5
+    RECOVERY_TIMEOUT: float = 30.0
+    HALF_OPEN_CALLS: int = 1
+    
+    def __init__(
+        self: Self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        recovery_timeout: float = RECOVERY_TIMEOUT,
+        half_open_calls: int = HALF_OPEN_CALLS
+        ) -> None:
+        """
+        Initialize circuit breaker.
+        
+        Parameters:
+            failure_threshold (int, optional): The number of consecutive failures after which a circuit opens. Defaults to FAILURE_THRESHOLD.
+            recovery_timeout (float, optional): The seconds a circuit stays open before trial requests are sent. Defaults to RECOVERY_TIMEOUT.
+            half_open_calls (int, optional): The maximum number of trial requests sent at a time while a circuit is half-open. Defaults to HALF_OPEN_CALLS.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = half_open_calls
+        
+        self._circuits: dict[str, _Circuit] = {}
+    
+    def state(self: Self, name: str) -> CircuitState:
+        """
+        Get the state of a circuit.
+        
+        Parameters:
+            name (str): The name of the circuit.
+        
+        Returns:
+            CircuitState: The state of the circuit. CircuitState.CLOSED if no request was sent through it yet.
+        """
+        if (circuit := self._circuits.get(name)) is None:
+            return CircuitState.CLOSED
+        self.__recover(circuit)
+        return circuit.state
+    
+    def allow(self: Self, name: str) -> None:
+        """
+        Let a request through a circuit. Each call must be followed by a call to `succeeded`, `failed` or `released`.
+        
+        Parameters:
+            name (str): The name of the circuit.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all its trial requests being sent.
+        """
+        circuit: _Circuit = self._circuits.setdefault(name, _Circuit())
+        self.__recover(circuit)
+        if circuit.state is CircuitState.CLOSED:
+            return
+        
+        if circuit.state is CircuitState.HALF_OPEN and circuit.trials < self.half_open_calls:
+            circuit.trials += 1
+            return
+        
+        circuit.rejected += 1
+        retry_after: float = max(0.0, circuit.opened_at + self.recovery_timeout - time.monotonic())
+        raise CircuitOpenError(f"Circuit '{name}' is open, retry in {retry_after:.1f} seconds")
+    
+    def succeeded(self: Self, name: str) -> None:
+        """
+        Record a successful request through a circuit, closing it if it was half-open.
+        
+        Successes while the circuit is open are ignored: they are requests let through before it opened,
+        and only the trial requests sent once it is half-open may close it.
+        
+        Parameters:
+            name (str): The name of the circuit.
+        """
+        circuit: _Circuit = self._circuits[name]
+        if circuit.state is CircuitState.OPEN:
+            return
+        circuit.failures = 0
+        circuit.trials = 0
+        circuit.state = CircuitState.CLOSED
+    
+    def failed(self: Self, name: str) -> None:
+        """
+        Record a failed request through a circuit, opening it after too many failures in a row or a failed trial request.
+        
+        Parameters:
+            name (str): The name of the circuit.
+        """
+        circuit: _Circuit = self._circuits[name]
+        circuit.failures += 1
+        if circuit.state is CircuitState.HALF_OPEN or (
+            circuit.state is CircuitState.CLOSED and circuit.failures >= self.failure_threshold
+            ):
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = time.monotonic()
+            circuit.trials = 0
+            circuit.opened += 1
+    
+    def released(self: Self, name: str) -> None:
+        """
+        Record a request through a circuit that ended without telling whether the site works, such as a cancelled request.
+        
+        Parameters:
+            name (str): The name of the circuit.
+        """
+        circuit: _Circuit = self._circuits[name]
+        if circuit.state is CircuitState.HALF_OPEN and circuit.trials > 0:
+            circuit.trials -= 1
+    
+    def stats(self: Self) -> dict[str, CircuitStats]:
+        """
+        Get the state of each circuit.
+        
+        Returns:
+            dict[str, CircuitStats]: The state of each circuit a request was sent through.
+        """
+        stats: dict[str, CircuitStats] = {}
+        for name, circuit in self._circuits.items():
+            self.__recover(circuit)
+            stats[name] = CircuitStats(
+                name=name,
+                state=circuit.state,
+                failures=circuit.failures,
+                opened=circuit.opened,
+                rejected=circuit.rejected
+                )
+        return stats
+    
+    def __recover(self: Self, circuit: _Circuit) -> None:
+        """
+        Make an open circuit half-open once its recovery timeout passed.
+        
+        Parameters:
+            circuit (_Circuit): The circuit.
+        """
+        if circuit.state is CircuitState.OPEN and time.monotonic() - circuit.opened_at >= self.recovery_timeout:
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.trials = 0
+
+class StaleCache:
+    """
+    Last known good responses of the clients, served when a request fails because the site is down or its circuit is open.
+    
+    Responses are keyed by their URL with the query parameters. Models parsed from a served response are marked as stale.
+    
+    The cache is a size-aware LRU like `ParseMemo`: least recently used responses are evicted
+    once the total size of the response bodies exceeds `max_size`.
+    """
+    DEFAULT_MAX_SIZE: int = 64 * 1024 * 1024
+    
+    # The body of a stored response is already decoded.
+    _SKIPPED_HEADERS: frozenset[str] = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+    
+    def __init__(self: Self, max_size: int = DEFAULT_MAX_SIZE, max_age: float | None = None) -> None:
+        """
+        Initialize stale cache.
+        
+        Parameters:
+            max_size (int, optional): The maximum total size in bytes of the stored response bodies. Defaults to DEFAULT_MAX_SIZE.
+            max_age (float | None, optional): The seconds after which a stored response is not served anymore. If None, responses are served however old they are. Defaults to None.
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        
+        self._entries: OrderedDict[str, tuple[httpx.Response, float]] = OrderedDict()
+        self._size: int = 0
+    
+    @property
+    def size(self: Self) -> int:
+        """
+        Getter property for the total size of the stored response bodies.
+        
+        Returns:
+            int: The total size in bytes.
+        """
+        return self._size
+    
+    @staticmethod
+    def make_key(url: str, params: dict | None = None) -> str:
+        """
+        Make a cache key for a request.
+        
+        Parameters:
+            url (str): The URL of the request.
+            params (dict | None, optional): The query parameters of the request. Defaults to None.
+        
+        Returns:
+            str: The cache key.
+        """
+        return str(httpx.URL(url, params=params))
+    
+    def get(self: Self, key: str) -> httpx.Response | None:
+        """
+        Get a stored response.
+        
+        Parameters:
+            key (str): The cache key.
+        
+        Returns:
+            httpx.Response | None: A copy of the stored response with the "stale" extension set, or None if not stored or too old.
+        """
+        if (entry := self._entries.get(key)) is None:
+            return None
+        
+        response, stored_at = entry
+        if self.max_age is not None and time.monotonic() - stored_at > self.max_age:
+            return None
+        
+        self._entries.move_to_end(key)
+        return httpx.Response(
+            response.status_code,
+            headers=[(name, value) for name, value in response.headers.items() if name not in self._SKIPPED_HEADERS],
+            content=response.content,
+            request=response.request,
+            extensions={"stale": True, "stored_at": stored_at}
+            )
+    
+    def put(self: Self, key: str, response: httpx.Response) -> None:
+        """
+        Store a response whose body was read.
+        
+        Parameters:
+            key (str): The cache key.
+            response (httpx.Response): The response.
+        """
+        size: int = len(response.content)
+        if size > self.max_size:
+            return
+        
+        if (previous := self._entries.pop(key, None)) is not None:
+            self._size -= len(previous[0].content)
+        
+        self._entries[key] = (response, time.monotonic())
+        self._size += size
+        
+        while self._size > self.max_size:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._size -= len(evicted.content)
+    
+    def clear(self: Self) -> None:
+        """
+        Remove all stored responses.
+        """
+        self._entries.clear()
+        self._size = 0
+    
+    def __len__(self: Self) -> int:
+        return len(self._entries)
\ No newline at end of file
@@ -0,0 +1,103 @@
+from contextlib import ExitStack
+from typing import BinaryIO, TextIO
+import argparse
+import sys
+
+from .version import __version__
+
+SITES: dict[str, str] = {"fun": "FUN", "fap": "FAP"}
+
+def _positive_int(value: str) -> int:
+    if (number := int(value)) < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+def _positive_float(value: str) -> float:
+    if (number := float(value)) <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {value}")
+    return number
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser of the command line arguments.
+    
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="nyaascraper",
+        description="Run batches of searches or torrent lookups concurrently, writing the results as JSON lines."
+        )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("input", nargs="?", default="-", help="file with one query per line, or - for stdin (default: -)")
+    common.add_argument("-o", "--output", default="-", help="file to write the JSON lines to, or - for stdout (default: -)")
+    common.add_argument("-s", "--site", choices=SITES, default="fun", help="site to send the requests to (default: fun)")
+    common.add_argument("-c", "--concurrency", type=_positive_int, default=8, help="maximum number of requests being sent at a time (default: 8)")
+    common.add_argument("-r", "--rate", type=_positive_float, default=None, help="maximum number of requests sent per second (default: unlimited)")
+    common.add_argument("-t", "--timeout", type=_positive_float, default=30.0, help="timeout in seconds of each request (default: 30)")
+    
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser(
+        "search",
+        parents=[common],
+        help="run searches",
+        description="Run searches. Each line is a search term, or a JSON object of the arguments of NyaaClient.search."
+        )
+    search.add_argument("-p", "--pages", type=_positive_int, default=1, help="maximum number of pages fetched per search (default: 1)")
+    commands.add_parser(
+        "view",
+        parents=[common],
+        help="get torrents",
+        description="Get torrents. Each line is a view ID or the URL of a torrent page."
+        )
+    return parser
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the command line interface.
+    
+    Parameters:
+        argv (list[str] | None, optional): The command line arguments. If None, the arguments of the process. Defaults to None.
+    
+    Returns:
+        int: The exit status: 0 if all queries succeeded, 1 if some failed, 130 if interrupted.
+    """
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    
+    # The client and its dependencies are only imported once the arguments are valid, so --help stays fast.
+    import asyncio
+    
+    from .batch import BatchRunner
+    from .enums import SITE
+    
+    runner = BatchRunner(
+        command=args.command,
+        site=SITE[SITES[args.site]],
+        concurrency=args.concurrency,
+        rate=args.rate,
+        timeout=args.timeout,
+        pages=getattr(args, "pages", 1)
+        )
+    
+    with ExitStack() as files:
+        try:
+            input: TextIO = sys.stdin if args.input == "-" else files.enter_context(open(args.input, encoding="utf-8"))
+            output: BinaryIO = sys.stdout.buffer if args.output == "-" else files.enter_context(open(args.output, "wb"))
+        except OSError as error:
+            print(f"nyaascraper: {error}", file=sys.stderr)
+            return 2
+        
+        try:
+            elapsed: float = asyncio.run(runner.run(input, output))
+        except KeyboardInterrupt:
+            return 130
+    
+    print(runner.summary(elapsed), file=sys.stderr)
+    if runner.read_error is not None:
+        print(f"nyaascraper: cannot read input: {runner.read_error}", file=sys.stderr)
+        return 1
+    if runner.interrupted:
+        return 130
+    return 1 if runner.failed_queries else 0
\ No newline at end of file
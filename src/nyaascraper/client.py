@@ -1,340 +1,570 @@
-from datetime import datetime
-from urllib.parse import urlparse, parse_qs
+from typing import AsyncIterable, AsyncIterator, Iterable, Self
+import asyncio
+import os
 import re
-from typing import Self
 
-from bs4.element import Tag
-from bs4 import BeautifulSoup
 import httpx
 
-from .exceptions import TorrentNotFoundError
+from .base import BaseClient
+from .bencode import BencodeError, InfoHasher
+from .dedup import DedupIndex
+from .download import TorrentSink, DirectorySink
+from .exceptions import TorrentNotFoundError, InfoHashMismatchError, CircuitOpenError, DeadlineExceededError
 from .enums import (
-    SITE,
     QualityFilter,
     FunCategory, FapCategory,
     SortBy, SortOrder,
-    TorrentType,
-    UserLevel
+    DownloadStatus,
+    Priority,
+    SITE
     )
 from .utils.categories import get_category_by_id
+from .utils.magnet import get_info_hash_from_magnet
+from .parsers import parse_html, extract_search_result, extract_torrent_info
 
 from .models import (
     SearchResult,
     SearchResultTorrent,
     TorrentInfo,
-    User,
-    File, Folder,
-    Comment
+    NyaaRSSTorrent,
+    DownloadResult
     )
 
-class NyaaClient:
+class NyaaClient(BaseClient):
     """
     Scraper client.
     """
-    DEFAULT_SITE: SITE = SITE.FUN
-    TIMEOUT: int = 30
+    # Used by the streaming search queries to avoid building the whole page.
+    PAGINATION_INFO_PATTERN: re.Pattern = re.compile(
+        r"class=\"pagination-page-info\">\s*Displaying results (\d+)-(\d+) out of (\d+) results\."
+        )
+    ROW_PATTERN: re.Pattern = re.compile(r"<tr class=\"(?:default|success|danger)\"")
+    STREAM_OVERLAP: int = 256
     
-    def __init__(self: Self, site: SITE = DEFAULT_SITE, timeout: int = TIMEOUT) -> None:
+    DOWNLOAD_CONCURRENCY: int = 8
+    
+    async def search(
+        self: Self,
+        term: str | None = None,
+        username: str | None = None,
+        quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
+        category: FunCategory | FapCategory | int | None = None,
+        sort_by: SortBy | str | None = None,
+        sort_order: SortOrder | str | None = None,
+        page: int = 1,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None
+        ) -> SearchResult:
         """
-        Initialize scraper client.
+        Search torrents.
         
         Parameters:
-            site (SITE, optional): The site to scrape from. Defaults to DEFAULT_SITE.
-            timeout (int, optional): The timeout for HTTP requests. Defaults to TIMEOUT.
-        """
-        self._site = site
-        self.base_url = site.value
-        self.timeout = timeout
+            term (str | None, optional): Search term. Defaults to None.
+            username (str | None, optional): Search torrents of a user. Defaults to None.
+            quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
+            category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
+            sort_by (SortBy | str | None, optional): Sort results by. Defaults to None.
+            sort_order (SortOrder | str | None, optional): Sort order of search. Defaults to None.
+            page (int, optional): Page number of search result. Defaults to 1.
+            priority (Priority, optional): The priority of the request if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the response must be received. If None, there is no deadline. Defaults to None.
+            site (SITE | None, optional): The site to search. If None, the site of the client. Defaults to None.
         
-        self._http_client: httpx.AsyncClient = httpx.AsyncClient(timeout=self.timeout)
-    
-    @property
-    def site(self: Self) -> SITE:
-        """
-        Getter property for the current site of the client.
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request.
+            DeadlineExceededError: If the deadline passes before the response is received.
+            CircuitOpenError: If the circuit of the endpoint is open and no stale result is cached.
         
         Returns:
-            SITE: The current site used by the client.
+            SearchResult: Result of the search.
         """
-        return self._site
+        url, params = self.__build_search_request(
+            term=term,
+            username=username,
+            quality_filter=quality_filter,
+            category=category,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            page=page,
+            site=site
+            )
+        
+        response: httpx.Response = await self._get("search", url, params=params, priority=priority, deadline=deadline, site=site)
+        
+        site, base_url = self._resolve_site(site)
+        result: SearchResult = self._parse(
+            "search",
+            response.content,
+            lambda: parse_html(response.content),
+            lambda soup: extract_search_result(soup, site, base_url),
+            base_url=base_url
+            )
+        result = self._mark_stale(response, result)
+        self.metrics.count("search", "rows", len(result.torrents))
+        return result
     
-    @site.setter
-    def site(self: Self, new_site: SITE) -> None:
+    async def iter_search(
+        self: Self,
+        term: str | None = None,
+        username: str | None = None,
+        quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
+        category: FunCategory | FapCategory | int | None = None,
+        sort_by: SortBy | str | None = None,
+        sort_order: SortOrder | str | None = None,
+        start_page: int = 1,
+        max_pages: int | None = None,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None,
+        dedup: DedupIndex | None = None
+        ) -> AsyncIterator[SearchResultTorrent]:
         """
-        Set the site to scrape from.
+        Iterate the torrents of every result page of a search.
+        
+        The next page is only requested once the torrents of the current page are consumed,
+        so a slow consumer, such as an export sink, slows down the crawl instead of buffering pages.
+        
+        With a dedup index, torrents seen before are skipped, such as torrents pushed to the next page by new uploads during the crawl.
         
         Parameters:
-            new_site (SITE): The new site to set.
+            term (str | None, optional): Search term. Defaults to None.
+            username (str | None, optional): Search torrents of a user. Defaults to None.
+            quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
+            category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
+            sort_by (SortBy | str | None, optional): Sort results by. Defaults to None.
+            sort_order (SortOrder | str | None, optional): Sort order of search. Defaults to None.
+            start_page (int, optional): Page number to start from. Defaults to 1.
+            max_pages (int | None, optional): The maximum number of pages to request. If None, every page is requested. Defaults to None.
+            priority (Priority, optional): The priority of the requests if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which every response must be received. If None, there is no deadline. Defaults to None.
+            site (SITE | None, optional): The site to search. If None, the site of the client. Defaults to None.
+            dedup (DedupIndex | None, optional): Index of the torrents seen before, to skip them. The yielded torrents are added to it. Defaults to None.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during a request.
+            DeadlineExceededError: If the deadline passes before a response is received.
+            CircuitOpenError: If the circuit of the endpoint is open and no stale result is cached.
+        
+        Yields:
+            SearchResultTorrent: The torrents, in the order of the result pages.
         """
-        self._site = new_site
-        self.base_url = new_site.value
+        page: int | None = start_page
+        pages: int = 0
+        while page is not None and (max_pages is None or pages < max_pages):
+            result: SearchResult = await self.search(
+                term=term,
+                username=username,
+                quality_filter=quality_filter,
+                category=category,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                page=page,
+                priority=priority,
+                deadline=deadline,
+                site=site
+                )
+            pages += 1
+            
+            for torrent in result.torrents:
+                if dedup is None or dedup.add(torrent):
+                    yield torrent
+            page = result.next_page
     
-    async def search(
+    async def search_sites(
         self: Self,
         term: str | None = None,
         username: str | None = None,
         quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
-        category: FunCategory | FapCategory | int | None = None,
         sort_by: SortBy | str | None = None,
         sort_order: SortOrder | str | None = None,
-        page: int = 1
-        ) -> SearchResult:
+        page: int = 1,
+        sites: Iterable[SITE] = tuple(SITE),
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None
+        ) -> dict[SITE, SearchResult]:
         """
-        Search torrents.
+        Search torrents on several sites concurrently.
+        
+        The categories differ between sites, so every site is searched in all categories.
+        The torrents of each result keep the site and the URLs of the site they were found on.
         
         Parameters:
             term (str | None, optional): Search term. Defaults to None.
             username (str | None, optional): Search torrents of a user. Defaults to None.
             quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
-            category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
             sort_by (SortBy | str | None, optional): Sort results by. Defaults to None.
             sort_order (SortOrder | str | None, optional): Sort order of search. Defaults to None.
             page (int, optional): Page number of search result. Defaults to 1.
+            sites (Iterable[SITE], optional): The sites to search. Defaults to every site.
+            priority (Priority, optional): The priority of the requests if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which every response must be received. If None, there is no deadline. Defaults to None.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during a request.
+            DeadlineExceededError: If the deadline passes before a response is received.
+            CircuitOpenError: If the circuit of the endpoint is open and no stale result is cached.
+        
+        Returns:
+            dict[SITE, SearchResult]: The result of the search on each site.
+        """
+        sites = list(dict.fromkeys(sites))
+        results: list[SearchResult] = await asyncio.gather(*(
+            self.search(
+                term=term,
+                username=username,
+                quality_filter=quality_filter,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                page=page,
+                priority=priority,
+                deadline=deadline,
+                site=site
+                )
+            for site in sites
+        ))
+        return dict(zip(sites, results))
+    
+    async def search_count(
+        self: Self,
+        term: str | None = None,
+        username: str | None = None,
+        quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
+        category: FunCategory | FapCategory | int | None = None,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None
+        ) -> int:
+        """
+        Count the total results of a search without parsing the result page.
+        
+        The response is streamed and scanned for the pagination info instead of being parsed into a document and models.
+        The pagination info follows the torrent list, so nearly the whole page is still downloaded: the saving is in parsing,
+        and only the footer after the pagination info is not read.
+        
+        Parameters:
+            term (str | None, optional): Search term. Defaults to None.
+            username (str | None, optional): Search torrents of a user. Defaults to None.
+            quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
+            category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
+            priority (Priority, optional): The priority of the request if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the response must be received. If None, there is no deadline. Defaults to None.
+            site (SITE | None, optional): The site to search. If None, the site of the client. Defaults to None.
         
         Raises:
             httpx.HTTPError: If an HTTP-related error occurs during the request.
+            DeadlineExceededError: If the deadline passes before the response is received.
+            CircuitOpenError: If the circuit of the endpoint is open.
         
         Returns:
-            SearchResult: Result of the search.
+            int: The number of total results.
         """
-        if category is None:
-            category = get_category_by_id(self.site, "0_0")
+        url, params = self.__build_search_request(
+            term=term,
+            username=username,
+            quality_filter=quality_filter,
+            category=category,
+            site=site
+            )
         
-        url: str = f"{self.base_url}/user/{username}" if username else self.base_url
-        params = {
-            "q": term,
-            "f": quality_filter.value if isinstance(quality_filter, QualityFilter) else quality_filter,
-            "c": category.value if isinstance(category, (FunCategory, FapCategory)) else category,
-            "p": page,
-            "s": sort_by.value if isinstance(sort_by, SortBy) else sort_by,
-            "o": sort_order.value if isinstance(sort_order, SortOrder) else sort_order
-        }
+        async with self._stream("search_count", url, params=params, priority=priority, deadline=deadline, site=site) as response:
+            total_rows: int = 0
+            previous: str = ""
+            async for chunk in response.aiter_text():
+                window: str = previous + chunk
+                if (matches := self.PAGINATION_INFO_PATTERN.search(window)):
+                    return int(matches.group(3))
+                
+                # Only count rows ending in the new chunk, since the overlap was already counted.
+                total_rows += sum(1 for row in self.ROW_PATTERN.finditer(window) if row.end() > len(previous))
+                previous = window[-self.STREAM_OVERLAP:]
+        
+        # Pagination info is not available if there is only one page of results.
+        return total_rows
+    
+    async def search_exists(
+        self: Self,
+        term: str | None = None,
+        username: str | None = None,
+        quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
+        category: FunCategory | FapCategory | int | None = None,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None
+        ) -> bool:
+        """
+        Check whether a search has at least one result without parsing the result page.
         
-        response: httpx.Response = await self._http_client.get(url, params={k: v for k, v in params.items() if v is not None})
-        response.raise_for_status()
+        The response is streamed and reading stops as soon as the first torrent row or the end of the torrent list is found.
         
-        soup = BeautifulSoup(response.content, "html.parser")
+        Parameters:
+            term (str | None, optional): Search term. Defaults to None.
+            username (str | None, optional): Search torrents of a user. Defaults to None.
+            quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
+            category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
+            priority (Priority, optional): The priority of the request if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the response must be received. If None, there is no deadline. Defaults to None.
+            site (SITE | None, optional): The site to search. If None, the site of the client. Defaults to None.
         
-        torrents: list[SearchResultTorrent] = []
-        rows = soup.select("table.torrent-list tbody tr")
-        for row in rows:
-            torrent_type: TorrentType = TorrentType.from_color(row["class"][0])
-            
-            torrent_category: FunCategory | FapCategory = get_category_by_id(
-                site=self.site,
-                category_id=row.select_one("a[href^='/?c=']")["href"][4:]
-                )
-            category_icon_url: str = self.base_url + row.find("img", class_="category-icon")["src"]
-            
-            total_comments: int = int(comments.text) if (comments := row.select_one("td[colspan='2'] a.comments[href^='/view/']")) else 0
-            view_id: int = int(row.select_one("td[colspan='2'] a[href^='/view/']:last-of-type")["href"][6:])
-            name: str = row.select_one("td[colspan='2'] a[href^='/view/']:last-of-type")["title"]
-            
-            tds: list[Tag] = row.find_all("td", class_="text-center")
-            torrent_url: str = self.base_url + tds[0].select_one("a[href^='/download/']")["href"]
-            magnet_link: str = tds[0].select_one("a[href^='magnet:?xt=']")["href"]
-            
-            size: str = tds[1].text
-            timestamp: datetime = datetime.utcfromtimestamp(int(tds[2]["data-timestamp"]))
-            seeders: int = int(tds[3].text)
-            leechers: int = int(tds[4].text)
-            completed: int = int(tds[5].text)
-            
-            torrents.append(
-                SearchResultTorrent(
-                    torrent_type=torrent_type,
-                    view_id=view_id,
-                    name=name,
-                    category=torrent_category,
-                    category_icon_url=category_icon_url,
-                    torrent_url=torrent_url,
-                    magnet_link=magnet_link,
-                    size=size,
-                    timestamp=timestamp,
-                    seeders=seeders,
-                    leechers=leechers,
-                    completed=completed,
-                    total_comments=total_comments
-                    )
-                )
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during the request.
+            DeadlineExceededError: If the deadline passes before the response is received.
+            CircuitOpenError: If the circuit of the endpoint is open.
         
-        # Extract pagination results.
-        displaying_from, displaying_to, total_results = 0, 0, 0
-        pagination_page_info = soup.select_one("div.pagination-page-info")
-        if pagination_page_info:
-            matches = re.match(
-                r"^Displaying results (\d+)-(\d+) out of (\d+) results\.",
-                pagination_page_info.text
-                )
-            displaying_from, displaying_to, total_results = int(matches.group(1)), int(matches.group(2)), int(matches.group(3))
-        
-        # Extract pagination pages.
-        previous_page, current_page, next_page, available_pages = None, None, None, None
-        if (pagination := soup.find("ul", class_="pagination")):
-            if (
-                previous_tag := (
-                    pagination.select_one("li.previous:not(.disabled):not(.unavailable) a[href]") or
-                    pagination.select_one("li a[rel='prev']")
-                    )
-                ):
-                query_params = parse_qs(urlparse(previous_tag["href"]).query)
-                previous_page = int(query_params.get("p", [1])[0])
-            
-            if (active_tag := pagination.select_one("li.active a")):
-                current_page = int(re.search(r"(\d+)", active_tag.text).group())
-            
-            if (
-                next_tag := (
-                    pagination.select_one("li.next:not(.disabled):not(.unavailable) a[href]") or
-                    pagination.select_one("li a[rel='next']")
-                    )
-                ):
-                query_params = parse_qs(urlparse(next_tag["href"]).query)
-                next_page = int(query_params.get("p")[0])
-            
-            available_pages = int(pagination.find_all("li")[-2].find("a").text)
-        elif torrents:
-            # Pagination won't be available if there is only one page of results.
-            # Therefore, if at least one torrent exists, it indicates that there is one page.
-            # This also applies to current page.
-            current_page = 1
-            available_pages = 1
-        
-        return SearchResult(
-            torrents=torrents,
-            displaying_from=displaying_from,
-            displaying_to=displaying_to,
-            total_results=total_results,
-            current_page=current_page,
-            previous_page=previous_page,
-            next_page=next_page,
-            available_pages=available_pages
+        Returns:
+            bool: True if at least one torrent matches the search, False otherwise.
+        """
+        url, params = self.__build_search_request(
+            term=term,
+            username=username,
+            quality_filter=quality_filter,
+            category=category,
+            site=site
             )
+        
+        async with self._stream("search_exists", url, params=params, priority=priority, deadline=deadline, site=site) as response:
+            previous: str = ""
+            async for chunk in response.aiter_text():
+                window: str = previous + chunk
+                if self.ROW_PATTERN.search(window):
+                    return True
+                
+                if "</tbody>" in window:
+                    return False
+                
+                previous = window[-self.STREAM_OVERLAP:]
+        
+        return False
     
-    async def get_torrent_info(self: Self, view_id: int) -> TorrentInfo:
+    async def get_torrent_info(
+        self: Self,
+        view_id: int,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None
+        ) -> TorrentInfo:
         """
         Get torrent information.
         
         Parameters:
             view_id (int): View-ID of the torrent.
+            priority (Priority, optional): The priority of the request if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the response must be received. If None, there is no deadline. Defaults to None.
+            site (SITE | None, optional): The site of the torrent. If None, the site of the client. Defaults to None.
         
         Raises:
             httpx.HTTPError: If an HTTP-related error occurs during the request.
             TorrentNotFoundError: If the torrent of view id not found.
+            DeadlineExceededError: If the deadline passes before the response is received.
+            CircuitOpenError: If the circuit of the endpoint is open and no stale result is cached.
         
         Returns:
             TorrentInfo: Information of the torrent.
         """
-        url: str = self.base_url + f"/view/{view_id}"
-        response: httpx.Response = await self._http_client.get(url)
-        response.raise_for_status()
+        site, base_url = self._resolve_site(site)
+        url: str = base_url + f"/view/{view_id}"
+        response: httpx.Response = await self._get("view", url, priority=priority, deadline=deadline, site=site)
         
         if response.status_code == 404:
             raise TorrentNotFoundError(f"Torrent '{view_id}' not found")
         
-        soup = BeautifulSoup(response.content, "html.parser")
-        
-        name = soup.select_one("div.panel-heading h3.panel-title").get_text(strip=True)
-        rows = soup.select("div.panel-body div.row")
-        
-        category = get_category_by_id(
-            site=self.site,
-            category_id=rows[0].select_one("a[href^='/?c=']")["href"][4:]
+        torrent_info: TorrentInfo = self._parse(
+            "view",
+            response.content,
+            lambda: parse_html(response.content),
+            lambda soup: extract_torrent_info(soup, site, base_url),
+            base_url=base_url
             )
-        timestamp: datetime = datetime.utcfromtimestamp(int(rows[0].find("div", attrs={"data-timestamp": True})["data-timestamp"]))
-        
-        submitter_link: str | None = rows[1].select_one("a[href^='/user/']")
-        if submitter_link:
-            submitter: User = User(
-                username=submitter_link["href"][6:],
-                profile_url=self.base_url + submitter_link["href"]
-                )
-        else:
-            # Submitter was an anonymous.
-            submitter = None
-        
-        seeders: int = int(rows[1].select_one("span[style='color: green;']").text)
-        
-        information: str = rows[2].select_one("div.col-md-5").get_text(strip=True)
-        leechers: int = int(rows[2].select_one("span[style='color: red;']").text)
+        torrent_info = self._mark_stale(response, torrent_info)
+        self.metrics.count("view", "rows", len(torrent_info.comments))
+        return torrent_info
+    
+    async def download_torrents(
+        self: Self,
+        torrents: Iterable[SearchResultTorrent | TorrentInfo | NyaaRSSTorrent] | AsyncIterable[SearchResultTorrent | TorrentInfo | NyaaRSSTorrent],
+        sink: TorrentSink | str | os.PathLike,
+        concurrency: int = DOWNLOAD_CONCURRENCY,
+        verify: bool = True,
+        priority: Priority = Priority.BACKGROUND
+        ) -> AsyncIterator[DownloadResult]:
+        """
+        Download torrent files.
         
-        size_and_completed_div: Tag = rows[3].select("div.col-md-5")
-        size, completed = size_and_completed_div[0].text, int(size_and_completed_div[1].text)
+        Torrent files are streamed to the sink while their info hash is computed, and verified against the scraped info hash.
+        Torrent files already in the sink are skipped, so an interrupted batch can be resumed by running it again.
+        Torrents are consumed lazily, so batches may be arbitrarily large.
         
-        info_hash: str = rows[4].find("kbd").text
+        Downloads failing with an HTTP error, an open circuit, a missed deadline, an invalid torrent file or an error of the sink
+        are reported as `DownloadStatus.FAILED` results. Any other error stops the batch and is raised once the downloads
+        in progress are cancelled.
         
-        torrent_url: str = self.base_url + soup.select_one("div.panel-footer a[href^='/download/']")["href"]
-        magnet_link: str = soup.select_one("div.panel-footer a[href^='magnet:?xt=']")["href"]
+        Parameters:
+            torrents (Iterable | AsyncIterable): The torrents to download the torrent files of.
+            sink (TorrentSink | str | os.PathLike): The sink to write torrent files to, or a directory for a `DirectorySink`.
+            concurrency (int, optional): The number of concurrent downloads. Defaults to DOWNLOAD_CONCURRENCY.
+            verify (bool, optional): Whether to verify the info hash of the torrent files. Defaults to True.
+            priority (Priority, optional): The priority of the downloads if the client has a scheduler. Defaults to Priority.BACKGROUND.
+        
+        Yields:
+            DownloadResult: The result of each download, in order of completion.
+        """
+        if not isinstance(sink, TorrentSink):
+            sink = DirectorySink(sink)
+        
+        iterator: AsyncIterator = aiter(torrents) if isinstance(torrents, AsyncIterable) else aiter(self.__iterate(torrents))
+        lock = asyncio.Lock()
+        in_flight: set[str] = set()
+        results: asyncio.Queue[DownloadResult | None] = asyncio.Queue(maxsize=concurrency)
+        
+        async def worker() -> None:
+            while True:
+                async with lock:
+                    torrent = await anext(iterator, None)
+                if torrent is None:
+                    return
+                await results.put(await self.__download_torrent(torrent, sink, verify, in_flight, priority))
+        
+        workers: list[asyncio.Task] = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        
+        async def run_workers() -> None:
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                # Once cancelled, the results are not consumed anymore, so the end must not wait for room in the queue.
+                if not asyncio.current_task().cancelling():
+                    await results.put(None)
+        
+        runner: asyncio.Task = asyncio.create_task(run_workers())
+        try:
+            while (result := await results.get()) is not None:
+                yield result
+            await runner
+        finally:
+            # Also stops the other workers if one failed, instead of leaving them waiting to put their results.
+            runner.cancel()
+            for task in workers:
+                task.cancel()
+    
+    async def __download_torrent(
+        self: Self,
+        torrent: SearchResultTorrent | TorrentInfo | NyaaRSSTorrent,
+        sink: TorrentSink,
+        verify: bool,
+        in_flight: set[str],
+        priority: Priority
+        ) -> DownloadResult:
+        """
+        Download a torrent file to a sink.
         
-        description: str = soup.find("div", id="torrent-description").text
-        files: list[File | Folder] = self.__extract_files_and_folders(soup.find("div", class_="torrent-file-list"))
+        Parameters:
+            torrent (SearchResultTorrent | TorrentInfo | NyaaRSSTorrent): The torrent.
+            sink (TorrentSink): The sink to write the torrent file to.
+            verify (bool): Whether to verify the info hash of the torrent file.
+            in_flight (set[str]): The info hashes being downloaded, to skip duplicates.
+            priority (Priority): The priority of the download.
         
-        total_comments = int(soup.select_one("div#comments div.panel-heading h3.panel-title").text.split("-")[1])
-        comments: list[Comment] = []
-        for comment in soup.select("div#comments div.comment-panel"):
-            user_tag = comment.select_one("a[href^='/user/']")
-            image_src = comment.find("img", class_="avatar")["src"]
-            user = User(
-                username=user_tag["href"][6:],
-                profile_url=self.base_url + user_tag["href"],
-                photo_url=self.base_url + image_src if image_src.startswith("/") else image_src,
-                user_level=UserLevel.from_level_str(level_str=user_tag["title"].split()[0].lower()),
-                is_banned="BANNED" in user_tag["title"]
+        Returns:
+            DownloadResult: The result of the download.
+        """
+        info_hash: str | None = getattr(torrent, "info_hash", None) or get_info_hash_from_magnet(torrent.magnet_link or "")
+        if info_hash is None or torrent.torrent_url is None:
+            return DownloadResult(
+                torrent=torrent,
+                info_hash=info_hash,
+                status=DownloadStatus.FAILED,
+                size=0,
+                error=ValueError("The torrent has no info hash or torrent file URL")
                 )
+        
+        info_hash = info_hash.lower()
+        if info_hash in in_flight:
+            return DownloadResult(torrent=torrent, info_hash=info_hash, status=DownloadStatus.SKIPPED, size=0)
+        
+        # Claimed before checking the sink, so a duplicate started meanwhile is skipped rather than downloaded twice.
+        in_flight.add(info_hash)
+        hasher: InfoHasher | None = InfoHasher() if verify else None
+        size: int = 0
+        try:
+            if await sink.exists(info_hash):
+                return DownloadResult(torrent=torrent, info_hash=info_hash, status=DownloadStatus.SKIPPED, size=0)
             
-            comments.append(
-                Comment(
-                    id=int(comment["id"].split("-")[1]),
-                    user=user,
-                    is_uploader="(uploader)" in comment.select_one("div.col-md-2 p").text,
-                    timestamp=datetime.utcfromtimestamp(int(comment.find("small", attrs={"data-timestamp": True})["data-timestamp"])),
-                    text=comment.find("div", class_="comment-content").text
-                    )
-                )
+            async with self._stream("download", torrent.torrent_url, priority=priority) as response:
+                async for chunk in response.aiter_bytes():
+                    if hasher is not None:
+                        hasher.feed(chunk)
+                    await sink.write(info_hash, chunk)
+                    size += len(chunk)
+            
+            if hasher is not None:
+                if not hasher.complete:
+                    raise BencodeError("Truncated torrent file")
+                if (downloaded_info_hash := hasher.hexdigest()) != info_hash:
+                    raise InfoHashMismatchError(f"Info hash of the torrent file '{downloaded_info_hash}' does not match '{info_hash}'")
+        except (httpx.HTTPError, CircuitOpenError, DeadlineExceededError, BencodeError, InfoHashMismatchError, OSError) as error:
+            await sink.abort(info_hash)
+            return DownloadResult(torrent=torrent, info_hash=info_hash, status=DownloadStatus.FAILED, size=size, error=error)
+        except BaseException:
+            # Cancelled, such as when the caller stops iterating the results.
+            await sink.abort(info_hash)
+            raise
+        finally:
+            in_flight.discard(info_hash)
+        
+        await sink.commit(info_hash)
+        return DownloadResult(torrent=torrent, info_hash=info_hash, status=DownloadStatus.DOWNLOADED, size=size)
+    
+    @staticmethod
+    async def __iterate(items: Iterable) -> AsyncIterator:
+        """
+        Iterate an iterable asynchronously.
         
-        return TorrentInfo(
-            name=name,
-            category=category,
-            torrent_url=torrent_url,
-            magnet_link=magnet_link,
-            size=size,
-            timestamp=timestamp,
-            seeders=seeders,
-            leechers=leechers,
-            completed=completed,
-            info_hash=info_hash,
-            submitter=submitter,
-            information=information,
-            description=description,
-            files=files,
-            total_comments=total_comments,
-            comments=comments
-            )
+        Parameters:
+            items (Iterable): The iterable.
+        
+        Yields:
+            Any: The items of the iterable.
+        """
+        for item in items:
+            yield item
     
-    def __extract_files_and_folders(self: Self, tag: Tag) -> list[File | Folder]:
+    def __build_search_request(
+        self: Self,
+        term: str | None = None,
+        username: str | None = None,
+        quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
+        category: FunCategory | FapCategory | int | None = None,
+        sort_by: SortBy | str | None = None,
+        sort_order: SortOrder | str | None = None,
+        page: int = 1,
+        site: SITE | None = None
+        ) -> tuple[str, dict[str, str | int]]:
         """
-        Extract files and folders from a BeautifulSoup element tag containing <ul> tag.
+        Build the URL and query parameters of a search request.
         
         Parameters:
-            tag (Tag): A BeautifulSoup element tag containing <ul> tag.
+            term (str | None, optional): Search term. Defaults to None.
+            username (str | None, optional): Search torrents of a user. Defaults to None.
+            quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. Defaults to QualityFilter.NO_FILTER.
+            category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
+            sort_by (SortBy | str | None, optional): Sort results by. Defaults to None.
+            sort_order (SortOrder | str | None, optional): Sort order of search. Defaults to None.
+            page (int, optional): Page number of search result. Defaults to 1.
+            site (SITE | None, optional): The site to search. If None, the site of the client. Defaults to None.
         
         Returns:
-            list[File | Folder]: A list File or Folder objects.
+            tuple[str, dict[str, str | int]]: The URL and the query parameters without unset values.
         """
-        files_and_folders: list[File | Folder] = []
-        for li in tag.select("ul li"):
-            if (folder_tag := li.find("a", class_="folder")):
-                files_and_folders.append(
-                    Folder(
-                        name=folder_tag.get_text(strip=True),
-                        files=self.__extract_files_and_folders(li)
-                        )
-                    )
-            elif li.find("i", class_="fa-file"):
-                files_and_folders.append(
-                    File(
-                        name="".join((elem.get_text(strip=True) for elem in li.find_all(string=True, recursive=False))),
-                        size=li.find("span", class_="file-size").get_text(strip=True).strip("()")
-                        )
-                    )
-        return files_and_folders
\ No newline at end of file
+        site, base_url = self._resolve_site(site)
+        if category is None:
+            category = get_category_by_id(site, "0_0")
+        
+        url: str = f"{base_url}/user/{username}" if username else base_url
+        params = {
+            "q": term,
+            "f": quality_filter.value if isinstance(quality_filter, QualityFilter) else quality_filter,
+            "c": category.value if isinstance(category, (FunCategory, FapCategory)) else category,
+            "p": page,
+            "s": sort_by.value if isinstance(sort_by, SortBy) else sort_by,
+            "o": sort_order.value if isinstance(sort_order, SortOrder) else sort_order
+        }
+        return url, {k: v for k, v in params.items() if v is not None}
\ No newline at end of file
@@ -0,0 +1,423 @@
+from collections import OrderedDict
+from typing import Iterable, Self
+import hashlib
+import math
+import os
+import struct
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from .enums import FapCategory
+from .models import SearchResultTorrent, TorrentInfo, NyaaRSSTorrent
+from .utils.magnet import get_info_hash_from_magnet
+
+# Magic, format version, window, error rate, growth, tightening, window keys, filters.
+_HEADER = struct.Struct("<2sBIdddII")
+# Capacity, error rate, count, hash functions, bits.
+_FILTER_HEADER = struct.Struct("<QdQBQ")
+_MAGIC: bytes = b"ND"
+_VERSION: int = 1
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter of byte strings.
+    
+    Membership tests have no false negatives, and false positives at about `error_rate` once `capacity` keys are added.
+    Keys are hashed once with xxh3-128 if `xxhash` is installed, otherwise with blake2b,
+    and the bit positions are derived from the two halves of the hash.
+    """
+    def __init__(self: Self, capacity: int, error_rate: float) -> None:
+        """
+        Initialize Bloom filter.
+        
+        Parameters:
+            capacity (int): The number of keys the filter is sized for.
+            error_rate (float): The false positive rate at capacity, between 0.0 and 1.0.
+        
+        Raises:
+            ValueError: If the capacity is not positive or the error rate is not between 0.0 and 1.0.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count: int = 0
+        
+        self._size, self._hashes = self._dimensions(capacity, error_rate)
+        self._bits = bytearray((self._size + 7) // 8)
+    
+    @staticmethod
+    def _dimensions(capacity: int, error_rate: float) -> tuple[int, int]:
+        """
+        Get the number of bits and of hash functions of a filter.
+        
+        Parameters:
+            capacity (int): The number of keys the filter is sized for.
+            error_rate (float): The false positive rate at capacity, between 0.0 and 1.0.
+        
+        Raises:
+            ValueError: If the capacity is not positive or the error rate is not between 0.0 and 1.0.
+        
+        Returns:
+            tuple[int, int]: The number of bits and the number of hash functions.
+        """
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("The error rate must be between 0.0 and 1.0")
+        
+        size: int = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        return size, max(1, round(size / capacity * math.log(2)))
+    
+    @property
+    def full(self: Self) -> bool:
+        """
+        Getter property for whether the filter reached its capacity.
+        
+        Returns:
+            bool: True if as many keys as the capacity were added.
+        """
+        return self.count >= self.capacity
+    
+    @property
+    def memory_usage(self: Self) -> int:
+        """
+        Getter property for the size of the bit array.
+        
+        Returns:
+            int: The size in bytes.
+        """
+        return len(self._bits)
+    
+    def add(self: Self, key: bytes) -> bool:
+        """
+        Add a key.
+        
+        Parameters:
+            key (bytes): The key.
+        
+        Returns:
+            bool: True if the key was not in the filter yet, False if it probably was.
+        """
+        new: bool = False
+        for position in self.__positions(key):
+            mask: int = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                new = True
+        
+        if new:
+            self.count += 1
+        return new
+    
+    def __contains__(self: Self, key: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self.__positions(key))
+    
+    def __len__(self: Self) -> int:
+        return self.count
+    
+    def __positions(self: Self, key: bytes) -> Iterable[int]:
+        """
+        Get the bit positions of a key, by double hashing.
+        
+        Parameters:
+            key (bytes): The key.
+        
+        Yields:
+            int: The bit positions.
+        """
+        if xxhash is not None:
+            digest: int = xxhash.xxh3_128_intdigest(key)
+        else:
+            digest = int.from_bytes(hashlib.blake2b(key, digest_size=16).digest(), "little")
+        first: int = digest & 0xFFFFFFFFFFFFFFFF
+        # Odd, so the positions cover the whole array.
+        second: int = (digest >> 64) | 1
+        for i in range(self._hashes):
+            yield (first + i * second) % self._size
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows as keys are added, keeping the overall false positive rate under `error_rate`.
+    
+    When the current filter is full, a filter `growth` times larger is added with an error rate `tightening` times lower,
+    so the sum of the error rates of all filters converges to at most `error_rate`.
+    """
+    INITIAL_CAPACITY: int = 100_000
+    ERROR_RATE: float = 0.001
+    GROWTH: float = 2.0
+    TIGHTENING: float = 0.8
+    
+    def __init__(
+        self: Self,
+        initial_capacity: int = INITIAL_CAPACITY,
+        error_rate: float = ERROR_RATE,
+        growth: float = GROWTH,
+        tightening: float = TIGHTENING
+        ) -> None:
+        """
+        Initialize scalable Bloom filter.
+        
+        Parameters:
+            initial_capacity (int, optional): The capacity of the first filter. Defaults to INITIAL_CAPACITY.
+            error_rate (float, optional): The maximum overall false positive rate, between 0.0 and 1.0. Defaults to ERROR_RATE.
+            growth (float, optional): The capacity of each filter relative to the previous one. Defaults to GROWTH.
+            tightening (float, optional): The error rate of each filter relative to the previous one, between 0.0 and 1.0. Defaults to TIGHTENING.
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        
+        self.filters: list[BloomFilter] = []
+    
+    @property
+    def memory_usage(self: Self) -> int:
+        """
+        Getter property for the size of the bit arrays.
+        
+        Returns:
+            int: The size in bytes.
+        """
+        return sum(bloom_filter.memory_usage for bloom_filter in self.filters)
+    
+    def add(self: Self, key: bytes) -> bool:
+        """
+        Add a key.
+        
+        Parameters:
+            key (bytes): The key.
+        
+        Returns:
+            bool: True if the key was not in the filter yet, False if it probably was.
+        """
+        if key in self:
+            return False
+        
+        if not self.filters or self.filters[-1].full:
+            index: int = len(self.filters)
+            self.filters.append(BloomFilter(
+                math.ceil(self.initial_capacity * self.growth ** index),
+                # The first filter gets (1 - tightening) of the error rate, so the series sums to the error rate.
+                self.error_rate * (1 - self.tightening) * self.tightening ** index
+                ))
+        return self.filters[-1].add(key)
+    
+    def __contains__(self: Self, key: bytes) -> bool:
+        return any(key in bloom_filter for bloom_filter in reversed(self.filters))
+    
+    def __len__(self: Self) -> int:
+        return sum(len(bloom_filter) for bloom_filter in self.filters)
+
+class DedupIndex:
+    """
+    Index of the torrents seen so far, to skip torrents seen before in long-running watchers and crawls.
+    
+    A torrent is identified by its info hash and its View-ID, so the same torrent is recognized in RSS feeds,
+    search results and torrent information, even though torrent information has no View-ID.
+    Info hashes are stored as 20 bytes, and View-IDs with their site, since View-IDs are per site.
+    
+    The most recent `window` keys are kept exactly. Older keys are moved to a scalable Bloom filter,
+    so memory grows by a few bytes per torrent at the default error rate, and a torrent never seen before
+    is taken for a seen one with a probability of at most `error_rate`.
+    """
+    WINDOW: int = 50_000
+    
+    def __init__(
+        self: Self,
+        window: int = WINDOW,
+        error_rate: float = ScalableBloomFilter.ERROR_RATE,
+        initial_capacity: int = ScalableBloomFilter.INITIAL_CAPACITY
+        ) -> None:
+        """
+        Initialize dedup index.
+        
+        Parameters:
+            window (int, optional): The number of most recent keys kept exactly. Defaults to WINDOW.
+            error_rate (float, optional): The maximum false positive rate of the older keys. Defaults to ScalableBloomFilter.ERROR_RATE.
+            initial_capacity (int, optional): The capacity of the first Bloom filter. Defaults to ScalableBloomFilter.INITIAL_CAPACITY.
+        """
+        self.window = window
+        
+        self._recent: OrderedDict[bytes, None] = OrderedDict()
+        self._history = ScalableBloomFilter(initial_capacity, error_rate)
+    
+    @property
+    def memory_usage(self: Self) -> int:
+        """
+        Getter property for the approximate size of the index.
+        
+        Returns:
+            int: The size in bytes of the Bloom filters, plus about 100 bytes per key of the window.
+        """
+        return self._history.memory_usage + 100 * len(self._recent)
+    
+    @staticmethod
+    def keys(torrent: SearchResultTorrent | NyaaRSSTorrent | TorrentInfo) -> list[bytes]:
+        """
+        Get the keys identifying a torrent.
+        
+        Parameters:
+            torrent (SearchResultTorrent | NyaaRSSTorrent | TorrentInfo): The torrent.
+        
+        Returns:
+            list[bytes]: The key of the info hash, if known, and the key of the View-ID, if the model has one.
+        """
+        keys: list[bytes] = []
+        info_hash: str | None = torrent.info_hash if not isinstance(torrent, SearchResultTorrent) else get_info_hash_from_magnet(torrent.magnet_link)
+        if info_hash:
+            keys.append(b"h" + bytes.fromhex(info_hash))
+        if not isinstance(torrent, TorrentInfo):
+            site: bytes = b"s" if isinstance(torrent.category, FapCategory) else b"f"
+            keys.append(b"v" + site + torrent.view_id.to_bytes(8, "big"))
+        return keys
+    
+    def add(self: Self, torrent: SearchResultTorrent | NyaaRSSTorrent | TorrentInfo) -> bool:
+        """
+        Add a torrent.
+        
+        Parameters:
+            torrent (SearchResultTorrent | NyaaRSSTorrent | TorrentInfo): The torrent.
+        
+        Returns:
+            bool: True if the torrent was not seen before, False if it was (or, for older torrents, probably was).
+        """
+        keys: list[bytes] = self.keys(torrent)
+        new: bool = not any(self.__contains_key(key) for key in keys)
+        for key in keys:
+            self.__add_key(key)
+        return new
+    
+    def filter(
+        self: Self,
+        torrents: Iterable[SearchResultTorrent | NyaaRSSTorrent | TorrentInfo]
+        ) -> list[SearchResultTorrent | NyaaRSSTorrent | TorrentInfo]:
+        """
+        Add torrents, and keep the ones not seen before.
+        
+        Parameters:
+            torrents (Iterable[SearchResultTorrent | NyaaRSSTorrent | TorrentInfo]): The torrents.
+        
+        Returns:
+            list[SearchResultTorrent | NyaaRSSTorrent | TorrentInfo]: The torrents not seen before, in order.
+        """
+        return [torrent for torrent in torrents if self.add(torrent)]
+    
+    def save(self: Self, path: str | os.PathLike) -> None:
+        """
+        Save the index to a file. The file is replaced atomically.
+        
+        Parameters:
+            path (str | os.PathLike): The path of the file.
+        """
+        part_path: str = os.fspath(path) + ".part"
+        with open(part_path, "wb") as file:
+            file.write(_HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                self.window,
+                self._history.error_rate,
+                self._history.growth,
+                self._history.tightening,
+                len(self._recent),
+                len(self._history.filters)
+                ))
+            file.write(b"".join(len(key).to_bytes(1, "big") + key for key in self._recent))
+            for bloom_filter in self._history.filters:
+                file.write(_FILTER_HEADER.pack(
+                    bloom_filter.capacity,
+                    bloom_filter.error_rate,
+                    bloom_filter.count,
+                    bloom_filter._hashes,
+                    bloom_filter._size
+                    ))
+                file.write(bloom_filter._bits)
+        os.replace(part_path, path)
+    
+    @classmethod
+    def load(cls: type[Self], path: str | os.PathLike) -> Self:
+        """
+        Load an index saved with `save`.
+        
+        Parameters:
+            path (str | os.PathLike): The path of the file.
+        
+        Raises:
+            ValueError: If the file is not a saved index, was saved with an unknown format version, or is truncated or corrupt.
+        
+        Returns:
+            Self: The index.
+        """
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+        
+        if len(data) < _HEADER.size or data[:2] != _MAGIC:
+            raise ValueError("Not a dedup index file")
+        magic, version, window, error_rate, growth, tightening, recent, filters = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"Unknown dedup index format version {version}")
+        if not 0.0 < error_rate < 1.0 or not growth >= 1.0 or not 0.0 < tightening < 1.0:
+            raise ValueError("Corrupt dedup index header")
+        
+        index = cls(window, error_rate)
+        index._history.growth = growth
+        index._history.tightening = tightening
+        
+        offset: int = _HEADER.size
+        for _ in range(recent):
+            if offset >= len(data) or offset + 1 + data[offset] > len(data):
+                raise ValueError("Truncated dedup index file")
+            length: int = data[offset]
+            index._recent[data[offset + 1:offset + 1 + length]] = None
+            offset += 1 + length
+        
+        for _ in range(filters):
+            if offset + _FILTER_HEADER.size > len(data):
+                raise ValueError("Truncated dedup index file")
+            capacity, filter_error_rate, count, hashes, size = _FILTER_HEADER.unpack_from(data, offset)
+            offset += _FILTER_HEADER.size
+            length = (size + 7) // 8
+            if offset + length > len(data):
+                raise ValueError("Truncated dedup index file")
+            # Before allocating the bits of the filter, which a corrupt capacity could make huge.
+            try:
+                dimensions: tuple[int, int] = BloomFilter._dimensions(capacity, filter_error_rate)
+            except ValueError:
+                raise ValueError("Corrupt dedup index filter header") from None
+            if (size, hashes) != dimensions:
+                raise ValueError("Corrupt dedup index filter header")
+            bloom_filter = BloomFilter(capacity, filter_error_rate)
+            bloom_filter.count = count
+            bloom_filter._bits = bytearray(data[offset:offset + length])
+            offset += length
+            index._history.filters.append(bloom_filter)
+        
+        if offset != len(data):
+            raise ValueError("Trailing data in dedup index file")
+        
+        if index._history.filters:
+            index._history.initial_capacity = index._history.filters[0].capacity
+        return index
+    
+    def __contains__(self: Self, torrent: SearchResultTorrent | NyaaRSSTorrent | TorrentInfo) -> bool:
+        return any(self.__contains_key(key) for key in self.keys(torrent))
+    
+    def __contains_key(self: Self, key: bytes) -> bool:
+        return key in self._recent or key in self._history
+    
+    def __add_key(self: Self, key: bytes) -> None:
+        """
+        Add a key to the window, moving the oldest key of the window to the Bloom filters if it is full.
+        
+        Parameters:
+            key (bytes): The key.
+        """
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return
+        
+        self._recent[key] = None
+        if len(self._recent) > self.window:
+            oldest, _ = self._recent.popitem(last=False)
+            self._history.add(oldest)
\ No newline at end of file
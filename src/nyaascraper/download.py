@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import BinaryIO, Self
+import os
+
+class TorrentSink:
+    """
+    Destination of downloaded torrent files.
+    
+    Torrent files are identified by their info hash. Chunks are written as they are received,
+    and the file is committed once fully received and verified, or aborted otherwise.
+    Subclass it to stream torrent files elsewhere than to a directory.
+    """
+    async def exists(self: Self, info_hash: str) -> bool:
+        """
+        Check whether a torrent file is already stored, so it is not downloaded again.
+        
+        Parameters:
+            info_hash (str): The info hash as lowercase hex.
+        
+        Returns:
+            bool: True if the torrent file is already stored.
+        """
+        raise NotImplementedError
+    
+    async def write(self: Self, info_hash: str, chunk: bytes) -> None:
+        """
+        Write the next chunk of a torrent file.
+        
+        Parameters:
+            info_hash (str): The info hash as lowercase hex.
+            chunk (bytes): The chunk.
+        """
+        raise NotImplementedError
+    
+    async def commit(self: Self, info_hash: str) -> None:
+        """
+        Store a fully received and verified torrent file.
+        
+        Parameters:
+            info_hash (str): The info hash as lowercase hex.
+        """
+        raise NotImplementedError
+    
+    async def abort(self: Self, info_hash: str) -> None:
+        """
+        Discard a torrent file that failed to download or verify.
+        
+        Parameters:
+            info_hash (str): The info hash as lowercase hex.
+        """
+        raise NotImplementedError
+
+class DirectorySink(TorrentSink):
+    """
+    Writes torrent files to `<directory>/<info_hash>.torrent`.
+    
+    Torrent files are written to a `.part` file and renamed once verified, so an interrupted batch
+    never leaves an incomplete torrent file behind, and running the batch again skips every
+    torrent file that was completed.
+    """
+    def __init__(self: Self, directory: str | os.PathLike) -> None:
+        """
+        Initialize directory sink.
+        
+        Parameters:
+            directory (str | os.PathLike): The directory to write to. Created if missing.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        self._files: dict[str, BinaryIO] = {}
+    
+    def path(self: Self, info_hash: str) -> Path:
+        """
+        Get the path of a torrent file.
+        
+        Parameters:
+            info_hash (str): The info hash as lowercase hex.
+        
+        Returns:
+            Path: The path of the torrent file.
+        """
+        return self.directory / f"{info_hash}.torrent"
+    
+    async def exists(self: Self, info_hash: str) -> bool:
+        return self.path(info_hash).exists()
+    
+    async def write(self: Self, info_hash: str, chunk: bytes) -> None:
+        # Torrent files are small, so they are written without a thread hop.
+        if (file := self._files.get(info_hash)) is None:
+            file = self._files[info_hash] = open(self.path(info_hash).with_suffix(".part"), "wb")
+        file.write(chunk)
+    
+    async def commit(self: Self, info_hash: str) -> None:
+        part_path: Path = self.path(info_hash).with_suffix(".part")
+        if (file := self._files.pop(info_hash, None)) is not None:
+            file.close()
+        else:
+            # Empty torrent files have no chunk.
+            part_path.touch()
+        os.replace(part_path, self.path(info_hash))
+    
+    async def abort(self: Self, info_hash: str) -> None:
+        if (file := self._files.pop(info_hash, None)) is not None:
+            file.close()
+        self.path(info_hash).with_suffix(".part").unlink(missing_ok=True)
\ No newline at end of file
@@ -1,6 +1,30 @@
-from .site import SITE
-from .quality_filter import QualityFilter
-from .categories import FunCategory, FapCategory
-from .sorting import SortBy, SortOrder
-from .torrent_type import TorrentType
-from .user_level import UserLevel
\ No newline at end of file
+from typing import Any
+import importlib
+
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "SITE": ".site",
+    "QualityFilter": ".quality_filter",
+    "FunCategory": ".categories",
+    "FapCategory": ".categories",
+    "SortBy": ".sorting",
+    "SortOrder": ".sorting",
+    "TorrentType": ".torrent_type",
+    "UserLevel": ".user_level",
+    "DownloadStatus": ".download_status",
+    "SerializationFormat": ".serialization_format",
+    "Priority": ".priority",
+    "CircuitState": ".circuit_state"
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name: str) -> Any:
+    if (module_name := _LAZY_ATTRIBUTES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value: Any = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
\ No newline at end of file
@@ -0,0 +1,14 @@
+from enum import Enum
+
+class CircuitState(Enum):
+    """
+    States of a circuit of a `CircuitBreaker`.
+    
+    Members:
+        CLOSED (str): Requests are sent.
+        OPEN (str): Requests fail fast after too many failures in a row.
+        HALF_OPEN (str): A limited number of trial requests are sent to check whether the site recovered.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
\ No newline at end of file
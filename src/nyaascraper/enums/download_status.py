@@ -0,0 +1,14 @@
+from enum import Enum
+
+class DownloadStatus(Enum):
+    """
+    Statuses of torrent file downloads.
+    
+    Members:
+        DOWNLOADED (str): The torrent file was downloaded and verified.
+        SKIPPED (str): The torrent file was already present in the sink.
+        FAILED (str): The torrent file could not be downloaded or verified.
+    """
+    DOWNLOADED = "downloaded"
+    SKIPPED = "skipped"
+    FAILED = "failed"
\ No newline at end of file
@@ -0,0 +1,14 @@
+from enum import IntEnum
+
+class Priority(IntEnum):
+    """
+    Priority classes of requests.
+    
+    Members:
+        INTERACTIVE (int): User-facing requests. Sent before any queued request of the other classes.
+        NORMAL (int): Default requests. Share the remaining capacity with BACKGROUND by weight.
+        BACKGROUND (int): Bulk requests, such as crawls and enrichment.
+    """
+    INTERACTIVE: int = 0
+    NORMAL: int = 1
+    BACKGROUND: int = 2
\ No newline at end of file
@@ -0,0 +1,12 @@
+from enum import Enum
+
+class SerializationFormat(Enum):
+    """
+    Formats of serialized models.
+    
+    Members:
+        JSON (str): JSON, encoded with orjson if installed, otherwise with the standard library.
+        MSGPACK (str): MessagePack. Requires msgpack.
+    """
+    JSON = "json"
+    MSGPACK = "msgpack"
\ No newline at end of file
@@ -1,3 +1,19 @@
 class TorrentNotFoundError(Exception):
     """Raised when the torrent with the specified View-ID is not found."""
+    pass
+
+class InfoHashMismatchError(Exception):
+    """Raised when the info hash of a downloaded torrent file does not match the scraped info hash."""
+    pass
+
+class SerializationError(ValueError):
+    """Raised when serialized data is not a valid serialized model, or was serialized with an unknown schema version."""
+    pass
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when the deadline of a request passes before the request could be completed."""
+    pass
+
+class CircuitOpenError(Exception):
+    """Raised when a request fails fast because the circuit of its endpoint is open after repeated failures."""
     pass
\ No newline at end of file
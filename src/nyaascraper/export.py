@@ -0,0 +1,482 @@
+from datetime import datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, AsyncIterable, Callable, Iterable, Self, TextIO, BinaryIO
+import asyncio
+import calendar
+import csv
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from .models import SearchResultTorrent, TorrentInfo, NyaaRSSTorrent
+from .utils.json_default import json_default
+from .utils.size import parse_size
+
+# A column of the tabular formats as (name, type, getter), where the type is "int", "str" or "timestamp".
+Column = tuple[str, str, Callable[[Any], Any]]
+
+def _column(name: str, type: str, getter: Callable[[Any], Any] | None = None) -> Column:
+    return name, type, getter or attrgetter(name)
+
+def _size_bytes(torrent: SearchResultTorrent | TorrentInfo | NyaaRSSTorrent) -> int | None:
+    try:
+        return parse_size(torrent.size)
+    except ValueError:
+        return None
+
+def _published(torrent: NyaaRSSTorrent) -> datetime | None:
+    if torrent.published_parsed is None:
+        return None
+    return datetime.utcfromtimestamp(calendar.timegm(torrent.published_parsed))
+
+COLUMNS: dict[type, tuple[Column, ...]] = {
+    SearchResultTorrent: (
+        _column("view_id", "int"),
+        _column("name", "str"),
+        _column("torrent_type", "str", lambda torrent: torrent.torrent_type.value),
+        _column("category", "str", lambda torrent: torrent.category.value),
+        _column("size", "str"),
+        _column("size_bytes", "int", _size_bytes),
+        _column("timestamp", "timestamp"),
+        _column("seeders", "int"),
+        _column("leechers", "int"),
+        _column("completed", "int"),
+        _column("total_comments", "int"),
+        _column("torrent_url", "str"),
+        _column("magnet_link", "str")
+    ),
+    TorrentInfo: (
+        _column("name", "str"),
+        _column("category", "str", lambda info: info.category.value),
+        _column("size", "str"),
+        _column("size_bytes", "int", _size_bytes),
+        _column("timestamp", "timestamp"),
+        _column("seeders", "int"),
+        _column("leechers", "int"),
+        _column("completed", "int"),
+        _column("info_hash", "str"),
+        _column("submitter", "str", lambda info: None if info.submitter is None else info.submitter.username),
+        _column("total_comments", "int"),
+        _column("torrent_url", "str"),
+        _column("magnet_link", "str"),
+        _column("information", "str"),
+        _column("description", "str")
+    ),
+    NyaaRSSTorrent: (
+        _column("view_id", "int"),
+        _column("name", "str"),
+        _column("torrent_type", "str", lambda torrent: torrent.torrent_type.value),
+        _column("category", "str", lambda torrent: torrent.category.value),
+        _column("size", "str"),
+        _column("size_bytes", "int", _size_bytes),
+        _column("timestamp", "timestamp", _published),
+        _column("seeders", "int"),
+        _column("leechers", "int"),
+        _column("completed", "int"),
+        _column("info_hash", "str"),
+        _column("total_comments", "int"),
+        _column("torrent_url", "str"),
+        _column("magnet_link", "str")
+    )
+}
+
+class ExportSink:
+    """
+    Base of the streaming export sinks.
+    
+    Records are buffered and written in batches by a worker thread. While a batch is being written, new records are buffered
+    until they and the batch being written add up to `batch_size`. `write` then waits for the batch to be written,
+    so a crawl writing to a slow disk is slowed down instead of buffering without bound.
+    A partial batch is written after `flush_interval` seconds, and each batch is flushed to disk once written,
+    so a crash loses at most one batch of records.
+    
+    Use the sink as an async context manager, or call `close` to write the last batch.
+    """
+    BATCH_SIZE: int = 1000
+    FLUSH_INTERVAL: float = 5.0
+    
+    def __init__(
+        self: Self,
+        path: str | os.PathLike,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float | None = FLUSH_INTERVAL,
+        fsync: bool = True
+        ) -> None:
+        """
+        Initialize export sink.
+        
+        Parameters:
+            path (str | os.PathLike): The path to write to.
+            batch_size (int, optional): The number of records per batch. Defaults to BATCH_SIZE.
+            flush_interval (float | None, optional): Seconds after which a partial batch is written. If None, only full batches are written. Defaults to FLUSH_INTERVAL.
+            fsync (bool, optional): Whether to fsync each batch, so it survives a crash of the system and not only of the process. Defaults to True.
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        
+        self.written: int = 0
+        
+        self._buffer: list[Any] = []
+        self._lock = asyncio.Lock()
+        self._writing: asyncio.Task | None = None
+        self._writing_count: int = 0
+        self._ticker: asyncio.Task | None = None
+        self._closed: bool = False
+    
+    async def __aenter__(self: Self) -> Self:
+        return self
+    
+    async def __aexit__(self: Self, *exc_info: Any) -> None:
+        await self.close()
+    
+    async def write(self: Self, record: Any) -> None:
+        """
+        Write a record. Waits for the batch being written if the buffer would hold more than a batch with it.
+        
+        Parameters:
+            record (Any): The record.
+        
+        Raises:
+            ValueError: If the sink is closed.
+            TypeError: If the sink cannot write records of this type.
+            OSError: If writing a previous batch failed.
+        """
+        if self._closed:
+            raise ValueError("Sink is closed")
+        
+        self._accept(record)
+        if self._writing is not None and len(self._buffer) + self._writing_count >= self.batch_size:
+            # Never more than a batch of records that are not on disk yet.
+            await self.__wait()
+        self._buffer.append(record)
+        
+        if self._ticker is None and self.flush_interval is not None:
+            self._ticker = asyncio.create_task(self.__tick())
+        
+        if len(self._buffer) >= self.batch_size:
+            await self.__submit()
+    
+    async def write_all(self: Self, records: Iterable[Any] | AsyncIterable[Any]) -> int:
+        """
+        Write every record of an iterable, such as the async iterators of the clients.
+        
+        Parameters:
+            records (Iterable[Any] | AsyncIterable[Any]): The records.
+        
+        Raises:
+            ValueError: If the sink is closed.
+            TypeError: If the sink cannot write records of this type.
+            OSError: If writing a previous batch failed.
+        
+        Returns:
+            int: The number of records written.
+        """
+        count: int = 0
+        if isinstance(records, AsyncIterable):
+            async for record in records:
+                await self.write(record)
+                count += 1
+        else:
+            for record in records:
+                await self.write(record)
+                count += 1
+        return count
+    
+    async def flush(self: Self) -> None:
+        """
+        Write the buffered records and wait until they are on disk.
+        
+        Raises:
+            OSError: If writing failed.
+        """
+        await self.__submit()
+        await self.__wait()
+    
+    async def close(self: Self) -> None:
+        """
+        Write the buffered records and close the sink.
+        
+        Raises:
+            OSError: If writing failed.
+        """
+        if self._closed:
+            return
+        
+        try:
+            await self.flush()
+        finally:
+            self._closed = True
+            if self._ticker is not None:
+                self._ticker.cancel()
+            await asyncio.to_thread(self._close)
+    
+    def _accept(self: Self, record: Any) -> None:
+        """
+        Check that a record can be written, before it is buffered.
+        
+        Parameters:
+            record (Any): The record.
+        
+        Raises:
+            TypeError: If the sink cannot write records of this type.
+        """
+        pass
+    
+    def _write_batch(self: Self, batch: list[Any]) -> None:
+        """
+        Write a batch of records and flush them to disk. Called in a worker thread.
+        
+        Parameters:
+            batch (list[Any]): The records.
+        """
+        raise NotImplementedError
+    
+    def _close(self: Self) -> None:
+        """
+        Close the written files. Called in a worker thread.
+        """
+        raise NotImplementedError
+    
+    def _sync(self: Self, file: TextIO | BinaryIO) -> None:
+        """
+        Flush a file to disk.
+        
+        Parameters:
+            file (TextIO | BinaryIO): The file.
+        """
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+    
+    async def __submit(self: Self) -> None:
+        """
+        Start writing the buffered records, after the previous batch is written.
+        
+        Raises:
+            OSError: If writing the previous batch failed.
+        """
+        async with self._lock:
+            await self.__wait_locked()
+            if not self._buffer:
+                return
+            
+            batch, self._buffer = self._buffer, []
+            self._writing = asyncio.create_task(asyncio.to_thread(self.__write_batch, batch))
+            self._writing_count = len(batch)
+    
+    async def __wait(self: Self) -> None:
+        """
+        Wait until the batch being written, if any, is written.
+        
+        Raises:
+            OSError: If writing the batch failed.
+        """
+        async with self._lock:
+            await self.__wait_locked()
+    
+    async def __wait_locked(self: Self) -> None:
+        if self._writing is not None:
+            # If the batch failed, it is kept so its error is raised again by the next call.
+            await self._writing
+            self._writing = None
+            self._writing_count = 0
+    
+    def __write_batch(self: Self, batch: list[Any]) -> None:
+        self._write_batch(batch)
+        self.written += len(batch)
+    
+    async def __tick(self: Self) -> None:
+        """
+        Write partial batches periodically.
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._buffer:
+                try:
+                    await self.__submit()
+                except Exception:
+                    # Raised again by the next write, flush or close.
+                    return
+
+class JSONLSink(ExportSink):
+    """
+    Writes records as JSON Lines, appending to the file.
+    
+    Any model can be written. Nested models, such as the files and comments of `TorrentInfo`, are kept.
+    Enums are written as their values, and timestamps in ISO 8601.
+    """
+    def __init__(self: Self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initialize JSON Lines sink. Takes the parameters of `ExportSink`.
+        """
+        super().__init__(*args, **kwargs)
+        self._file: BinaryIO | None = None
+    
+    def _write_batch(self: Self, batch: list[Any]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        
+        if orjson is not None:
+            self._file.write(b"".join(orjson.dumps(record, default=json_default) + b"\n" for record in batch))
+        else:
+            self._file.write("".join(json.dumps(record, default=json_default, ensure_ascii=False) + "\n" for record in batch).encode())
+        self._sync(self._file)
+    
+    def _close(self: Self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+class _TabularSink(ExportSink):
+    """
+    Base of the sinks of the tabular formats, which write records of a single model with the columns in `COLUMNS`.
+    """
+    def __init__(self: Self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._model: type | None = None
+        self._columns: tuple[Column, ...] = ()
+    
+    def _accept(self: Self, record: Any) -> None:
+        if self._model is None:
+            if (columns := COLUMNS.get(type(record))) is None:
+                raise TypeError(f"Cannot write records of type {type(record).__name__}, only {', '.join(model.__name__ for model in COLUMNS)}")
+            self._model = type(record)
+            self._columns = columns
+        elif type(record) is not self._model:
+            raise TypeError(f"Cannot write records of type {type(record).__name__} to a sink of {self._model.__name__}")
+
+class CSVSink(_TabularSink):
+    """
+    Writes records as CSV, appending to the file. The header is written if the file is empty.
+    
+    Records must be `SearchResultTorrent`, `TorrentInfo` or `NyaaRSSTorrent`, all of the same model.
+    Timestamps are written in ISO 8601.
+    """
+    def __init__(self: Self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initialize CSV sink. Takes the parameters of `ExportSink`.
+        """
+        super().__init__(*args, **kwargs)
+        self._file: TextIO | None = None
+        self._writer: Any = None
+    
+    def _write_batch(self: Self, batch: list[Any]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            if self._file.tell() == 0:
+                self._writer.writerow([name for name, _, _ in self._columns])
+        
+        self._writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in (getter(record) for _, _, getter in self._columns)]
+            for record in batch
+            )
+        self._sync(self._file)
+    
+    def _close(self: Self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+class ParquetSink(_TabularSink):
+    """
+    Writes records as Parquet files `part-<index>.parquet` in a directory, with a row group per batch. Requires pyarrow.
+    
+    Records must be `SearchResultTorrent`, `TorrentInfo` or `NyaaRSSTorrent`, all of the same model.
+    Columns are typed: counts and `size_bytes` are int64, and timestamps are UTC timestamps.
+    
+    A Parquet file can only be read once closed, so each file is written as `.parquet.part` and renamed once closed.
+    By default each batch is a file of its own, so a crash loses at most one batch, as with the other sinks.
+    With more row groups per file there are fewer files, but a crash loses every row group of the open file,
+    up to `row_groups_per_file` batches.
+    """
+    ROW_GROUPS_PER_FILE: int = 1
+    
+    _ARROW_TYPES: dict[str, Callable[[], Any]] = {
+        "int": lambda: pyarrow.int64(),
+        "str": lambda: pyarrow.string(),
+        "timestamp": lambda: pyarrow.timestamp("s", tz="UTC")
+    }
+    
+    def __init__(
+        self: Self,
+        path: str | os.PathLike,
+        batch_size: int = ExportSink.BATCH_SIZE,
+        flush_interval: float | None = ExportSink.FLUSH_INTERVAL,
+        fsync: bool = True,
+        row_groups_per_file: int = ROW_GROUPS_PER_FILE,
+        compression: str = "zstd"
+        ) -> None:
+        """
+        Initialize Parquet sink.
+        
+        Parameters:
+            path (str | os.PathLike): The directory to write to. Created if missing.
+            batch_size (int, optional): The number of records per batch and row group. Defaults to BATCH_SIZE.
+            flush_interval (float | None, optional): Seconds after which a partial batch is written. If None, only full batches are written. Defaults to FLUSH_INTERVAL.
+            fsync (bool, optional): Whether to fsync each file once closed. Defaults to True.
+            row_groups_per_file (int, optional): The number of row groups per file. Defaults to ROW_GROUPS_PER_FILE.
+            compression (str, optional): The compression codec of the files. Defaults to "zstd".
+        
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        if pyarrow is None:
+            raise ImportError("pyarrow is required to write Parquet: pip install pyarrow")
+        
+        super().__init__(path, batch_size=batch_size, flush_interval=flush_interval, fsync=fsync)
+        self.row_groups_per_file = row_groups_per_file
+        self.compression = compression
+        self.path.mkdir(parents=True, exist_ok=True)
+        
+        # Continue after the files of previous runs instead of overwriting them, even if some were deleted since.
+        self._index: int = max(
+            (int(index) for file in self.path.glob("part-*.parquet") if (index := file.stem.removeprefix("part-")).isdigit()),
+            default=-1
+            ) + 1
+        self._writer: Any = None
+        self._row_groups: int = 0
+    
+    def _write_batch(self: Self, batch: list[Any]) -> None:
+        schema = pyarrow.schema([(name, self._ARROW_TYPES[type]()) for name, type, _ in self._columns])
+        table = pyarrow.Table.from_arrays(
+            [pyarrow.array([getter(record) for record in batch], type=field.type) for (_, _, getter), field in zip(self._columns, schema)],
+            schema=schema
+            )
+        
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self.__part_path(), schema, compression=self.compression)
+        self._writer.write_table(table, row_group_size=len(batch))
+        self._row_groups += 1
+        
+        if self._row_groups >= self.row_groups_per_file:
+            self._close()
+    
+    def _close(self: Self) -> None:
+        if self._writer is None:
+            return
+        
+        self._writer.close()
+        part_path: Path = self.__part_path()
+        if self.fsync:
+            with open(part_path, "rb") as file:
+                os.fsync(file.fileno())
+        os.replace(part_path, part_path.with_suffix(""))
+        
+        self._writer = None
+        self._row_groups = 0
+        self._index += 1
+    
+    def __part_path(self: Self) -> Path:
+        return self.path / f"part-{self._index:05d}.parquet.part"
\ No newline at end of file
@@ -0,0 +1,500 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from operator import itemgetter
+from typing import Iterable, Self
+import calendar
+import heapq
+import math
+import os
+import struct
+import sys
+import time
+
+from .models import SearchResult, SearchResultTorrent, NyaaRSSFeed, NyaaRSSTorrent, StatsSnapshot, TrendingTorrent
+
+# Magic, format version, bucket seconds, pruned until, open bucket start (NaN if none), torrents, open torrents, buckets.
+_HEADER = struct.Struct("<2sBdddIII")
+# Bucket start, rows, typecodes of the seeders, leechers and completed columns.
+_BUCKET_HEADER = struct.Struct("<dI3s")
+_MAGIC: bytes = b"NH"
+_VERSION: int = 1
+
+def _pack(values: list[int]) -> array:
+    """
+    Build an array of deltas with the smallest signed type that fits them.
+    
+    Parameters:
+        values (list[int]): The deltas.
+    
+    Returns:
+        array: The array.
+    """
+    low: int = min(values, default=0)
+    high: int = max(values, default=0)
+    for typecode in "bhi":
+        bound: int = 1 << (array(typecode).itemsize * 8 - 1)
+        if -bound <= low and high < bound:
+            return array(typecode, values)
+    return array("q", values)
+
+def _dump(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _load(typecode: str, data: memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+class _Bucket:
+    """
+    The changes of a time bucket: the View-IDs of the torrents that changed, in order, and the delta of each count.
+    """
+    __slots__ = ("start", "ids", "seeders", "leechers", "completed")
+    
+    def __init__(self: Self, start: float, ids: array, seeders: array, leechers: array, completed: array) -> None:
+        self.start = start
+        self.ids = ids
+        self.seeders = seeders
+        self.leechers = leechers
+        self.completed = completed
+
+class StatsHistory:
+    """
+    History of the seeders, leechers and completed counts of torrents, keyed by View-ID.
+    
+    Snapshots are grouped into time buckets. Only the latest counts of each torrent are kept as absolute values,
+    in View-ID order. Each closed bucket only stores the torrents whose counts changed, with the delta of each count,
+    in columns of the smallest integer type that fits, so a change usually takes 7 bytes.
+    Counts at an earlier time are rebuilt by subtracting the deltas from the latest counts.
+    
+    View-IDs are per site, so keep one history per site.
+    """
+    BUCKET_SECONDS: float = 3600.0
+    
+    def __init__(self: Self, bucket_seconds: float = BUCKET_SECONDS, retention: float | None = None) -> None:
+        """
+        Initialize stats history.
+        
+        Parameters:
+            bucket_seconds (float, optional): The length of the time buckets in seconds. Defaults to BUCKET_SECONDS.
+            retention (float | None, optional): The seconds after which buckets are dropped. If None, buckets are kept forever. Defaults to None.
+        """
+        self.bucket_seconds = bucket_seconds
+        self.retention = retention
+        
+        # Latest counts of the closed buckets, in View-ID order.
+        self._ids: array = array("I")
+        self._seeders: array = array("I")
+        self._leechers: array = array("I")
+        self._completed: array = array("I")
+        self._first_seen: array = array("I")
+        
+        self._buckets: list[_Bucket] = []
+        self._starts: list[float] = []
+        self._pruned_until: float = 0.0
+        
+        self._open_start: float | None = None
+        self._open: dict[int, tuple[int, int, int]] = {}
+    
+    @property
+    def memory_usage(self: Self) -> int:
+        """
+        Getter property for the size of the stored counts.
+        
+        Returns:
+            int: The size in bytes of the columns, not counting the current bucket.
+        """
+        size: int = sum(column.itemsize * len(column) for column in (self._ids, self._seeders, self._leechers, self._completed, self._first_seen))
+        for bucket in self._buckets:
+            size += sum(column.itemsize * len(column) for column in (bucket.ids, bucket.seeders, bucket.leechers, bucket.completed))
+        return size
+    
+    def add(
+        self: Self,
+        view_id: int,
+        seeders: int,
+        leechers: int,
+        completed: int,
+        at: datetime | float | None = None
+        ) -> None:
+        """
+        Add a snapshot of the counts of a torrent.
+        
+        Snapshots of a time bucket earlier than the current one are added to the current one, since closed buckets are not changed.
+        
+        Parameters:
+            view_id (int): The View-ID of the torrent.
+            seeders (int): The number of seeders of the torrent.
+            leechers (int): The number of leechers of the torrent.
+            completed (int): The number of times the torrent has been completed.
+            at (datetime | float | None, optional): The time of the snapshot, as a datetime (naive ones are UTC) or a UNIX timestamp. If None, now. Defaults to None.
+        """
+        start: float = math.floor(self.__timestamp(at) / self.bucket_seconds) * self.bucket_seconds
+        if self._open_start is None:
+            self._open_start = start
+        elif start > self._open_start:
+            self.seal()
+            self._open_start = start
+        
+        self._open[view_id] = (seeders, leechers, completed)
+    
+    def record(
+        self: Self,
+        torrents: SearchResult | NyaaRSSFeed | Iterable[SearchResultTorrent | NyaaRSSTorrent],
+        at: datetime | float | None = None
+        ) -> int:
+        """
+        Add snapshots of the torrents of a search result or an RSS feed.
+        
+        Stale results are skipped, since their counts are not current.
+        
+        Parameters:
+            torrents (SearchResult | NyaaRSSFeed | Iterable[SearchResultTorrent | NyaaRSSTorrent]): The result, the feed, or their torrents.
+            at (datetime | float | None, optional): The time of the snapshots, as a datetime (naive ones are UTC) or a UNIX timestamp. If None, now. Defaults to None.
+        
+        Returns:
+            int: The number of snapshots added.
+        """
+        if isinstance(torrents, (SearchResult, NyaaRSSFeed)):
+            if torrents.stale:
+                return 0
+            torrents = torrents.torrents
+        
+        at = self.__timestamp(at)
+        added: int = 0
+        for torrent in torrents:
+            self.add(torrent.view_id, torrent.seeders, torrent.leechers, torrent.completed, at)
+            added += 1
+        return added
+    
+    def seal(self: Self) -> None:
+        """
+        Close the current bucket, storing the changes of its torrents.
+        
+        Called when a snapshot of a later bucket is added.
+        """
+        if not self._open:
+            return
+        
+        changed: list[int] = []
+        seeder_deltas: list[int] = []
+        leecher_deltas: list[int] = []
+        completed_deltas: list[int] = []
+        new: list[tuple[int, int, int, int]] = []
+        for view_id in sorted(self._open):
+            seeders, leechers, completed = self._open[view_id]
+            i: int = bisect_left(self._ids, view_id)
+            if i == len(self._ids) or self._ids[i] != view_id:
+                new.append((view_id, seeders, leechers, completed))
+                continue
+            
+            if seeders == self._seeders[i] and leechers == self._leechers[i] and completed == self._completed[i]:
+                continue
+            
+            changed.append(view_id)
+            seeder_deltas.append(seeders - self._seeders[i])
+            leecher_deltas.append(leechers - self._leechers[i])
+            completed_deltas.append(completed - self._completed[i])
+            self._seeders[i] = seeders
+            self._leechers[i] = leechers
+            self._completed[i] = completed
+        
+        if changed:
+            self._buckets.append(_Bucket(
+                self._open_start,
+                array("I", changed),
+                _pack(seeder_deltas),
+                _pack(leecher_deltas),
+                _pack(completed_deltas)
+                ))
+            self._starts.append(self._open_start)
+        if new:
+            self.__merge(new, int(self._open_start))
+        
+        self._open.clear()
+        self.__prune()
+    
+    def latest(self: Self, view_id: int) -> StatsSnapshot | None:
+        """
+        Get the latest counts of a torrent.
+        
+        Parameters:
+            view_id (int): The View-ID of the torrent.
+        
+        Returns:
+            StatsSnapshot | None: The latest counts, or None if the torrent was never seen.
+        """
+        if (counts := self._open.get(view_id)) is not None:
+            return StatsSnapshot(datetime.utcfromtimestamp(self._open_start), *counts)
+        
+        i: int = bisect_left(self._ids, view_id)
+        if i == len(self._ids) or self._ids[i] != view_id:
+            return None
+        
+        j: int = self.__last_change(view_id)
+        timestamp: float = self._buckets[j].start if j >= 0 else max(self._first_seen[i], self._pruned_until)
+        return StatsSnapshot(datetime.utcfromtimestamp(timestamp), self._seeders[i], self._leechers[i], self._completed[i])
+    
+    def history(self: Self, view_id: int) -> list[StatsSnapshot]:
+        """
+        Get the counts of a torrent over time.
+        
+        Parameters:
+            view_id (int): The View-ID of the torrent.
+        
+        Returns:
+            list[StatsSnapshot]: The counts when the torrent was first seen (or when older buckets were dropped),
+                and in every bucket they changed in, oldest first. Empty if the torrent was never seen.
+        """
+        snapshots: list[StatsSnapshot] = []
+        i: int = bisect_left(self._ids, view_id)
+        known: bool = i < len(self._ids) and self._ids[i] == view_id
+        if (counts := self._open.get(view_id)) is not None and not (
+            known and counts == (self._seeders[i], self._leechers[i], self._completed[i])
+            ):
+            snapshots.append(StatsSnapshot(datetime.utcfromtimestamp(self._open_start), *counts))
+        
+        if not known:
+            return snapshots
+        
+        seeders, leechers, completed = self._seeders[i], self._leechers[i], self._completed[i]
+        for bucket in reversed(self._buckets):
+            j: int = bisect_left(bucket.ids, view_id)
+            if j == len(bucket.ids) or bucket.ids[j] != view_id:
+                continue
+            
+            snapshots.append(StatsSnapshot(datetime.utcfromtimestamp(bucket.start), seeders, leechers, completed))
+            seeders -= bucket.seeders[j]
+            leechers -= bucket.leechers[j]
+            completed -= bucket.completed[j]
+        
+        timestamp: float = max(self._first_seen[i], self._pruned_until)
+        snapshots.append(StatsSnapshot(datetime.utcfromtimestamp(timestamp), seeders, leechers, completed))
+        snapshots.reverse()
+        return snapshots
+    
+    def trending(self: Self, hours: float = 24.0, k: int = 10, now: datetime | float | None = None) -> list[TrendingTorrent]:
+        """
+        Get the torrents completed the most times over the last hours.
+        
+        The deltas of the buckets overlapping the period are summed per torrent, and the top ones are selected with a heap.
+        Torrents first seen during the period only count the times they were completed after they were first seen.
+        
+        Parameters:
+            hours (float, optional): The length of the period. Defaults to 24.0.
+            k (int, optional): The maximum number of torrents. Defaults to 10.
+            now (datetime | float | None, optional): The end of the period, as a datetime (naive ones are UTC) or a UNIX timestamp. If None, now. Defaults to None.
+        
+        Returns:
+            list[TrendingTorrent]: The torrents completed at least once over the period, the most completed first.
+        """
+        since: float = self.__timestamp(now) - hours * 3600
+        totals: dict[int, int] = {}
+        for bucket in self._buckets[bisect_right(self._starts, since - self.bucket_seconds):]:
+            for view_id, delta in zip(bucket.ids, bucket.completed):
+                if delta:
+                    totals[view_id] = totals.get(view_id, 0) + delta
+        
+        if self._open and self._open_start + self.bucket_seconds > since:
+            for view_id, (_, _, completed) in self._open.items():
+                i: int = bisect_left(self._ids, view_id)
+                if i < len(self._ids) and self._ids[i] == view_id and (delta := completed - self._completed[i]):
+                    totals[view_id] = totals.get(view_id, 0) + delta
+        
+        top: list[tuple[int, int]] = heapq.nlargest(k, ((view_id, total) for view_id, total in totals.items() if total > 0), key=itemgetter(1))
+        trending: list[TrendingTorrent] = []
+        for view_id, total in top:
+            latest: StatsSnapshot = self.latest(view_id)
+            trending.append(TrendingTorrent(view_id, total, latest.seeders, latest.leechers, latest.completed))
+        return trending
+    
+    def save(self: Self, path: str | os.PathLike) -> None:
+        """
+        Save the history to a file. The file is replaced atomically.
+        
+        Parameters:
+            path (str | os.PathLike): The path of the file.
+        """
+        open_ids: list[int] = sorted(self._open)
+        part_path: str = os.fspath(path) + ".part"
+        with open(part_path, "wb") as file:
+            file.write(_HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                self.bucket_seconds,
+                self._pruned_until,
+                math.nan if self._open_start is None else self._open_start,
+                len(self._ids),
+                len(open_ids),
+                len(self._buckets)
+                ))
+            for column in (self._ids, self._seeders, self._leechers, self._completed, self._first_seen):
+                file.write(_dump(column))
+            
+            file.write(_dump(array("I", open_ids)))
+            for position in range(3):
+                file.write(_dump(array("I", [self._open[view_id][position] for view_id in open_ids])))
+            
+            for bucket in self._buckets:
+                typecodes: bytes = (bucket.seeders.typecode + bucket.leechers.typecode + bucket.completed.typecode).encode("ascii")
+                file.write(_BUCKET_HEADER.pack(bucket.start, len(bucket.ids), typecodes))
+                for column in (bucket.ids, bucket.seeders, bucket.leechers, bucket.completed):
+                    file.write(_dump(column))
+        os.replace(part_path, path)
+    
+    @classmethod
+    def load(cls: type[Self], path: str | os.PathLike, retention: float | None = None) -> Self:
+        """
+        Load a history saved with `save`.
+        
+        Parameters:
+            path (str | os.PathLike): The path of the file.
+            retention (float | None, optional): The seconds after which buckets are dropped. If None, buckets are kept forever. Defaults to None.
+        
+        Raises:
+            ValueError: If the file is not a saved history, or was saved with an unknown format version.
+        
+        Returns:
+            Self: The history.
+        """
+        with open(path, "rb") as file:
+            data = memoryview(file.read())
+        
+        if len(data) < _HEADER.size:
+            raise ValueError("Not a stats history file")
+        magic, version, bucket_seconds, pruned_until, open_start, torrents, open_torrents, buckets = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a stats history file")
+        if version != _VERSION:
+            raise ValueError(f"Unknown stats history format version {version}")
+        
+        offset: int = _HEADER.size
+        
+        def column(typecode: str, length: int) -> array:
+            nonlocal offset
+            size: int = array(typecode).itemsize * length
+            if offset + size > len(data):
+                raise ValueError("Truncated stats history file")
+            values: array = _load(typecode, data[offset:offset + size])
+            offset += size
+            return values
+        
+        history = cls(bucket_seconds, retention)
+        history._pruned_until = pruned_until
+        history._ids, history._seeders, history._leechers, history._completed, history._first_seen = [column("I", torrents) for _ in range(5)]
+        
+        open_ids, open_seeders, open_leechers, open_completed = [column("I", open_torrents) for _ in range(4)]
+        history._open = {
+            view_id: (seeders, leechers, completed)
+            for view_id, seeders, leechers, completed in zip(open_ids, open_seeders, open_leechers, open_completed)
+        }
+        history._open_start = None if math.isnan(open_start) else open_start
+        
+        for _ in range(buckets):
+            if offset + _BUCKET_HEADER.size > len(data):
+                raise ValueError("Truncated stats history file")
+            start, rows, typecodes = _BUCKET_HEADER.unpack_from(data, offset)
+            offset += _BUCKET_HEADER.size
+            seeders_type, leechers_type, completed_type = typecodes.decode("ascii")
+            history._buckets.append(_Bucket(
+                start,
+                column("I", rows),
+                column(seeders_type, rows),
+                column(leechers_type, rows),
+                column(completed_type, rows)
+                ))
+            history._starts.append(start)
+        
+        history.__prune()
+        return history
+    
+    def __len__(self: Self) -> int:
+        return len(self._ids) + sum(1 for view_id in self._open if not self.__known(view_id))
+    
+    def __known(self: Self, view_id: int) -> bool:
+        i: int = bisect_left(self._ids, view_id)
+        return i < len(self._ids) and self._ids[i] == view_id
+    
+    def __last_change(self: Self, view_id: int) -> int:
+        """
+        Find the latest bucket a torrent changed in.
+        
+        Parameters:
+            view_id (int): The View-ID of the torrent.
+        
+        Returns:
+            int: The index of the bucket, or -1 if the torrent did not change in any bucket.
+        """
+        for j in range(len(self._buckets) - 1, -1, -1):
+            ids: array = self._buckets[j].ids
+            i: int = bisect_left(ids, view_id)
+            if i < len(ids) and ids[i] == view_id:
+                return j
+        return -1
+    
+    def __merge(self: Self, new: list[tuple[int, int, int, int]], first_seen: int) -> None:
+        """
+        Add torrents seen for the first time to the latest counts, keeping them in View-ID order.
+        
+        Parameters:
+            new (list[tuple[int, int, int, int]]): The View-ID and counts of each torrent, in View-ID order.
+            first_seen (int): The start of the bucket the torrents were first seen in.
+        """
+        if not self._ids or new[0][0] > self._ids[-1]:
+            # New torrents usually have the highest View-IDs.
+            self._ids.extend(torrent[0] for torrent in new)
+            self._seeders.extend(torrent[1] for torrent in new)
+            self._leechers.extend(torrent[2] for torrent in new)
+            self._completed.extend(torrent[3] for torrent in new)
+            self._first_seen.extend([first_seen] * len(new))
+            return
+        
+        columns: list[array] = [self._ids, self._seeders, self._leechers, self._completed, self._first_seen]
+        merged: list[list[int]] = [list(column) for column in columns]
+        for position, values in enumerate(zip(*new)):
+            merged[position].extend(values)
+        merged[4].extend([first_seen] * len(new))
+        
+        order: list[int] = sorted(range(len(merged[0])), key=merged[0].__getitem__)
+        self._ids, self._seeders, self._leechers, self._completed, self._first_seen = (
+            array("I", map(values.__getitem__, order)) for values in merged
+        )
+    
+    def __prune(self: Self) -> None:
+        """
+        Drop the buckets older than the retention.
+        """
+        if self.retention is None or not self._buckets:
+            return
+        
+        newest: float = self._open_start if self._open_start is not None else self._starts[-1]
+        if (dropped := bisect_left(self._starts, newest - self.retention)) == 0:
+            return
+        
+        # The counts rebuilt before the oldest bucket kept are those of the last bucket dropped.
+        self._pruned_until = self._starts[dropped - 1]
+        del self._buckets[:dropped]
+        del self._starts[:dropped]
+    
+    @staticmethod
+    def __timestamp(at: datetime | float | None) -> float:
+        """
+        Convert a time to a UNIX timestamp.
+        
+        Parameters:
+            at (datetime | float | None): The time, as a datetime (naive ones are UTC) or a UNIX timestamp. If None, now.
+        
+        Returns:
+            float: The UNIX timestamp.
+        """
+        if at is None:
+            return time.time()
+        if isinstance(at, datetime):
+            return calendar.timegm(at.utctimetuple()) + at.microsecond / 1e6
+        return float(at)
\ No newline at end of file
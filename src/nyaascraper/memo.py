@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from typing import Any, Self
+import copy
+import hashlib
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+class ParseMemo:
+    """
+    Memo of parsed models keyed by a hash of the response body.
+    
+    A parsed model is only reused when the response body is byte-identical to a previously parsed one,
+    so unlike a time-based cache the returned model is always the one a fresh parse would build.
+    Models are copied into and out of the memo, so each call gets its own model and changing it does not affect the memo.
+    
+    The memo is a size-aware LRU: each entry is weighted by the size of the response body it was parsed from,
+    and least recently used entries are evicted once the total size exceeds `max_size`.
+    """
+    DEFAULT_MAX_SIZE: int = 64 * 1024 * 1024
+    
+    def __init__(self: Self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Initialize parse memo.
+        
+        Parameters:
+            max_size (int, optional): The maximum total size in bytes of the memoized response bodies. Defaults to DEFAULT_MAX_SIZE.
+        """
+        self.max_size = max_size
+        
+        self.hits: int = 0
+        self.misses: int = 0
+        
+        self._entries: OrderedDict[tuple[str, ...], tuple[Any, int]] = OrderedDict()
+        self._size: int = 0
+    
+    @property
+    def size(self: Self) -> int:
+        """
+        Getter property for the total size of the memoized response bodies.
+        
+        Returns:
+            int: The total size in bytes.
+        """
+        return self._size
+    
+    @property
+    def hit_rate(self: Self) -> float:
+        """
+        Getter property for the ratio of lookups that were served from the memo.
+        
+        Returns:
+            float: The hit rate between 0.0 and 1.0. 0.0 if there were no lookups yet.
+        """
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    @staticmethod
+    def make_key(kind: str, base_url: str, body: bytes) -> tuple[str, ...]:
+        """
+        Make a memo key for a response body.
+        
+        The body is hashed with xxh3-128 if `xxhash` is installed, otherwise with blake2b.
+        
+        Parameters:
+            kind (str): The kind of page, such as "search" or "view".
+            base_url (str): The base URL the page was fetched from, since extracted models depend on it.
+            body (bytes): The response body.
+        
+        Returns:
+            tuple[str, ...]: The memo key.
+        """
+        if xxhash is not None:
+            digest: str = xxhash.xxh3_128_hexdigest(body)
+        else:
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return kind, base_url, digest
+    
+    def get(self: Self, key: tuple[str, ...]) -> Any | None:
+        """
+        Get a memoized model.
+        
+        Parameters:
+            key (tuple[str, ...]): The memo key.
+        
+        Returns:
+            Any | None: A copy of the memoized model, or None if not memoized.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return copy.deepcopy(entry[0])
+    
+    def put(self: Self, key: tuple[str, ...], value: Any, size: int) -> None:
+        """
+        Memoize a copy of a model.
+        
+        Parameters:
+            key (tuple[str, ...]): The memo key.
+            value (Any): The parsed model.
+            size (int): The weight of the entry, usually the size of the response body.
+        """
+        if size > self.max_size:
+            return
+        
+        if (previous := self._entries.pop(key, None)) is not None:
+            self._size -= previous[1]
+        
+        self._entries[key] = (copy.deepcopy(value), size)
+        self._size += size
+        
+        while self._size > self.max_size:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+    
+    def clear(self: Self) -> None:
+        """
+        Remove all memoized models and reset the hit and miss counters.
+        """
+        self._entries.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self: Self) -> int:
+        return len(self._entries)
\ No newline at end of file
@@ -0,0 +1,236 @@
+from collections import Counter, deque
+from typing import Any, Self
+import math
+import time
+
+class Metrics:
+    """
+    Metrics interface of the clients.
+    
+    This base class is a no-op and is the default of the clients. Since `enabled` is False,
+    the clients skip request tracing entirely, so the default costs nothing per request.
+    
+    Phases reported through `timing`:
+        queue: Waiting for the turn of the request in the scheduler.
+        proxy_wait: Waiting for a proxy of the proxy pool with budget left.
+        pool_wait: Waiting for a connection from the pool.
+        connect: TCP connect.
+        tls: TLS handshake.
+        send: Sending the request headers and body.
+        server: Waiting for the response headers after the request was sent.
+        transfer: Receiving the response body.
+        total: The whole request, from sending to the end of the body.
+        parse: Building the document (BeautifulSoup or feedparser) from the response body.
+        extract: Building the model from the document.
+    
+    Counters reported through `count`:
+        requests, errors, bytes_received, rows, memo_hits, deadline_exceeded,
+        retries (requests sent again to another base URL of a mirror pool, or through another proxy of the proxy pool),
+        circuit_open (requests failed fast by an open circuit), stale (stale responses served from the stale cache),
+        proxy_throttled (403 and 429 responses received through a proxy, which quarantine it).
+    """
+    enabled: bool = False
+    
+    def timing(self: Self, endpoint: str, phase: str, start_ns: int, end_ns: int) -> None:
+        """
+        Record the timing of a phase.
+        
+        Parameters:
+            endpoint (str): The endpoint, such as "search", "view" or "rss".
+            phase (str): The phase.
+            start_ns (int): The start of the phase, from `time.perf_counter_ns`.
+            end_ns (int): The end of the phase, from `time.perf_counter_ns`.
+        """
+        pass
+    
+    def count(self: Self, endpoint: str, name: str, value: int = 1) -> None:
+        """
+        Increment a counter.
+        
+        Parameters:
+            endpoint (str): The endpoint, such as "search", "view" or "rss".
+            name (str): The name of the counter.
+            value (int, optional): The value to add. Defaults to 1.
+        """
+        pass
+
+class HistogramMetrics(Metrics):
+    """
+    In-process metrics keeping the most recent timings of each endpoint and phase for percentiles.
+    """
+    enabled: bool = True
+    MAX_SAMPLES: int = 10_000
+    
+    def __init__(self: Self, max_samples: int = MAX_SAMPLES) -> None:
+        """
+        Initialize in-process metrics.
+        
+        Parameters:
+            max_samples (int, optional): The number of most recent timings kept per endpoint and phase. Defaults to MAX_SAMPLES.
+        """
+        self.max_samples = max_samples
+        
+        self._timings: dict[tuple[str, str], deque[float]] = {}
+        self._counts: Counter[tuple[str, str]] = Counter()
+    
+    def timing(self: Self, endpoint: str, phase: str, start_ns: int, end_ns: int) -> None:
+        if (samples := self._timings.get((endpoint, phase))) is None:
+            samples = self._timings[(endpoint, phase)] = deque(maxlen=self.max_samples)
+        samples.append((end_ns - start_ns) / 1e9)
+    
+    def count(self: Self, endpoint: str, name: str, value: int = 1) -> None:
+        self._counts[(endpoint, name)] += value
+    
+    def percentile(self: Self, endpoint: str, phase: str, percent: float) -> float | None:
+        """
+        Get a percentile of the recorded timings of a phase.
+        
+        Parameters:
+            endpoint (str): The endpoint.
+            phase (str): The phase.
+            percent (float): The percentile, between 0 and 100.
+        
+        Returns:
+            float | None: The timing in seconds, or None if nothing was recorded.
+        """
+        samples = self._timings.get((endpoint, phase))
+        if not samples:
+            return None
+        
+        ordered: list[float] = sorted(samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))]
+    
+    def get_count(self: Self, endpoint: str, name: str) -> int:
+        """
+        Get the value of a counter.
+        
+        Parameters:
+            endpoint (str): The endpoint.
+            name (str): The name of the counter.
+        
+        Returns:
+            int: The value of the counter.
+        """
+        return self._counts[(endpoint, name)]
+    
+    def summary(self: Self) -> dict[str, dict[str, Any]]:
+        """
+        Summarize the recorded timings and counters.
+        
+        Returns:
+            dict[str, dict[str, Any]]: For each endpoint, the count, mean, p50, p90, p99 and max in seconds of each phase, and the counters.
+        """
+        result: dict[str, dict[str, Any]] = {}
+        for (endpoint, phase), samples in self._timings.items():
+            ordered: list[float] = sorted(samples)
+            result.setdefault(endpoint, {})[phase] = {
+                "count": len(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p50": self.percentile(endpoint, phase, 50),
+                "p90": self.percentile(endpoint, phase, 90),
+                "p99": self.percentile(endpoint, phase, 99),
+                "max": ordered[-1]
+            }
+        
+        for (endpoint, name), value in self._counts.items():
+            result.setdefault(endpoint, {}).setdefault("counts", {})[name] = value
+        
+        return result
+    
+    def reset(self: Self) -> None:
+        """
+        Remove all recorded timings and counters.
+        """
+        self._timings.clear()
+        self._counts.clear()
+
+class OpenTelemetryMetrics(Metrics):
+    """
+    Metrics reported as OpenTelemetry spans and counters.
+    
+    Each phase becomes a span named `nyaascraper.<endpoint>.<phase>` and each counter
+    an OpenTelemetry counter named `nyaascraper.<name>` with an `endpoint` attribute.
+    The tracer and meter are used as-is, so this module does not depend on OpenTelemetry.
+    """
+    enabled: bool = True
+    
+    def __init__(self: Self, tracer: Any, meter: Any | None = None) -> None:
+        """
+        Initialize OpenTelemetry metrics.
+        
+        Parameters:
+            tracer (Any): An OpenTelemetry tracer, such as `opentelemetry.trace.get_tracer(__name__)`.
+            meter (Any | None, optional): An OpenTelemetry meter for the counters. If None, counters are dropped. Defaults to None.
+        """
+        self.tracer = tracer
+        self.meter = meter
+        
+        self._counters: dict[str, Any] = {}
+        # Spans are timestamped in nanoseconds since the epoch, phases with the performance counter.
+        self._epoch_offset_ns: int = time.time_ns() - time.perf_counter_ns()
+    
+    def timing(self: Self, endpoint: str, phase: str, start_ns: int, end_ns: int) -> None:
+        span = self.tracer.start_span(
+            f"nyaascraper.{endpoint}.{phase}",
+            start_time=start_ns + self._epoch_offset_ns,
+            attributes={"nyaascraper.endpoint": endpoint, "nyaascraper.phase": phase}
+            )
+        span.end(end_time=end_ns + self._epoch_offset_ns)
+    
+    def count(self: Self, endpoint: str, name: str, value: int = 1) -> None:
+        if self.meter is None:
+            return
+        
+        if (counter := self._counters.get(name)) is None:
+            counter = self._counters[name] = self.meter.create_counter(f"nyaascraper.{name}")
+        counter.add(value, {"endpoint": endpoint})
+
+class RequestTrace:
+    """
+    Collects the connection phases of a single request through the httpcore `trace` request extension.
+    """
+    # Connection phases and their (start event, end event), without the "connection."/"http11."/"http2." prefix.
+    PHASES: dict[str, tuple[str, str]] = {
+        "connect": ("connect_tcp.started", "connect_tcp.complete"),
+        "tls": ("start_tls.started", "start_tls.complete"),
+        "send": ("send_request_headers.started", "send_request_body.complete"),
+        "server": ("send_request_body.complete", "receive_response_headers.complete"),
+        "transfer": ("receive_response_body.started", "receive_response_body.complete")
+    }
+    
+    def __init__(self: Self) -> None:
+        """
+        Initialize request trace. The request is considered started on initialization.
+        """
+        self.started_ns: int = time.perf_counter_ns()
+        self.events: dict[str, int] = {}
+    
+    async def __call__(self: Self, event_name: str, info: dict[str, Any]) -> None:
+        """
+        Record an httpcore trace event.
+        
+        Parameters:
+            event_name (str): The event name, such as "http11.send_request_headers.started".
+            info (dict[str, Any]): The event info.
+        """
+        self.events.setdefault(event_name.split(".", 1)[1], time.perf_counter_ns())
+    
+    def report(self: Self, metrics: Metrics, endpoint: str) -> None:
+        """
+        Report the recorded phases.
+        
+        Parameters:
+            metrics (Metrics): The metrics to report to.
+            endpoint (str): The endpoint of the request.
+        """
+        ended_ns: int = time.perf_counter_ns()
+        
+        first_event_ns: int | None = self.events.get("connect_tcp.started", self.events.get("send_request_headers.started"))
+        if first_event_ns is not None:
+            metrics.timing(endpoint, "pool_wait", self.started_ns, first_event_ns)
+        
+        for phase, (start_event, end_event) in self.PHASES.items():
+            if start_event in self.events and end_event in self.events:
+                metrics.timing(endpoint, phase, self.events[start_event], self.events[end_event])
+        
+        metrics.timing(endpoint, "total", self.started_ns, self.events.get("receive_response_body.complete", ended_ns))
\ No newline at end of file
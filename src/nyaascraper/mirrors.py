@@ -0,0 +1,246 @@
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Callable, Self
+import asyncio
+import time
+
+import httpx
+
+from .exceptions import DeadlineExceededError
+from .models import MirrorStats
+
+class _Mirror:
+    """
+    State of a base URL of a mirror pool.
+    """
+    __slots__ = ("url", "latency", "in_flight", "failures", "down_until")
+    
+    def __init__(self: Self, url: str) -> None:
+        self.url = url
+        self.latency: float | None = None
+        self.in_flight: int = 0
+        self.failures: int = 0
+        self.down_until: float = 0.0
+
+class MirrorPool:
+    """
+    Base URLs serving the same site, such as the official host, its mirrors and local proxies.
+    
+    Requests are routed to the healthy base URL with the lowest latency, estimated with an exponentially weighted
+    moving average of the latest requests. Base URLs without a latency yet are tried first, so every base URL is measured.
+    A base URL is down for `cooldown` seconds after `max_failures` consecutive failed requests. Requests fail over
+    to the next base URL, and only go to a down base URL if every base URL is down.
+    
+    Health checks send a HEAD request to every base URL, so a base URL that is back up is used again,
+    and latencies stay current for base URLs that get no traffic. Clients with a proxy pool send them through their proxies.
+    """
+    ALPHA: float = 0.3
+    MAX_FAILURES: int = 2
+    COOLDOWN: float = 30.0
+    HEALTH_CHECK_INTERVAL: float = 60.0
+    HEALTH_CHECK_TIMEOUT: float = 5.0
+    
+    def __init__(
+        self: Self,
+        urls: list[str],
+        alpha: float = ALPHA,
+        max_failures: int = MAX_FAILURES,
+        cooldown: float = COOLDOWN,
+        health_check_interval: float | None = HEALTH_CHECK_INTERVAL
+        ) -> None:
+        """
+        Initialize mirror pool.
+        
+        Parameters:
+            urls (list[str]): The base URLs, without a trailing slash. The first one is the primary base URL, used for the URLs in the models.
+            alpha (float, optional): The weight of the latest latency in the moving average. Defaults to ALPHA.
+            max_failures (int, optional): The number of consecutive failures after which a base URL is down. Defaults to MAX_FAILURES.
+            cooldown (float, optional): The seconds a base URL is down for. Defaults to COOLDOWN.
+            health_check_interval (float | None, optional): The seconds between the health checks the clients run. If None, the clients run none. Defaults to HEALTH_CHECK_INTERVAL.
+        
+        Raises:
+            ValueError: If no base URL is given.
+        """
+        if not urls:
+            raise ValueError("A mirror pool needs at least one base URL")
+        
+        self.alpha = alpha
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.health_check_interval = health_check_interval
+        
+        self._mirrors: dict[str, _Mirror] = {url.rstrip("/"): _Mirror(url.rstrip("/")) for url in urls}
+        self._checked_at: float = time.monotonic()
+        self._health_check: asyncio.Task | None = None
+    
+    @property
+    def primary(self: Self) -> str:
+        """
+        Getter property for the primary base URL.
+        
+        Returns:
+            str: The first base URL of the pool.
+        """
+        return next(iter(self._mirrors))
+    
+    @property
+    def urls(self: Self) -> list[str]:
+        """
+        Getter property for the base URLs.
+        
+        Returns:
+            list[str]: The base URLs, primary first.
+        """
+        return list(self._mirrors)
+    
+    def route(self: Self) -> list[str]:
+        """
+        Order the base URLs to try a request with.
+        
+        Returns:
+            list[str]: The healthy base URLs from the lowest latency, then the down base URLs from the soonest back up.
+        """
+        now: float = time.monotonic()
+        healthy: list[_Mirror] = [mirror for mirror in self._mirrors.values() if mirror.down_until <= now]
+        down: list[_Mirror] = [mirror for mirror in self._mirrors.values() if mirror.down_until > now]
+        healthy.sort(key=lambda mirror: -1.0 if mirror.latency is None else mirror.latency * (1 + mirror.in_flight))
+        down.sort(key=lambda mirror: mirror.down_until)
+        return [mirror.url for mirror in healthy + down]
+    
+    def started(self: Self, url: str) -> None:
+        """
+        Record the start of a request to a base URL.
+        
+        Parameters:
+            url (str): The base URL.
+        """
+        self._mirrors[url].in_flight += 1
+    
+    def succeeded(self: Self, url: str, latency: float) -> None:
+        """
+        Record a successful request to a base URL.
+        
+        Parameters:
+            url (str): The base URL.
+            latency (float): The seconds until the response headers were received.
+        """
+        mirror: _Mirror = self._mirrors[url]
+        mirror.in_flight -= 1
+        mirror.failures = 0
+        mirror.down_until = 0.0
+        self.__observe(mirror, latency)
+    
+    def failed(self: Self, url: str) -> None:
+        """
+        Record a failed request to a base URL.
+        
+        Parameters:
+            url (str): The base URL.
+        """
+        mirror: _Mirror = self._mirrors[url]
+        mirror.in_flight -= 1
+        self.__fail(mirror)
+    
+    def cancelled(self: Self, url: str) -> None:
+        """
+        Record a request to a base URL that was cancelled, without counting it as a failure.
+        
+        Parameters:
+            url (str): The base URL.
+        """
+        self._mirrors[url].in_flight -= 1
+    
+    def stats(self: Self) -> list[MirrorStats]:
+        """
+        Get the state of each base URL.
+        
+        Returns:
+            list[MirrorStats]: The state of each base URL, primary first.
+        """
+        now: float = time.monotonic()
+        return [
+            MirrorStats(
+                url=mirror.url,
+                healthy=mirror.down_until <= now,
+                latency=mirror.latency,
+                in_flight=mirror.in_flight,
+                failures=mirror.failures
+                )
+            for mirror in self._mirrors.values()
+        ]
+    
+    def maybe_check(self: Self, http_client: httpx.AsyncClient | Callable[[], AbstractAsyncContextManager[httpx.AsyncClient]]) -> None:
+        """
+        Start a health check in the background if one is due.
+        
+        Parameters:
+            http_client (httpx.AsyncClient | Callable[[], AbstractAsyncContextManager[httpx.AsyncClient]]): The HTTP client to check with, or a function returning a context manager yielding the HTTP client of each request, as for `check`.
+        """
+        if self.health_check_interval is None or (self._health_check is not None and not self._health_check.done()):
+            return
+        if time.monotonic() - self._checked_at < self.health_check_interval:
+            return
+        
+        self._checked_at = time.monotonic()
+        self._health_check = asyncio.create_task(self.check(http_client))
+    
+    async def check(
+        self: Self,
+        http_client: httpx.AsyncClient | Callable[[], AbstractAsyncContextManager[httpx.AsyncClient]],
+        timeout: float = HEALTH_CHECK_TIMEOUT
+        ) -> None:
+        """
+        Check the health and latency of every base URL.
+        
+        Parameters:
+            http_client (httpx.AsyncClient | Callable[[], AbstractAsyncContextManager[httpx.AsyncClient]]): The HTTP client to check with,
+                or a function returning a context manager yielding the HTTP client of each request, such as one picking a proxy.
+                Error responses are raised inside the context manager as `httpx.HTTPStatusError`, so it can record them.
+                If the context manager raises `DeadlineExceededError`, the base URL is left unchecked.
+            timeout (float, optional): The seconds after which a base URL is considered down. Defaults to HEALTH_CHECK_TIMEOUT.
+        """
+        async def check_mirror(mirror: _Mirror) -> None:
+            try:
+                async with nullcontext(http_client) if isinstance(http_client, httpx.AsyncClient) else http_client() as client:
+                    started: float = time.perf_counter()
+                    response: httpx.Response = await client.head(mirror.url + "/", timeout=timeout)
+                    latency: float = time.perf_counter() - started
+                    response.raise_for_status()
+            except httpx.HTTPStatusError as error:
+                response = error.response
+            except httpx.HTTPError:
+                self.__fail(mirror)
+                return
+            except DeadlineExceededError:
+                # No proxy could send the request in time, which says nothing about the base URL.
+                return
+            
+            if response.status_code >= 500 or response.status_code == 429:
+                self.__fail(mirror)
+            else:
+                mirror.failures = 0
+                mirror.down_until = 0.0
+                self.__observe(mirror, latency)
+        
+        self._checked_at = time.monotonic()
+        await asyncio.gather(*(check_mirror(mirror) for mirror in self._mirrors.values()))
+    
+    def __observe(self: Self, mirror: _Mirror, latency: float) -> None:
+        """
+        Add a latency to the moving average of a base URL.
+        
+        Parameters:
+            mirror (_Mirror): The base URL.
+            latency (float): The latency in seconds.
+        """
+        mirror.latency = latency if mirror.latency is None else self.alpha * latency + (1 - self.alpha) * mirror.latency
+    
+    def __fail(self: Self, mirror: _Mirror) -> None:
+        """
+        Count a failure of a base URL, and take it down after too many in a row.
+        
+        Parameters:
+            mirror (_Mirror): The base URL.
+        """
+        mirror.failures += 1
+        if mirror.failures >= self.max_failures:
+            mirror.down_until = time.monotonic() + self.cooldown
\ No newline at end of file
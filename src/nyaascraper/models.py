@@ -3,10 +3,55 @@ from dataclasses import dataclass
 from datetime import datetime
 import time
 
-from .enums import FunCategory, FapCategory, TorrentType, UserLevel
+from .enums import SITE, FunCategory, FapCategory, TorrentType, UserLevel, DownloadStatus, SerializationFormat, Priority, CircuitState
+
+class Serializable:
+    """
+    Base class of the models, providing compact binary serialization.
+    
+    See `nyaascraper.serialization` for the format.
+    """
+    def to_bytes(self: Self, format: SerializationFormat = SerializationFormat.JSON) -> bytes:
+        """
+        Serialize the model.
+        
+        Parameters:
+            format (SerializationFormat, optional): The format of the payload. Defaults to SerializationFormat.JSON.
+        
+        Raises:
+            ImportError: If the format requires a package that is not installed.
+        
+        Returns:
+            bytes: The serialized model.
+        """
+        from .serialization import to_bytes
+        return to_bytes(self, format)
+    
+    @classmethod
+    def from_bytes(cls: type[Self], data: bytes) -> Self:
+        """
+        Deserialize a model of this class.
+        
+        Parameters:
+            data (bytes): The serialized model.
+        
+        Raises:
+            SerializationError: If the data is not a serialized model of this class, or its schema version is unknown.
+            ImportError: If the format requires a package that is not installed.
+        
+        Returns:
+            Self: The model.
+        """
+        from .exceptions import SerializationError
+        from .serialization import from_bytes
+        
+        model = from_bytes(data)
+        if not isinstance(model, cls):
+            raise SerializationError(f"Data is a serialized {type(model).__name__}, not {cls.__name__}")
+        return model
 
 @dataclass
-class SearchResultTorrent:
+class SearchResultTorrent(Serializable):
     """
     Represents a search result torrent.
     
@@ -39,7 +84,7 @@ class SearchResultTorrent:
     total_comments: int
 
 @dataclass
-class SearchResult:
+class SearchResult(Serializable):
     """
     Search result.
     
@@ -52,6 +97,7 @@ class SearchResult:
         previous_page (int, optional): The number of previous result page. Defaults to None.
         next_page (int, optional): The number of next result page. Defaults to None.
         available_pages (int, optional): The number of currently available result pages. If exceeded, there might be more result pages available. Defaults to None.
+        stale (bool, optional): Whether the result is the last known good result, served because the site failed. Defaults to False.
     """
     torrents: list[SearchResultTorrent]
     displaying_from: int
@@ -61,9 +107,10 @@ class SearchResult:
     previous_page: int | None = None
     next_page: int | None = None
     available_pages: int | None = None
+    stale: bool = False
 
 @dataclass
-class User:
+class User(Serializable):
     """
     An User.
     
@@ -81,7 +128,7 @@ class User:
     is_banned: bool | None = None
 
 @dataclass
-class File:
+class File(Serializable):
     """
     A File.
     
@@ -93,7 +140,7 @@ class File:
     size: str
 
 @dataclass
-class Folder:
+class Folder(Serializable):
     """
     A Folder.
     
@@ -105,7 +152,7 @@ class Folder:
     files: list[File | Self]
 
 @dataclass
-class Comment:
+class Comment(Serializable):
     """
     A Comment.
     
@@ -123,7 +170,7 @@ class Comment:
     text: str
 
 @dataclass
-class TorrentInfo:
+class TorrentInfo(Serializable):
     """
     Torrent information.
     
@@ -144,6 +191,7 @@ class TorrentInfo:
         files (list[File | Folder]): A list of torrent files.
         total_comments (int): The number of total comments on the torrent.
         comments (list[Comment]): A list of comments on the torrent.
+        stale (bool, optional): Whether the information is the last known good information, served because the site failed. Defaults to False.
     """
     name: str
     category: FunCategory | FapCategory
@@ -161,9 +209,10 @@ class TorrentInfo:
     files: list[File | Folder]
     total_comments: int
     comments: list[Comment]
+    stale: bool = False
 
 @dataclass
-class NyaaRSSTorrent:
+class NyaaRSSTorrent(Serializable):
     """
     Represents a torrent entry from Nyaa RSS feed.
     
@@ -174,7 +223,7 @@ class NyaaRSSTorrent:
         category (FunCategory | FapCategory): The category of the torrent.
         size (str): The size of the torrent.
         published (str): The published date/time string.
-        published_parsed (time.struct_time): The published date/time as a `time.struct_time` object.
+        published_parsed (time.struct_time | None): The published date/time as a `time.struct_time` object. None if feedparser could not parse it.
         torrent_url (str | None): The URL of the torrent file.
         magnet_link (str | None): The magnet link.
         seeders (int): The number of seeders of the torrent.
@@ -191,7 +240,7 @@ class NyaaRSSTorrent:
     category: FunCategory | FapCategory
     size: str
     published: str
-    published_parsed: time.struct_time
+    published_parsed: time.struct_time | None
     torrent_url: str | None
     magnet_link: str | None
     seeders: int
@@ -202,7 +251,7 @@ class NyaaRSSTorrent:
     total_comments: int
 
 @dataclass
-class NyaaRSSFeed:
+class NyaaRSSFeed(Serializable):
     """
     Nyaa RSS Feed.
     
@@ -210,7 +259,201 @@ class NyaaRSSFeed:
         title (str): The title of the RSS feed.
         description (str): The description of the RSS feed.
         torrents (list[NyaaRSSTorrent]): A list of torrents in the RSS feed.
+        stale (bool, optional): Whether the feed is the last known good feed, served because the site failed. Defaults to False.
     """
     title: str
     description: str
-    torrents: list[NyaaRSSTorrent]
\ No newline at end of file
+    torrents: list[NyaaRSSTorrent]
+    stale: bool = False
+
+@dataclass
+class DownloadResult(Serializable):
+    """
+    Result of a torrent file download.
+    
+    Attributes:
+        torrent (SearchResultTorrent | TorrentInfo | NyaaRSSTorrent): The torrent that was downloaded.
+        info_hash (str | None): The info hash of the torrent. None if it could not be determined.
+        status (DownloadStatus): The status of the download.
+        size (int): The number of bytes of the torrent file. 0 if not downloaded.
+        error (Exception | None, optional): The error if the download failed. Defaults to None.
+    """
+    torrent: SearchResultTorrent | TorrentInfo | NyaaRSSTorrent
+    info_hash: str | None
+    status: DownloadStatus
+    size: int
+    error: Exception | None = None
+
+@dataclass
+class ArchiveEntry:
+    """
+    Index entry of a response stored in a `PageArchive`.
+    
+    Attributes:
+        segment (str): The file name of the segment the response is stored in.
+        offset (int): The offset of the compressed record in the segment.
+        length (int): The length of the compressed record.
+        endpoint (str): The endpoint of the request, such as "search", "view" or "rss".
+        site (SITE): The site the response was scraped from.
+        base_url (str): The base URL of the client when the response was scraped.
+        url (str): The URL of the request, including its query.
+    """
+    segment: str
+    offset: int
+    length: int
+    endpoint: str
+    site: SITE
+    base_url: str
+    url: str
+
+@dataclass
+class ArchivedPage:
+    """
+    A response stored in a `PageArchive`.
+    
+    Attributes:
+        entry (ArchiveEntry): The index entry of the response.
+        archived_at (datetime): The time the response was archived, in UTC.
+        status_code (int): The HTTP status code.
+        headers (list[tuple[str, str]]): The HTTP headers.
+        body (bytes): The body, with its content encoding removed.
+    """
+    entry: ArchiveEntry
+    archived_at: datetime
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+@dataclass
+class ReplayResult:
+    """
+    Result of extracting a model from an archived response.
+    
+    Attributes:
+        entry (ArchiveEntry): The index entry of the response.
+        model (SearchResult | TorrentInfo | NyaaRSSFeed | None): The extracted model. None if extraction failed.
+        error (Exception | None, optional): The error if extraction failed. Defaults to None.
+    """
+    entry: ArchiveEntry
+    model: SearchResult | TorrentInfo | NyaaRSSFeed | None
+    error: Exception | None = None
+
+@dataclass
+class SchedulerStats:
+    """
+    Statistics of a priority class of a `RequestScheduler`.
+    
+    Attributes:
+        priority (Priority): The priority class.
+        queued (int): The number of requests waiting to be sent.
+        in_flight (int): The number of requests being sent.
+        dispatched (int): The number of requests sent so far.
+        expired (int): The number of requests whose deadline passed while queued.
+        mean_wait (float): The mean time in seconds requests waited in the queue.
+        p50_wait (float): The median time in seconds recent requests waited in the queue.
+        p99_wait (float): The 99th percentile time in seconds recent requests waited in the queue.
+        max_wait (float): The longest time in seconds a request waited in the queue.
+    """
+    priority: Priority
+    queued: int
+    in_flight: int
+    dispatched: int
+    expired: int
+    mean_wait: float
+    p50_wait: float
+    p99_wait: float
+    max_wait: float
+
+@dataclass
+class MirrorStats:
+    """
+    State of a base URL of a `MirrorPool`.
+    
+    Attributes:
+        url (str): The base URL.
+        healthy (bool): Whether requests are routed to the base URL.
+        latency (float | None): The moving average of the latency in seconds. None if not measured yet.
+        in_flight (int): The number of requests being sent to the base URL.
+        failures (int): The number of consecutive failed requests.
+    """
+    url: str
+    healthy: bool
+    latency: float | None
+    in_flight: int
+    failures: int
+
+@dataclass
+class ProxyStats:
+    """
+    State of a proxy of a `ProxyPool`.
+    
+    Attributes:
+        url (str): The URL of the proxy.
+        healthy (bool): Whether the proxy is not quarantined.
+        in_flight (int): The number of requests being sent through the proxy.
+        budget (float | None): The number of requests that can be sent through the proxy right away. None if its rate is not limited.
+        failures (int): The number of consecutive failed requests.
+        requests (int): The number of requests sent through the proxy.
+        throttled (int): The number of 403 and 429 responses received through the proxy.
+        quarantined (int): The number of times the proxy was quarantined.
+    """
+    url: str
+    healthy: bool
+    in_flight: int
+    budget: float | None
+    failures: int
+    requests: int
+    throttled: int
+    quarantined: int
+
+@dataclass
+class CircuitStats:
+    """
+    State of a circuit of a `CircuitBreaker`.
+    
+    Attributes:
+        name (str): The name of the circuit, the site and endpoint of its requests, such as "fun.search".
+        state (CircuitState): The state of the circuit.
+        failures (int): The number of consecutive failed requests.
+        opened (int): The number of times the circuit opened.
+        rejected (int): The number of requests failed fast while the circuit was open.
+    """
+    name: str
+    state: CircuitState
+    failures: int
+    opened: int
+    rejected: int
+
+@dataclass
+class StatsSnapshot:
+    """
+    Seeders, leechers and completed count of a torrent at a time, from a `StatsHistory`.
+    
+    Attributes:
+        timestamp (datetime): The start of the time bucket the counts were observed in, in UTC.
+        seeders (int): The number of seeders of the torrent.
+        leechers (int): The number of leechers of the torrent.
+        completed (int): The number of times the torrent has been completed.
+    """
+    timestamp: datetime
+    seeders: int
+    leechers: int
+    completed: int
+
+@dataclass
+class TrendingTorrent:
+    """
+    A torrent ranked by how many times it was completed over a period, from a `StatsHistory`.
+    
+    Attributes:
+        view_id (int): The View-ID of the torrent.
+        completed_delta (int): The number of times the torrent was completed over the period.
+        seeders (int): The latest number of seeders of the torrent.
+        leechers (int): The latest number of leechers of the torrent.
+        completed (int): The latest number of times the torrent has been completed.
+    """
+    view_id: int
+    completed_delta: int
+    seeders: int
+    leechers: int
+    completed: int
\ No newline at end of file
@@ -1,51 +1,23 @@
-from typing import Self
+from typing import AsyncIterator, Iterable, Self
+import asyncio
+import time
 
 import httpx
-import feedparser
 
-from .enums import SITE, QualityFilter, FunCategory, FapCategory, TorrentType
+from .base import BaseClient
+from .dedup import DedupIndex
+from .exceptions import CircuitOpenError, DeadlineExceededError
+from .enums import QualityFilter, FunCategory, FapCategory, Priority, SITE
 from .utils.categories import get_category_by_id
+from .parsers import parse_rss, extract_feed
 
 from .models import NyaaRSSFeed, NyaaRSSTorrent
 
-class NyaaRSSClient:
-    DEFAULT_SITE: SITE = SITE.FUN
-    TIMEOUT: int = 30
-    
-    def __init__(self: Self, site: SITE = DEFAULT_SITE, timeout: int = TIMEOUT) -> None:
-        """
-        Initialize rss client.
-        
-        Parameters:
-            site (SITE, optional): The site to fetch from. Defaults to DEFAULT_SITE.
-            timeout (int, optional): The timeout for HTTP requests. Defaults to TIMEOUT.
-        """
-        self._site = site
-        self.base_url = site.value
-        self.timeout = timeout
-        
-        self._http_client: httpx.AsyncClient = httpx.AsyncClient(timeout=self.timeout)
-    
-    @property
-    def site(self: Self) -> SITE:
-        """
-        Getter property for the current site of the client.
-        
-        Returns:
-            SITE: The current site used by the client.
-        """
-        return self._site
-    
-    @site.setter
-    def site(self: Self, new_site: SITE) -> None:
-        """
-        Set the site to fetch from.
-        
-        Parameters:
-            new_site (SITE): The new site to set.
-        """
-        self._site = new_site
-        self.base_url = new_site.value
+class NyaaRSSClient(BaseClient):
+    """
+    RSS client.
+    """
+    WATCH_INTERVAL: float = 60.0
     
     async def get_feed(
         self: Self,
@@ -53,7 +25,10 @@ class NyaaRSSClient:
         username: str | None = None,
         quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
         category: FunCategory | FapCategory | int | None = None,
-        magnet_only: bool | None = None
+        magnet_only: bool | None = None,
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None,
+        site: SITE | None = None
         ) -> NyaaRSSFeed:
         """
         Parameters:
@@ -62,15 +37,21 @@ class NyaaRSSClient:
             quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
             category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
             magnet_only (bool | None, optional): Retrieve only magnet links. Defaults to None.
+            priority (Priority, optional): The priority of the request if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the response must be received. If None, there is no deadline. Defaults to None.
+            site (SITE | None, optional): The site of the feed. If None, the site of the client. Defaults to None.
         
         Raises:
             httpx.HTTPError: If an HTTP-related error occurs during the request.
+            DeadlineExceededError: If the deadline passes before the response is received.
+            CircuitOpenError: If the circuit of the endpoint is open and no stale result is cached.
         
         Returns:
             NyaaRSSFeed: RSS feed.
         """
+        site, base_url = self._resolve_site(site)
         if category is None:
-            category = get_category_by_id(self.site, "0_0")
+            category = get_category_by_id(site, "0_0")
         
         params = {
             "page": "rss",
@@ -81,44 +62,131 @@ class NyaaRSSClient:
             "magnets": "" if magnet_only else None
         }
         
-        response: httpx.Response = await self._http_client.get(self.base_url, params={k: v for k, v in params.items() if v is not None})
-        response.raise_for_status()
+        response: httpx.Response = await self._get(
+            "rss",
+            base_url,
+            params={k: v for k, v in params.items() if v is not None},
+            priority=priority,
+            deadline=deadline,
+            site=site
+            )
+        
+        feed: NyaaRSSFeed = self._parse(
+            "rss",
+            response.content,
+            lambda: parse_rss(response.text),
+            lambda parsed_feed: extract_feed(parsed_feed, site, bool(magnet_only)),
+            memo_kind="rss-magnet" if magnet_only else "rss",
+            base_url=base_url
+            )
+        feed = self._mark_stale(response, feed)
+        self.metrics.count("rss", "rows", len(feed.torrents))
+        return feed
+    
+    async def get_feeds(
+        self: Self,
+        term: str | None = None,
+        username: str | None = None,
+        quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
+        magnet_only: bool | None = None,
+        sites: Iterable[SITE] = tuple(SITE),
+        priority: Priority = Priority.NORMAL,
+        deadline: float | None = None
+        ) -> dict[SITE, NyaaRSSFeed]:
+        """
+        Get the feeds of several sites concurrently.
         
-        parsed_feed = feedparser.parse(response.text)
+        The categories differ between sites, so every feed is of all categories.
+        The torrents of each feed keep the site they were found on.
         
-        torrents: list[NyaaRSSTorrent] = []
-        for entry in parsed_feed.entries:
-            torrent_type = TorrentType.NORMAL
-            if entry.nyaa_trusted.lower() == "yes":
-                torrent_type = TorrentType.TRUSTED
-            elif entry.nyaa_remake.lower() == "yes":
-                torrent_type = TorrentType.REMAKE
-            
-            view_id = int(entry.guid.split("/view/")[-1])
-            category = get_category_by_id(site=self.site, category_id=entry.nyaa_categoryid)
-            
-            torrents.append(
-                NyaaRSSTorrent(
-                    torrent_type=torrent_type,
-                    view_id=view_id,
-                    name=entry.title,
-                    category=category,
-                    size=entry.nyaa_size,
-                    published=entry.published,
-                    published_parsed=entry.published_parsed,
-                    torrent_url=entry.link if not magnet_only else None,
-                    magnet_link=entry.link if magnet_only else None,
-                    seeders=int(entry.nyaa_seeders),
-                    leechers=int(entry.nyaa_leechers),
-                    completed=int(entry.nyaa_downloads),
-                    info_hash=entry.nyaa_infohash,
-                    description=entry.description,
-                    total_comments=int(entry.nyaa_comments)
-                    )
+        Parameters:
+            term (str | None, optional): Search term. Defaults to None.
+            username (str | None, optional): Search torrents of a user. Defaults to None.
+            quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
+            magnet_only (bool | None, optional): Retrieve only magnet links. Defaults to None.
+            sites (Iterable[SITE], optional): The sites to get the feeds of. Defaults to every site.
+            priority (Priority, optional): The priority of the requests if the client has a scheduler. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which every response must be received. If None, there is no deadline. Defaults to None.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during a request.
+            DeadlineExceededError: If the deadline passes before a response is received.
+            CircuitOpenError: If the circuit of the endpoint is open and no stale result is cached.
+        
+        Returns:
+            dict[SITE, NyaaRSSFeed]: The feed of each site.
+        """
+        sites = list(dict.fromkeys(sites))
+        feeds: list[NyaaRSSFeed] = await asyncio.gather(*(
+            self.get_feed(
+                term=term,
+                username=username,
+                quality_filter=quality_filter,
+                magnet_only=magnet_only,
+                priority=priority,
+                deadline=deadline,
+                site=site
                 )
+            for site in sites
+        ))
+        return dict(zip(sites, feeds))
+    
+    async def watch(
+        self: Self,
+        term: str | None = None,
+        username: str | None = None,
+        quality_filter: QualityFilter | int = QualityFilter.NO_FILTER,
+        category: FunCategory | FapCategory | int | None = None,
+        magnet_only: bool | None = None,
+        interval: float = WATCH_INTERVAL,
+        dedup: DedupIndex | None = None,
+        priority: Priority = Priority.NORMAL,
+        site: SITE | None = None
+        ) -> AsyncIterator[NyaaRSSTorrent]:
+        """
+        Poll a feed and yield its new torrents, until the iteration is stopped.
+        
+        Each poll must finish before the next one is due. Polls that fail, time out, hit an open circuit or
+        return a stale feed are skipped, so the watch outlives site outages.
+        
+        Parameters:
+            term (str | None, optional): Search term. Defaults to None.
+            username (str | None, optional): Search torrents of a user. Defaults to None.
+            quality_filter (QualityFilter | int | None, optional): Filter torrents by quality. If not specified, defaults to QualityFilter.NO_FILTER.
+            category (FunCategory | FapCategory | int | None, optional): Filter torrents by category. If None, a default category is used. Defaults to None.
+            magnet_only (bool | None, optional): Retrieve only magnet links. Defaults to None.
+            interval (float, optional): The seconds between the start of two polls. Defaults to WATCH_INTERVAL.
+            dedup (DedupIndex | None, optional): Index of the torrents seen before, to skip them. The yielded torrents are added to it.
+                Pass a loaded index to resume a watch after a restart. If None, a new index is used, and every torrent of the first poll is yielded. Defaults to None.
+            priority (Priority, optional): The priority of the requests if the client has a scheduler. Defaults to Priority.NORMAL.
+            site (SITE | None, optional): The site of the feed. If None, the site of the client. Defaults to None.
+        
+        Yields:
+            NyaaRSSTorrent: The torrents not seen before, oldest first within each poll.
+        """
+        if dedup is None:
+            dedup = DedupIndex()
         
-        return NyaaRSSFeed(
-            title=parsed_feed.feed.title,
-            description=parsed_feed.feed.description,
-            torrents=torrents
-            )
\ No newline at end of file
+        while True:
+            started: float = time.monotonic()
+            try:
+                feed: NyaaRSSFeed = await self.get_feed(
+                    term=term,
+                    username=username,
+                    quality_filter=quality_filter,
+                    category=category,
+                    magnet_only=magnet_only,
+                    priority=priority,
+                    deadline=started + interval,
+                    site=site
+                    )
+            except (httpx.HTTPError, CircuitOpenError, DeadlineExceededError):
+                pass
+            else:
+                if not feed.stale:
+                    # Feeds list the newest torrents first.
+                    for torrent in reversed(feed.torrents):
+                        if dedup.add(torrent):
+                            yield torrent
+            
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
\ No newline at end of file
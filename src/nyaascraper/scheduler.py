@@ -0,0 +1,313 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Self
+import asyncio
+import math
+import time
+
+from .enums import Priority
+from .exceptions import DeadlineExceededError
+from .models import SchedulerStats
+
+class _Waiter:
+    """
+    A queued request.
+    """
+    __slots__ = ("future", "priority", "enqueued_at", "tag", "expiry")
+    
+    def __init__(self: Self, future: asyncio.Future, priority: Priority, enqueued_at: float, tag: float) -> None:
+        self.future = future
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        self.tag = tag
+        self.expiry: asyncio.TimerHandle | None = None
+
+class _ClassState:
+    """
+    Queue and statistics of a priority class.
+    """
+    __slots__ = ("queue", "weight", "last_tag", "in_flight", "dispatched", "expired", "total_wait", "max_wait", "waits")
+    
+    def __init__(self: Self, weight: float, wait_samples: int) -> None:
+        self.queue: deque[_Waiter] = deque()
+        self.weight = weight
+        self.last_tag: float = 0.0
+        self.in_flight: int = 0
+        self.dispatched: int = 0
+        self.expired: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+        self.waits: deque[float] = deque(maxlen=wait_samples)
+
+class RequestScheduler:
+    """
+    Schedules the requests of a client over one concurrency limit and one rate limit.
+    
+    `Priority.INTERACTIVE` requests are sent before any queued request of the other classes, so a crawl saturating the client
+    does not delay user-facing requests by more than the time it takes for a request to finish. The other classes share the
+    remaining capacity by weighted fair queuing: with the default weights, `Priority.NORMAL` gets four requests for each
+    `Priority.BACKGROUND` request while both are queued, and either gets all the capacity while the other is idle.
+    
+    `max_concurrency` should not exceed the connection limit of the HTTP client (100 by default),
+    so requests wait in the scheduler, in priority order, rather than in the connection pool.
+    One scheduler can be shared by several clients to share the limits.
+    """
+    MAX_CONCURRENCY: int = 10
+    BURST: int = 10
+    WEIGHTS: dict[Priority, float] = {Priority.NORMAL: 4.0, Priority.BACKGROUND: 1.0}
+    WAIT_SAMPLES: int = 1000
+    
+    def __init__(
+        self: Self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        rate: float | None = None,
+        burst: int = BURST,
+        weights: dict[Priority, float] | None = None,
+        wait_samples: int = WAIT_SAMPLES
+        ) -> None:
+        """
+        Initialize request scheduler.
+        
+        Parameters:
+            max_concurrency (int, optional): The maximum number of requests being sent at a time. Defaults to MAX_CONCURRENCY.
+            rate (float | None, optional): The maximum number of requests sent per second. If None, the rate is not limited. Defaults to None.
+            burst (int, optional): The number of requests that can be sent at once before the rate limit applies. Defaults to BURST.
+            weights (dict[Priority, float] | None, optional): The weights of the non-interactive classes. If None, WEIGHTS is used. Defaults to None.
+            wait_samples (int, optional): The number of most recent queue waits kept per class for percentiles. Defaults to WAIT_SAMPLES.
+        """
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        
+        weights = {**self.WEIGHTS, **(weights or {})}
+        self._classes: dict[Priority, _ClassState] = {
+            priority: _ClassState(weights.get(priority, 1.0), wait_samples) for priority in Priority
+        }
+        self._in_flight: int = 0
+        self._virtual_time: float = 0.0
+        
+        self._tokens: float = float(burst)
+        self._refilled_at: float = time.monotonic()
+        self._timer: asyncio.TimerHandle | None = None
+    
+    @property
+    def queued(self: Self) -> int:
+        """
+        Getter property for the number of requests waiting to be sent.
+        
+        Returns:
+            int: The number of queued requests of every class.
+        """
+        return sum(len(state.queue) for state in self._classes.values())
+    
+    @asynccontextmanager
+    async def slot(self: Self, priority: Priority = Priority.NORMAL, deadline: float | None = None) -> AsyncIterator[None]:
+        """
+        Wait for the turn of a request, and hold its slot while it is sent.
+        
+        Parameters:
+            priority (Priority, optional): The priority class of the request. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the request must be sent. If None, the request waits as long as needed. Defaults to None.
+        
+        Raises:
+            DeadlineExceededError: If the deadline passes before the request is sent.
+        """
+        await self.acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self.release(priority)
+    
+    async def acquire(self: Self, priority: Priority = Priority.NORMAL, deadline: float | None = None) -> None:
+        """
+        Wait for the turn of a request. Each call must be followed by a call to `release`.
+        
+        Parameters:
+            priority (Priority, optional): The priority class of the request. Defaults to Priority.NORMAL.
+            deadline (float | None, optional): The `time.monotonic()` time by which the request must be sent. If None, the request waits as long as needed. Defaults to None.
+        
+        Raises:
+            DeadlineExceededError: If the deadline passes before the request is sent.
+        """
+        state: _ClassState = self._classes[priority]
+        now: float = time.monotonic()
+        if deadline is not None and now >= deadline:
+            state.expired += 1
+            raise DeadlineExceededError("Deadline passed before the request was queued")
+        
+        self.__refill(now)
+        if self.queued == 0 and self._in_flight < self.max_concurrency and (self.rate is None or self._tokens >= 1):
+            # Nothing to be fair to.
+            self.__grant(state, now, now)
+            return
+        
+        tag: float = 0.0
+        if priority is not Priority.INTERACTIVE:
+            # Start-time fair queuing: each request of a class advances its tag by the inverse of the weight of the class.
+            tag = max(self._virtual_time, state.last_tag) + 1 / state.weight
+            state.last_tag = tag
+        
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), priority, now, tag)
+        if deadline is not None:
+            # The event loop clock is `time.monotonic()`.
+            waiter.expiry = loop.call_later(deadline - now, self.__expire, waiter)
+        state.queue.append(waiter)
+        self.__dispatch()
+        
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                # Granted just as the caller was cancelled.
+                self.release(priority)
+            else:
+                self.__remove(waiter)
+            raise
+    
+    def release(self: Self, priority: Priority = Priority.NORMAL) -> None:
+        """
+        Release the slot of a sent request.
+        
+        Parameters:
+            priority (Priority, optional): The priority class of the request. Defaults to Priority.NORMAL.
+        """
+        self._in_flight -= 1
+        self._classes[priority].in_flight -= 1
+        self.__dispatch()
+    
+    def stats(self: Self) -> dict[Priority, SchedulerStats]:
+        """
+        Get the queue depth and wait times of each priority class.
+        
+        Returns:
+            dict[Priority, SchedulerStats]: The statistics of each priority class.
+        """
+        stats: dict[Priority, SchedulerStats] = {}
+        for priority, state in self._classes.items():
+            waits: list[float] = sorted(state.waits)
+            stats[priority] = SchedulerStats(
+                priority=priority,
+                queued=len(state.queue),
+                in_flight=state.in_flight,
+                dispatched=state.dispatched,
+                expired=state.expired,
+                mean_wait=state.total_wait / state.dispatched if state.dispatched else 0.0,
+                p50_wait=self.__percentile(waits, 50),
+                p99_wait=self.__percentile(waits, 99),
+                max_wait=state.max_wait
+                )
+        return stats
+    
+    def __dispatch(self: Self) -> None:
+        """
+        Grant slots to queued requests while there is capacity.
+        """
+        now: float = time.monotonic()
+        self.__refill(now)
+        while self._in_flight < self.max_concurrency:
+            if (waiter := self.__next_waiter()) is None:
+                return
+            
+            state: _ClassState = self._classes[waiter.priority]
+            if waiter.future.done():
+                # Cancelled, and not removed from its queue yet since the caller has not run since.
+                self.__remove(waiter)
+                continue
+            
+            if self.rate is not None and self._tokens < 1:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later((1 - self._tokens) / self.rate, self.__on_timer)
+                return
+            
+            state.queue.popleft()
+            if waiter.expiry is not None:
+                waiter.expiry.cancel()
+            if waiter.priority is not Priority.INTERACTIVE:
+                self._virtual_time = waiter.tag
+            
+            # Granted only once the request is woken up, so a slot is never taken for a request that will not release it.
+            waiter.future.set_result(None)
+            self.__grant(state, waiter.enqueued_at, now)
+    
+    def __next_waiter(self: Self) -> _Waiter | None:
+        """
+        Get the queued request to send next, without removing it.
+        
+        Returns:
+            _Waiter | None: The request, or None if no request is queued.
+        """
+        if (interactive := self._classes[Priority.INTERACTIVE].queue):
+            return interactive[0]
+        
+        heads: list[_Waiter] = [state.queue[0] for priority, state in self._classes.items() if priority is not Priority.INTERACTIVE and state.queue]
+        return min(heads, key=lambda waiter: waiter.tag, default=None)
+    
+    def __grant(self: Self, state: _ClassState, enqueued_at: float, now: float) -> None:
+        """
+        Take a slot and a token for a request, and record its wait.
+        
+        Parameters:
+            state (_ClassState): The class of the request.
+            enqueued_at (float): The time the request was queued.
+            now (float): The current time.
+        """
+        if self.rate is not None:
+            self._tokens -= 1
+        self._in_flight += 1
+        state.in_flight += 1
+        state.dispatched += 1
+        
+        wait: float = now - enqueued_at
+        state.total_wait += wait
+        state.max_wait = max(state.max_wait, wait)
+        state.waits.append(wait)
+    
+    def __expire(self: Self, waiter: _Waiter) -> None:
+        """
+        Fail a queued request whose deadline passed.
+        
+        Parameters:
+            waiter (_Waiter): The request.
+        """
+        if waiter.future.done():
+            return
+        
+        self.__remove(waiter)
+        self._classes[waiter.priority].expired += 1
+        waiter.future.set_exception(DeadlineExceededError("Deadline passed before the request was sent"))
+    
+    def __remove(self: Self, waiter: _Waiter) -> None:
+        """
+        Remove a request from its queue.
+        
+        Parameters:
+            waiter (_Waiter): The request.
+        """
+        if waiter.expiry is not None:
+            waiter.expiry.cancel()
+        try:
+            self._classes[waiter.priority].queue.remove(waiter)
+        except ValueError:
+            pass
+    
+    def __refill(self: Self, now: float) -> None:
+        """
+        Add the tokens of the time elapsed since the last refill.
+        
+        Parameters:
+            now (float): The current time.
+        """
+        if self.rate is not None:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+    
+    def __on_timer(self: Self) -> None:
+        self._timer = None
+        self.__dispatch()
+    
+    @staticmethod
+    def __percentile(ordered: list[float], percent: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))]
\ No newline at end of file
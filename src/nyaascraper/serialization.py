@@ -0,0 +1,423 @@
+"""
+Compact binary codecs of the models.
+
+A serialized model is a 5-byte header followed by a JSON or MessagePack payload:
+    
+    magic (2 bytes) | schema version (1 byte) | format (1 byte) | model tag (1 byte) | payload
+
+Models are encoded as positional arrays rather than objects, enums as small integer codes,
+and `datetime`/`time.struct_time` as Unix timestamps in seconds, or null if missing. Decoders are kept
+for every schema version, so data serialized by an older release can still be read after upgrading.
+
+Schema versions:
+    1: Initial version.
+    2: The `stale` flag of search results, torrent information and RSS feeds is appended to their arrays.
+"""
+from datetime import datetime
+from typing import Any, Callable
+import calendar
+import json
+import struct
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from .enums import FunCategory, FapCategory, TorrentType, UserLevel, DownloadStatus, SerializationFormat
+from .exceptions import SerializationError
+from .models import (
+    SearchResultTorrent,
+    SearchResult,
+    User,
+    File,
+    Folder,
+    Comment,
+    TorrentInfo,
+    NyaaRSSTorrent,
+    NyaaRSSFeed,
+    DownloadResult
+    )
+
+MAGIC: bytes = b"NS"
+SCHEMA_VERSION: int = 2
+
+HEADER: struct.Struct = struct.Struct("!2sBBB")
+
+Model = SearchResultTorrent | SearchResult | User | File | Folder | Comment | TorrentInfo | NyaaRSSTorrent | NyaaRSSFeed | DownloadResult
+
+_FORMAT_CODES: dict[SerializationFormat, int] = {SerializationFormat.JSON: 0, SerializationFormat.MSGPACK: 1}
+_FORMATS: dict[int, SerializationFormat] = {code: format for format, code in _FORMAT_CODES.items()}
+
+# Enum codes are positions in these tuples, so new members must only ever be appended.
+_TORRENT_TYPES: tuple[TorrentType, ...] = (TorrentType.NORMAL, TorrentType.TRUSTED, TorrentType.REMAKE)
+_USER_LEVELS: tuple[UserLevel, ...] = (UserLevel.REGULAR, UserLevel.TRUSTED, UserLevel.MODERATOR, UserLevel.ADMINISTRATOR)
+_DOWNLOAD_STATUSES: tuple[DownloadStatus, ...] = (DownloadStatus.DOWNLOADED, DownloadStatus.SKIPPED, DownloadStatus.FAILED)
+
+_TORRENT_TYPE_CODES: dict[TorrentType, int] = {member: code for code, member in enumerate(_TORRENT_TYPES)}
+_USER_LEVEL_CODES: dict[UserLevel, int] = {member: code for code, member in enumerate(_USER_LEVELS)}
+_DOWNLOAD_STATUS_CODES: dict[DownloadStatus, int] = {member: code for code, member in enumerate(_DOWNLOAD_STATUSES)}
+
+def _category_code(category: FunCategory | FapCategory) -> int:
+    # "<main>_<sub>" packed as (main << 4 | sub) << 1, with the lowest bit set for SITE.FAP categories.
+    main, sub = category.value.split("_")
+    return (int(main) << 4 | int(sub)) << 1 | (category.__class__ is FapCategory)
+
+_CATEGORY_CODES: dict[FunCategory | FapCategory, int] = {
+    category: _category_code(category) for category in (*FunCategory, *FapCategory)
+}
+_CATEGORIES: dict[int, FunCategory | FapCategory] = {code: category for category, code in _CATEGORY_CODES.items()}
+
+def _encode_datetime(value: datetime) -> int:
+    # Timestamps are parsed as naive UTC datetimes with a resolution of seconds.
+    return calendar.timegm(value.utctimetuple())
+
+def _decode_datetime(value: int) -> datetime:
+    return datetime.utcfromtimestamp(value)
+
+def _encode_user(user: User | None) -> list | None:
+    if user is None:
+        return None
+    return [
+        user.username,
+        user.profile_url,
+        user.photo_url,
+        None if user.user_level is None else _USER_LEVEL_CODES[user.user_level],
+        user.is_banned
+    ]
+
+def _decode_user(value: list | None) -> User | None:
+    if value is None:
+        return None
+    return User(value[0], value[1], value[2], None if value[3] is None else _USER_LEVELS[value[3]], value[4])
+
+def _encode_files(files: list[File | Folder]) -> list:
+    # Files are [name, size] and folders [name, [children]], told apart by the type of their second item.
+    return [[file.name, _encode_files(file.files)] if isinstance(file, Folder) else [file.name, file.size] for file in files]
+
+def _decode_files(value: list) -> list[File | Folder]:
+    return [Folder(name, _decode_files(item)) if isinstance(item, list) else File(name, item) for name, item in value]
+
+def _encode_file(file: File) -> list:
+    return [file.name, file.size]
+
+def _decode_file(value: list) -> File:
+    return File(value[0], value[1])
+
+def _encode_folder(folder: Folder) -> list:
+    return [folder.name, _encode_files(folder.files)]
+
+def _decode_folder(value: list) -> Folder:
+    return Folder(value[0], _decode_files(value[1]))
+
+def _encode_comment(comment: Comment) -> list:
+    return [comment.id, _encode_user(comment.user), comment.is_uploader, _encode_datetime(comment.timestamp), comment.text]
+
+def _decode_comment(value: list) -> Comment:
+    return Comment(value[0], _decode_user(value[1]), value[2], _decode_datetime(value[3]), value[4])
+
+def _encode_search_result_torrent(torrent: SearchResultTorrent) -> list:
+    return [
+        _TORRENT_TYPE_CODES[torrent.torrent_type],
+        torrent.view_id,
+        torrent.name,
+        _CATEGORY_CODES[torrent.category],
+        torrent.category_icon_url,
+        torrent.torrent_url,
+        torrent.magnet_link,
+        torrent.size,
+        _encode_datetime(torrent.timestamp),
+        torrent.seeders,
+        torrent.leechers,
+        torrent.completed,
+        torrent.total_comments
+    ]
+
+def _decode_search_result_torrent(value: list) -> SearchResultTorrent:
+    return SearchResultTorrent(
+        _TORRENT_TYPES[value[0]],
+        value[1],
+        value[2],
+        _CATEGORIES[value[3]],
+        value[4],
+        value[5],
+        value[6],
+        value[7],
+        _decode_datetime(value[8]),
+        value[9],
+        value[10],
+        value[11],
+        value[12]
+        )
+
+def _encode_search_result(result: SearchResult) -> list:
+    return [
+        [_encode_search_result_torrent(torrent) for torrent in result.torrents],
+        result.displaying_from,
+        result.displaying_to,
+        result.total_results,
+        result.current_page,
+        result.previous_page,
+        result.next_page,
+        result.available_pages,
+        result.stale
+    ]
+
+def _decode_search_result_v1(value: list) -> SearchResult:
+    return SearchResult([_decode_search_result_torrent(torrent) for torrent in value[0]], *value[1:8])
+
+def _decode_search_result(value: list) -> SearchResult:
+    return SearchResult([_decode_search_result_torrent(torrent) for torrent in value[0]], *value[1:9])
+
+def _encode_torrent_info(info: TorrentInfo) -> list:
+    return [
+        info.name,
+        _CATEGORY_CODES[info.category],
+        info.torrent_url,
+        info.magnet_link,
+        info.size,
+        _encode_datetime(info.timestamp),
+        info.seeders,
+        info.leechers,
+        info.completed,
+        info.info_hash,
+        _encode_user(info.submitter),
+        info.information,
+        info.description,
+        _encode_files(info.files),
+        info.total_comments,
+        [_encode_comment(comment) for comment in info.comments],
+        info.stale
+    ]
+
+def _decode_torrent_info_v1(value: list) -> TorrentInfo:
+    return TorrentInfo(
+        value[0],
+        _CATEGORIES[value[1]],
+        value[2],
+        value[3],
+        value[4],
+        _decode_datetime(value[5]),
+        value[6],
+        value[7],
+        value[8],
+        value[9],
+        _decode_user(value[10]),
+        value[11],
+        value[12],
+        _decode_files(value[13]),
+        value[14],
+        [_decode_comment(comment) for comment in value[15]]
+        )
+
+def _decode_torrent_info(value: list) -> TorrentInfo:
+    info: TorrentInfo = _decode_torrent_info_v1(value)
+    info.stale = value[16]
+    return info
+
+def _encode_rss_torrent(torrent: NyaaRSSTorrent) -> list:
+    return [
+        _TORRENT_TYPE_CODES[torrent.torrent_type],
+        torrent.view_id,
+        torrent.name,
+        _CATEGORY_CODES[torrent.category],
+        torrent.size,
+        torrent.published,
+        None if torrent.published_parsed is None else calendar.timegm(torrent.published_parsed),
+        torrent.torrent_url,
+        torrent.magnet_link,
+        torrent.seeders,
+        torrent.leechers,
+        torrent.completed,
+        torrent.info_hash,
+        torrent.description,
+        torrent.total_comments
+    ]
+
+def _decode_rss_torrent(value: list) -> NyaaRSSTorrent:
+    return NyaaRSSTorrent(
+        _TORRENT_TYPES[value[0]],
+        value[1],
+        value[2],
+        _CATEGORIES[value[3]],
+        value[4],
+        value[5],
+        None if value[6] is None else time.gmtime(value[6]),
+        value[7],
+        value[8],
+        value[9],
+        value[10],
+        value[11],
+        value[12],
+        value[13],
+        value[14]
+        )
+
+def _encode_rss_feed(feed: NyaaRSSFeed) -> list:
+    return [feed.title, feed.description, [_encode_rss_torrent(torrent) for torrent in feed.torrents], feed.stale]
+
+def _decode_rss_feed_v1(value: list) -> NyaaRSSFeed:
+    return NyaaRSSFeed(value[0], value[1], [_decode_rss_torrent(torrent) for torrent in value[2]])
+
+def _decode_rss_feed(value: list) -> NyaaRSSFeed:
+    return NyaaRSSFeed(value[0], value[1], [_decode_rss_torrent(torrent) for torrent in value[2]], value[3])
+
+# Tags of the models that can be the torrent of a download result, and their decoders for each schema version.
+_DOWNLOAD_TORRENT_TAGS: dict[type, int] = {SearchResultTorrent: 0, TorrentInfo: 6, NyaaRSSTorrent: 7}
+_DOWNLOAD_TORRENT_DECODERS_V1: dict[int, Callable[[list], SearchResultTorrent | TorrentInfo | NyaaRSSTorrent]] = {
+    0: _decode_search_result_torrent,
+    6: _decode_torrent_info_v1,
+    7: _decode_rss_torrent
+}
+_DOWNLOAD_TORRENT_DECODERS: dict[int, Callable[[list], SearchResultTorrent | TorrentInfo | NyaaRSSTorrent]] = {
+    0: _decode_search_result_torrent,
+    6: _decode_torrent_info,
+    7: _decode_rss_torrent
+}
+
+def _encode_download_result(result: DownloadResult) -> list:
+    tag: int = _DOWNLOAD_TORRENT_TAGS[type(result.torrent)]
+    return [
+        tag,
+        _ENCODERS[tag][1](result.torrent),
+        result.info_hash,
+        _DOWNLOAD_STATUS_CODES[result.status],
+        result.size,
+        None if result.error is None else [type(result.error).__name__, str(result.error)]
+    ]
+
+def _decode_download_result(
+    value: list,
+    torrent_decoders: dict[int, Callable[[list], SearchResultTorrent | TorrentInfo | NyaaRSSTorrent]] = _DOWNLOAD_TORRENT_DECODERS
+    ) -> DownloadResult:
+    # Exception types cannot be restored in general, so errors are decoded as plain exceptions with their message.
+    return DownloadResult(
+        torrent_decoders[value[0]](value[1]),
+        value[2],
+        _DOWNLOAD_STATUSES[value[3]],
+        value[4],
+        None if value[5] is None else Exception(f"{value[5][0]}: {value[5][1]}")
+        )
+
+def _decode_download_result_v1(value: list) -> DownloadResult:
+    return _decode_download_result(value, _DOWNLOAD_TORRENT_DECODERS_V1)
+
+# Model tags must never be reused for another model.
+_ENCODERS: dict[int, tuple[type, Callable[[Any], list]]] = {
+    0: (SearchResultTorrent, _encode_search_result_torrent),
+    1: (SearchResult, _encode_search_result),
+    2: (User, _encode_user),
+    3: (File, _encode_file),
+    4: (Folder, _encode_folder),
+    5: (Comment, _encode_comment),
+    6: (TorrentInfo, _encode_torrent_info),
+    7: (NyaaRSSTorrent, _encode_rss_torrent),
+    8: (NyaaRSSFeed, _encode_rss_feed),
+    9: (DownloadResult, _encode_download_result)
+}
+_TAGS: dict[type, int] = {model_class: tag for tag, (model_class, _) in _ENCODERS.items()}
+
+# Decoders of each schema version. When the schema changes, the decoders of the previous version are kept here.
+_DECODERS: dict[int, dict[int, Callable[[Any], Model]]] = {
+    1: {
+        0: _decode_search_result_torrent,
+        1: _decode_search_result_v1,
+        2: _decode_user,
+        3: _decode_file,
+        4: _decode_folder,
+        5: _decode_comment,
+        6: _decode_torrent_info_v1,
+        7: _decode_rss_torrent,
+        8: _decode_rss_feed_v1,
+        9: _decode_download_result_v1
+    },
+    2: {
+        0: _decode_search_result_torrent,
+        1: _decode_search_result,
+        2: _decode_user,
+        3: _decode_file,
+        4: _decode_folder,
+        5: _decode_comment,
+        6: _decode_torrent_info,
+        7: _decode_rss_torrent,
+        8: _decode_rss_feed,
+        9: _decode_download_result
+    }
+}
+
+def _dump_payload(payload: list, format: SerializationFormat) -> bytes:
+    if format is SerializationFormat.MSGPACK:
+        if msgpack is None:
+            raise ImportError("msgpack is required to serialize to MessagePack: pip install msgpack")
+        return msgpack.packb(payload, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+def _load_payload(data: memoryview, format: SerializationFormat) -> Any:
+    if format is SerializationFormat.MSGPACK:
+        if msgpack is None:
+            raise ImportError("msgpack is required to deserialize MessagePack: pip install msgpack")
+        return msgpack.unpackb(data, raw=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+def to_bytes(model: Model, format: SerializationFormat = SerializationFormat.JSON) -> bytes:
+    """
+    Serialize a model.
+    
+    Parameters:
+        model (Model): The model.
+        format (SerializationFormat, optional): The format of the payload. Defaults to SerializationFormat.JSON.
+    
+    Raises:
+        TypeError: If the object is not a model.
+        ImportError: If the format requires a package that is not installed.
+    
+    Returns:
+        bytes: The serialized model.
+    """
+    if (tag := _TAGS.get(type(model))) is None:
+        raise TypeError(f"Cannot serialize object of type {type(model).__name__}")
+    
+    header: bytes = HEADER.pack(MAGIC, SCHEMA_VERSION, _FORMAT_CODES[format], tag)
+    return header + _dump_payload(_ENCODERS[tag][1](model), format)
+
+def from_bytes(data: bytes) -> Model:
+    """
+    Deserialize a model serialized by `to_bytes`, with the current or any previous schema version.
+    
+    Parameters:
+        data (bytes): The serialized model.
+    
+    Raises:
+        SerializationError: If the data is not a serialized model, or its schema version is unknown.
+        ImportError: If the format requires a package that is not installed.
+    
+    Returns:
+        Model: The model.
+    """
+    if len(data) < HEADER.size:
+        raise SerializationError("Data is shorter than the header")
+    
+    magic, version, format_code, tag = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SerializationError("Data is not a serialized model")
+    if (decoders := _DECODERS.get(version)) is None:
+        raise SerializationError(f"Unknown schema version: {version}")
+    if (format := _FORMATS.get(format_code)) is None:
+        raise SerializationError(f"Unknown format: {format_code}")
+    if (decode := decoders.get(tag)) is None:
+        raise SerializationError(f"Unknown model tag: {tag}")
+    
+    try:
+        return decode(_load_payload(memoryview(data)[HEADER.size:], format))
+    except (ValueError, TypeError, IndexError, KeyError) as e:
+        raise SerializationError(f"Invalid payload: {e}") from e
\ No newline at end of file
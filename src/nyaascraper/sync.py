@@ -0,0 +1,404 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, Iterable, Iterator, Self, TypeVar
+import asyncio
+import threading
+
+from .base import BaseClient
+from .client import NyaaClient
+from .enums import SITE
+from .rss import NyaaRSSClient
+
+from .models import (
+    SearchResult,
+    SearchResultTorrent,
+    TorrentInfo,
+    NyaaRSSFeed,
+    NyaaRSSTorrent,
+    DownloadResult
+    )
+
+T = TypeVar("T")
+
+class _EventLoopThread:
+    """
+    Event loop running in a daemon thread, which blocking code hands coroutines to.
+    """
+    def __init__(self: Self, name: str) -> None:
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.stopped: bool = False
+        # Held while handing a coroutine to the event loop, so it is not stopped in between.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self._thread.start()
+    
+    def run(self: Self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine on the event loop and wait for its result. Can be called from any thread but the one of the event loop.
+        
+        Parameters:
+            coroutine (Coroutine[Any, Any, T]): The coroutine.
+        
+        Raises:
+            RuntimeError: If called from the thread of the event loop, or after the event loop is stopped.
+        
+        Returns:
+            T: The result of the coroutine.
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("Blocking calls cannot be made from the event loop of the client")
+        with self._lock:
+            if self.stopped:
+                coroutine.close()
+                raise RuntimeError("The client is closed")
+            future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result()
+        except BaseException:
+            # Such as KeyboardInterrupt in the waiting thread: do not leave the coroutine running.
+            future.cancel()
+            raise
+    
+    def iterate(self: Self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """
+        Iterate an asynchronous iterator on the event loop, one item at a time.
+        
+        Parameters:
+            iterator (AsyncIterator[T]): The asynchronous iterator.
+        
+        Yields:
+            T: The items of the iterator.
+        """
+        end = object()
+        
+        async def next_item() -> T | object:
+            return await anext(iterator, end)
+        
+        try:
+            while (item := self.run(next_item())) is not end:
+                yield item
+        finally:
+            if hasattr(iterator, "aclose") and not self.stopped:
+                self.run(iterator.aclose())
+    
+    def stop(self: Self) -> None:
+        """
+        Stop the event loop and wait for its thread to end. Coroutines still running are cancelled.
+        """
+        with self._lock:
+            if self.stopped:
+                return
+            self.stopped = True
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+    
+    def __run(self: Self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        # Cancel what is left, such as requests of iterators that were not exhausted.
+        tasks: set[asyncio.Task] = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+
+class _SyncClient:
+    """
+    Base of the blocking clients.
+    """
+    BATCH_CONCURRENCY: int = 16
+    
+    def __init__(self: Self, async_client: BaseClient, name: str) -> None:
+        self._runner = _EventLoopThread(name)
+        self.async_client = async_client
+    
+    @property
+    def site(self: Self) -> SITE:
+        """
+        Getter property for the current site of the client.
+        
+        Returns:
+            SITE: The current site used by the client.
+        """
+        return self.async_client.site
+    
+    @site.setter
+    def site(self: Self, new_site: SITE) -> None:
+        """
+        Set the site to scrape from.
+        
+        Parameters:
+            new_site (SITE): The new site to set.
+        """
+        async def set_site() -> None:
+            self.async_client.site = new_site
+        
+        self._runner.run(set_site())
+    
+    def close(self: Self) -> None:
+        """
+        Close the HTTP client, and stop the event loop thread. The client cannot send requests anymore.
+        """
+        if self._runner.stopped:
+            return
+        try:
+            self._runner.run(self.async_client.aclose())
+        finally:
+            self._runner.stop()
+    
+    def _batch(
+        self: Self,
+        calls: Iterable[Callable[[], Awaitable[T]]],
+        concurrency: int,
+        return_exceptions: bool
+        ) -> list[T | Exception]:
+        """
+        Run calls of the asynchronous client concurrently on the event loop.
+        
+        Parameters:
+            calls (Iterable[Callable[[], Awaitable[T]]]): Functions returning the awaitable of each call.
+            concurrency (int): The maximum number of calls running at a time.
+            return_exceptions (bool): Whether to return the exception of a failed call in place of its result, instead of raising it.
+        
+        Returns:
+            list[T | Exception]: The result of each call, in order of the calls.
+        """
+        async def run_batch() -> list[T | Exception]:
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def run(call: Callable[[], Awaitable[T]]) -> T:
+                async with semaphore:
+                    return await call()
+            
+            tasks: list[asyncio.Task] = [asyncio.create_task(run(call)) for call in calls]
+            try:
+                return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+            finally:
+                for task in tasks:
+                    task.cancel()
+        
+        return self._runner.run(run_batch())
+    
+    def __enter__(self: Self) -> Self:
+        return self
+    
+    def __exit__(self: Self, *exc_info: Any) -> None:
+        self.close()
+
+class SyncNyaaClient(_SyncClient):
+    """
+    Blocking scraper client, for code that does not run an event loop, such as web framework views and task queue workers.
+    
+    The client runs a `NyaaClient` on an event loop in a background thread, so connections are kept alive and reused
+    across calls, instead of creating a new event loop and connection pool for each call with `asyncio.run`.
+    Calls can be made from many threads at once: they all run concurrently on that event loop, within the limits
+    of the scheduler of the client if it has one.
+    
+    The batch methods run many requests concurrently and return their results in order.
+    
+    Close the client with `close`, or use it as a context manager.
+    """
+    def __init__(self: Self, site: SITE = BaseClient.DEFAULT_SITE, **kwargs: Any) -> None:
+        """
+        Initialize blocking scraper client.
+        
+        Parameters:
+            site (SITE, optional): The site to scrape from. Defaults to BaseClient.DEFAULT_SITE.
+            **kwargs (Any): The other arguments of `NyaaClient`.
+        """
+        super().__init__(NyaaClient(site, **kwargs), "nyaascraper-client")
+    
+    def search(self: Self, *args: Any, **kwargs: Any) -> SearchResult:
+        """
+        Search torrents. Blocking version of `NyaaClient.search`, with the same arguments.
+        
+        Returns:
+            SearchResult: Result of the search.
+        """
+        return self._runner.run(self.async_client.search(*args, **kwargs))
+    
+    def iter_search(self: Self, *args: Any, **kwargs: Any) -> Iterator[SearchResultTorrent]:
+        """
+        Iterate the torrents of every result page of a search. Blocking version of `NyaaClient.iter_search`, with the same arguments.
+        
+        Yields:
+            SearchResultTorrent: The torrents, page by page.
+        """
+        return self._runner.iterate(self.async_client.iter_search(*args, **kwargs))
+    
+    def search_sites(self: Self, *args: Any, **kwargs: Any) -> dict[SITE, SearchResult]:
+        """
+        Search torrents on several sites concurrently. Blocking version of `NyaaClient.search_sites`, with the same arguments.
+        
+        Returns:
+            dict[SITE, SearchResult]: The result of each site.
+        """
+        return self._runner.run(self.async_client.search_sites(*args, **kwargs))
+    
+    def search_count(self: Self, *args: Any, **kwargs: Any) -> int:
+        """
+        Count the total results of a search. Blocking version of `NyaaClient.search_count`, with the same arguments.
+        
+        Returns:
+            int: The total number of results.
+        """
+        return self._runner.run(self.async_client.search_count(*args, **kwargs))
+    
+    def search_exists(self: Self, *args: Any, **kwargs: Any) -> bool:
+        """
+        Check whether a search has at least one result. Blocking version of `NyaaClient.search_exists`, with the same arguments.
+        
+        Returns:
+            bool: True if the search has results, False otherwise.
+        """
+        return self._runner.run(self.async_client.search_exists(*args, **kwargs))
+    
+    def get_torrent_info(self: Self, *args: Any, **kwargs: Any) -> TorrentInfo:
+        """
+        Get torrent information. Blocking version of `NyaaClient.get_torrent_info`, with the same arguments.
+        
+        Returns:
+            TorrentInfo: Information of the torrent.
+        """
+        return self._runner.run(self.async_client.get_torrent_info(*args, **kwargs))
+    
+    def download_torrents(self: Self, *args: Any, **kwargs: Any) -> Iterator[DownloadResult]:
+        """
+        Download torrent files. Blocking version of `NyaaClient.download_torrents`, with the same arguments.
+        
+        The torrents are iterated on the event loop thread, so they should not block, such as a list of torrents.
+        
+        Yields:
+            DownloadResult: The result of each download, in order of completion.
+        """
+        return self._runner.iterate(self.async_client.download_torrents(*args, **kwargs))
+    
+    def search_batch(
+        self: Self,
+        queries: Iterable[dict[str, Any]],
+        concurrency: int = _SyncClient.BATCH_CONCURRENCY,
+        return_exceptions: bool = False
+        ) -> list[SearchResult | Exception]:
+        """
+        Run many searches concurrently.
+        
+        Parameters:
+            queries (Iterable[dict[str, Any]]): The arguments of `NyaaClient.search` of each search, such as {"term": "...", "page": 2}.
+            concurrency (int, optional): The maximum number of searches running at a time. Defaults to BATCH_CONCURRENCY.
+            return_exceptions (bool, optional): Whether to return the exception of a failed search in place of its result, instead of raising it. Defaults to False.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during a search and `return_exceptions` is False.
+            DeadlineExceededError: If the deadline of a search passes and `return_exceptions` is False.
+            CircuitOpenError: If the circuit of the endpoint is open and `return_exceptions` is False.
+        
+        Returns:
+            list[SearchResult | Exception]: The result of each search, in order of the queries.
+        """
+        return self._batch(
+            [lambda query=query: self.async_client.search(**query) for query in queries],
+            concurrency,
+            return_exceptions
+            )
+    
+    def get_torrent_info_batch(
+        self: Self,
+        view_ids: Iterable[int],
+        concurrency: int = _SyncClient.BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+        **kwargs: Any
+        ) -> list[TorrentInfo | Exception]:
+        """
+        Get the information of many torrents concurrently.
+        
+        Parameters:
+            view_ids (Iterable[int]): View-IDs of the torrents.
+            concurrency (int, optional): The maximum number of requests running at a time. Defaults to BATCH_CONCURRENCY.
+            return_exceptions (bool, optional): Whether to return the exception of a failed request in place of its result, instead of raising it. Defaults to False.
+            **kwargs (Any): The other arguments of `NyaaClient.get_torrent_info`, such as `site`, for every torrent.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during a request and `return_exceptions` is False.
+            TorrentNotFoundError: If a torrent is not found and `return_exceptions` is False.
+            DeadlineExceededError: If the deadline of a request passes and `return_exceptions` is False.
+            CircuitOpenError: If the circuit of the endpoint is open and `return_exceptions` is False.
+        
+        Returns:
+            list[TorrentInfo | Exception]: The information of each torrent, in order of the View-IDs.
+        """
+        return self._batch(
+            [lambda view_id=view_id: self.async_client.get_torrent_info(view_id, **kwargs) for view_id in view_ids],
+            concurrency,
+            return_exceptions
+            )
+
+class SyncNyaaRSSClient(_SyncClient):
+    """
+    Blocking RSS client, running a `NyaaRSSClient` on an event loop in a background thread like `SyncNyaaClient`.
+    
+    Close the client with `close`, or use it as a context manager.
+    """
+    def __init__(self: Self, site: SITE = BaseClient.DEFAULT_SITE, **kwargs: Any) -> None:
+        """
+        Initialize blocking RSS client.
+        
+        Parameters:
+            site (SITE, optional): The site to get feeds from. Defaults to BaseClient.DEFAULT_SITE.
+            **kwargs (Any): The other arguments of `NyaaRSSClient`.
+        """
+        super().__init__(NyaaRSSClient(site, **kwargs), "nyaascraper-rss-client")
+    
+    def get_feed(self: Self, *args: Any, **kwargs: Any) -> NyaaRSSFeed:
+        """
+        Get a feed. Blocking version of `NyaaRSSClient.get_feed`, with the same arguments.
+        
+        Returns:
+            NyaaRSSFeed: The feed.
+        """
+        return self._runner.run(self.async_client.get_feed(*args, **kwargs))
+    
+    def get_feeds(self: Self, *args: Any, **kwargs: Any) -> dict[SITE, NyaaRSSFeed]:
+        """
+        Get the feeds of several sites concurrently. Blocking version of `NyaaRSSClient.get_feeds`, with the same arguments.
+        
+        Returns:
+            dict[SITE, NyaaRSSFeed]: The feed of each site.
+        """
+        return self._runner.run(self.async_client.get_feeds(*args, **kwargs))
+    
+    def watch(self: Self, *args: Any, **kwargs: Any) -> Iterator[NyaaRSSTorrent]:
+        """
+        Poll a feed and yield its new torrents. Blocking version of `NyaaRSSClient.watch`, with the same arguments.
+        
+        Yields:
+            NyaaRSSTorrent: The new torrents.
+        """
+        return self._runner.iterate(self.async_client.watch(*args, **kwargs))
+    
+    def get_feed_batch(
+        self: Self,
+        queries: Iterable[dict[str, Any]],
+        concurrency: int = _SyncClient.BATCH_CONCURRENCY,
+        return_exceptions: bool = False
+        ) -> list[NyaaRSSFeed | Exception]:
+        """
+        Get many feeds concurrently.
+        
+        Parameters:
+            queries (Iterable[dict[str, Any]]): The arguments of `NyaaRSSClient.get_feed` of each feed, such as {"term": "...", "magnet_only": True}.
+            concurrency (int, optional): The maximum number of requests running at a time. Defaults to BATCH_CONCURRENCY.
+            return_exceptions (bool, optional): Whether to return the exception of a failed request in place of its result, instead of raising it. Defaults to False.
+        
+        Raises:
+            httpx.HTTPError: If an HTTP-related error occurs during a request and `return_exceptions` is False.
+            DeadlineExceededError: If the deadline of a request passes and `return_exceptions` is False.
+            CircuitOpenError: If the circuit of the endpoint is open and `return_exceptions` is False.
+        
+        Returns:
+            list[NyaaRSSFeed | Exception]: Each feed, in order of the queries.
+        """
+        return self._batch(
+            [lambda query=query: self.async_client.get_feed(**query) for query in queries],
+            concurrency,
+            return_exceptions
+            )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from typing import Any
+import importlib
+
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "get_category_by_id": ".categories",
+    "get_category_title_by_id": ".categories",
+    "get_info_hash_from_magnet": ".magnet",
+    "json_default": ".json_default",
+    "parse_size": ".size"
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name: str) -> Any:
+    if (module_name := _LAZY_ATTRIBUTES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value: Any = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
\ No newline at end of file
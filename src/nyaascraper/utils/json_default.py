@@ -0,0 +1,35 @@
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any
+import time
+
+def json_default(value: Any) -> Any:
+    """
+    Convert a value that is not natively JSON serializable.
+    
+    Parameters:
+        value (Any): The value.
+    
+    Raises:
+        TypeError: If the value cannot be converted.
+    
+    Returns:
+        Any: The JSON serializable value.
+    """
+    if is_dataclass(value):
+        # `time.struct_time` is a tuple, so it has to be converted before the JSON encoder sees it.
+        items: dict[str, Any] = {}
+        for field in fields(value):
+            item: Any = getattr(value, field.name)
+            items[field.name] = json_default(item) if isinstance(item, time.struct_time) else item
+        return items
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, time.struct_time):
+        return time.strftime("%Y-%m-%dT%H:%M:%S", value)
+    if isinstance(value, Exception):
+        return f"{type(value).__name__}: {value}"
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
\ No newline at end of file
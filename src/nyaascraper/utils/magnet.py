@@ -0,0 +1,24 @@
+from urllib.parse import urlparse, parse_qs
+import base64
+
+def get_info_hash_from_magnet(magnet_link: str) -> str | None:
+    """
+    Get the info hash from a magnet link.
+    
+    Parameters:
+        magnet_link (str): The magnet link.
+    
+    Returns:
+        str | None: The info hash as lowercase hex, or None if the magnet link has no BitTorrent info hash.
+    """
+    for topic in parse_qs(urlparse(magnet_link).query).get("xt", []):
+        if not topic.lower().startswith("urn:btih:"):
+            continue
+        
+        info_hash: str = topic[9:]
+        if len(info_hash) == 40:
+            return info_hash.lower()
+        if len(info_hash) == 32:
+            # Base32 encoded info hash.
+            return base64.b32decode(info_hash.upper()).hex()
+    return None
\ No newline at end of file
@@ -0,0 +1,30 @@
+import re
+
+SIZE_PATTERN: re.Pattern = re.compile(r"^\s*([\d.]+)\s*(Bytes|B|KiB|MiB|GiB|TiB|PiB)\s*$")
+
+UNITS: dict[str, int] = {
+    "Bytes": 1,
+    "B": 1,
+    "KiB": 1024,
+    "MiB": 1024 ** 2,
+    "GiB": 1024 ** 3,
+    "TiB": 1024 ** 4,
+    "PiB": 1024 ** 5
+}
+
+def parse_size(size: str) -> int:
+    """
+    Get the number of bytes of a size as displayed by the site, such as "1.4 GiB".
+    
+    Parameters:
+        size (str): The size.
+    
+    Raises:
+        ValueError: If the size is not in a known format.
+    
+    Returns:
+        int: The size in bytes. Sizes are rounded by the site, so the value is approximate.
+    """
+    if not (matches := SIZE_PATTERN.match(size)):
+        raise ValueError(f"Unknown size format: {size}")
+    return round(float(matches.group(1)) * UNITS[matches.group(2)])
\ No newline at end of file
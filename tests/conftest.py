@@ -0,0 +1,33 @@
+from typing import Callable
+
+import httpx
+import pytest
+
+from nyaascraper.base import BaseClient
+from nyaascraper.enums import SITE
+
+from benchmarks.server import NyaaStandIn
+
+@pytest.fixture
+def stand_in() -> NyaaStandIn:
+    return NyaaStandIn()
+
+@pytest.fixture
+def make_client(stand_in: NyaaStandIn) -> Callable[..., BaseClient]:
+    """
+    Build clients sending their requests to the stand-in server in-process.
+    """
+    def make(client_class: type[BaseClient], site: SITE = SITE.FUN, app=None, **kwargs) -> BaseClient:
+        client = client_class(site, **kwargs)
+        client._http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app or stand_in), timeout=client.timeout)
+        return client
+    
+    return make
+
+def mock_client(client_class: type[BaseClient], handler: Callable[[httpx.Request], httpx.Response], site: SITE = SITE.FUN, **kwargs) -> BaseClient:
+    """
+    Build a client whose requests are answered by a handler.
+    """
+    client = client_class(site, **kwargs)
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=client.timeout)
+    return client
\ No newline at end of file
@@ -0,0 +1,65 @@
+from pathlib import Path
+import asyncio
+
+import httpx
+import pytest
+
+from nyaascraper import NyaaClient, NyaaRSSClient, PageArchive
+from nyaascraper import archive
+from nyaascraper.enums import SITE
+
+from benchmarks.server import FIXTURES_DIR, NyaaStandIn
+
+COMPRESSIONS: list[str] = ["gzip"] + (["zstd"] if archive.zstandard is not None else [])
+
+def scrape(directory: Path, compression: str, segment_size: int = PageArchive.SEGMENT_SIZE) -> list:
+    async def main():
+        models: list = []
+        with PageArchive(directory, segment_size=segment_size, compression=compression) as page_archive:
+            for site in SITE:
+                client = NyaaClient(site, archive=page_archive)
+                rss_client = NyaaRSSClient(site, archive=page_archive)
+                for each in (client, rss_client):
+                    each._http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=NyaaStandIn()))
+                models.append(await client.search(term="frieren", page=2))
+                models.append(await client.get_torrent_info(1))
+                models.append(await rss_client.get_feed())
+        return models
+    
+    return asyncio.run(main())
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_replay_extracts_the_archived_models(tmp_path: Path, compression: str):
+    models: list = scrape(tmp_path, compression)
+    
+    results = list(PageArchive(tmp_path).replay(workers=0))
+    assert [result.model for result in results] == models
+    assert not any(result.error for result in results)
+    assert [result.entry.endpoint for result in results] == ["search", "view", "rss"] * 2
+    
+    search_results = list(PageArchive(tmp_path).replay(endpoints=["search"], workers=2, batch_size=1))
+    assert [result.model for result in search_results] == models[::3]
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_records_are_read_by_offset(tmp_path: Path, compression: str):
+    scrape(tmp_path, compression)
+    page_archive = PageArchive(tmp_path)
+    entry = next(page_archive.entries(["view"]))
+    page = page_archive.read(entry)
+    
+    assert page.status_code == 200
+    assert page.body == (FIXTURES_DIR / "view_fun.html").read_bytes()
+    assert entry.url.endswith("/view/1")
+
+def test_segments_roll_over_and_runs_append(tmp_path: Path):
+    scrape(tmp_path, "gzip", segment_size=1)
+    assert len(list(tmp_path.glob("segment-*.warc.gz"))) == 6
+    
+    scrape(tmp_path, "gzip")
+    assert len(list(tmp_path.glob("segment-*.idx"))) == 7
+    assert sum(1 for _ in PageArchive(tmp_path).entries()) == 12
+    assert sum(1 for _ in PageArchive(tmp_path).entries(["rss"])) == 4
+
+def test_unknown_compression_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        PageArchive(tmp_path, compression="lz4")
\ No newline at end of file
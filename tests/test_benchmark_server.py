@@ -0,0 +1,38 @@
+import asyncio
+
+import httpx
+
+from benchmarks.server import FIXTURES_DIR, NyaaStandIn, StandInConfig
+
+def get(app: NyaaStandIn, *paths: str, host: str = "nyaa.si") -> list[httpx.Response]:
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=f"http://{host}") as client:
+            return [await client.get(path) for path in paths]
+    
+    return asyncio.run(main())
+
+def test_routes_fixtures_by_host():
+    app = NyaaStandIn()
+    search, view, rss, missing = get(app, "/?q=frieren", "/view/1", "/?page=rss", "/download/1.torrent")
+    assert search.content == (FIXTURES_DIR / "search_fun.html").read_bytes()
+    assert view.content == (FIXTURES_DIR / "view_fun.html").read_bytes()
+    assert rss.content == (FIXTURES_DIR / "rss_fun.xml").read_bytes()
+    assert missing.status_code == 404
+    
+    (fap_search,) = get(app, "/", host="sukebei.nyaa.si")
+    assert fap_search.content == (FIXTURES_DIR / "search_fap.html").read_bytes()
+    (forced,) = get(NyaaStandIn(site="fap"), "/user/someone")
+    assert forced.content == fap_search.content
+    assert app.requests == 5
+
+def test_rate_limit_responds_with_429():
+    app = NyaaStandIn(StandInConfig(rate_limit=0.001, burst=2))
+    statuses = [response.status_code for response in get(app, "/", "/", "/", "/")]
+    assert statuses == [200, 200, 429, 429]
+
+def test_error_rate_is_reproducible():
+    config = StandInConfig(error_rate=0.5, seed=7)
+    first = [response.status_code for response in get(NyaaStandIn(config), *["/"] * 20)]
+    second = [response.status_code for response in get(NyaaStandIn(config), *["/"] * 20)]
+    assert first == second
+    assert {200, 503} == set(first)
\ No newline at end of file
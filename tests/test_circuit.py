@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from nyaascraper import NyaaClient, CircuitBreaker, StaleCache
+from nyaascraper.enums import CircuitState
+from nyaascraper.exceptions import CircuitOpenError
+
+from benchmarks.server import FIXTURES_DIR
+from tests.conftest import mock_client
+
+def test_circuit_opens_recovers_and_reopens():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    for _ in range(2):
+        breaker.allow("fun.search")
+        breaker.failed("fun.search")
+    assert breaker.state("fun.search") is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow("fun.search")
+    
+    time.sleep(0.06)
+    assert breaker.state("fun.search") is CircuitState.HALF_OPEN
+    breaker.allow("fun.search")
+    with pytest.raises(CircuitOpenError):
+        # Only one trial request at a time.
+        breaker.allow("fun.search")
+    breaker.failed("fun.search")
+    assert breaker.state("fun.search") is CircuitState.OPEN
+    
+    time.sleep(0.06)
+    breaker.allow("fun.search")
+    breaker.succeeded("fun.search")
+    assert breaker.state("fun.search") is CircuitState.CLOSED
+    
+    stats = breaker.stats()["fun.search"]
+    assert (stats.opened, stats.rejected, stats.failures) == (2, 2, 0)
+
+def test_success_while_open_is_ignored():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    for _ in range(3):
+        breaker.allow("fun.view")
+    breaker.failed("fun.view")
+    breaker.failed("fun.view")
+    
+    # A request let through before the circuit opened succeeds late.
+    breaker.succeeded("fun.view")
+    assert breaker.state("fun.view") is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow("fun.view")
+
+def test_success_resets_failures_while_closed():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.allow("fun.rss")
+    breaker.failed("fun.rss")
+    breaker.allow("fun.rss")
+    breaker.succeeded("fun.rss")
+    breaker.allow("fun.rss")
+    breaker.failed("fun.rss")
+    assert breaker.state("fun.rss") is CircuitState.CLOSED
+
+def test_client_serves_stale_results_while_the_circuit_is_open():
+    body: bytes = (FIXTURES_DIR / "search_fun.html").read_bytes()
+    down: list[bool] = [False]
+    requests: list[str] = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if down[0]:
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200, content=body)
+    
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    client = mock_client(NyaaClient, handler, circuit_breaker=breaker, stale_cache=StaleCache())
+    
+    async def main():
+        fresh = await client.search(term="frieren")
+        down[0] = True
+        stale = await client.search(term="frieren")
+        served_while_open = await client.search(term="frieren")
+        with pytest.raises(CircuitOpenError):
+            await client.search(term="never cached")
+        return fresh, stale, served_while_open
+    
+    fresh, stale, served_while_open = asyncio.run(main())
+    assert not fresh.stale and stale.stale and served_while_open.stale
+    assert len(requests) == 2
+    assert breaker.state("fun.search") is CircuitState.OPEN
\ No newline at end of file
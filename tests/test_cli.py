@@ -0,0 +1,119 @@
+from pathlib import Path
+import json
+import signal
+import threading
+
+import httpx
+import pytest
+
+from nyaascraper import NyaaClient
+from nyaascraper.cli import build_parser, main
+import nyaascraper.cli as cli
+import nyaascraper.batch as batch
+
+from benchmarks.server import NyaaStandIn, StandInConfig
+
+@pytest.fixture
+def stand_in_client(monkeypatch):
+    """
+    Send the requests of the batch runner to a stand-in server, returned so tests can change its config.
+    """
+    stand_in = NyaaStandIn()
+    
+    class StandInClient(NyaaClient):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self._http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stand_in), timeout=self.timeout)
+    
+    monkeypatch.setattr(batch, "NyaaClient", StandInClient)
+    return stand_in
+
+def run(tmp_path: Path, lines: list[str], *args: str) -> tuple[int, list[dict]]:
+    input_path: Path = tmp_path / "input.txt"
+    output_path: Path = tmp_path / "output.jsonl"
+    input_path.write_text("\n".join(lines), encoding="utf-8")
+    status: int = main([*args, str(input_path), "-o", str(output_path)])
+    return status, [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["search", "-c", "0"],
+    ["view", "-r", "-1"],
+    ["search", "-s", "other"],
+    ["download"]
+])
+def test_invalid_arguments_exit_with_status_2(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        build_parser().parse_args(argv)
+    assert exit_info.value.code == 2
+    assert "usage: nyaascraper" in capsys.readouterr().err
+
+def test_arguments_have_defaults():
+    args = build_parser().parse_args(["search"])
+    assert (args.input, args.output, args.site, args.concurrency, args.rate, args.timeout, args.pages) == ("-", "-", "fun", 8, None, 30.0, 1)
+
+def test_missing_input_exits_with_status_2(tmp_path, capsys):
+    assert main(["view", str(tmp_path / "missing.txt")]) == 2
+    assert "missing.txt" in capsys.readouterr().err
+
+def test_files_are_closed_when_the_output_cannot_be_opened(tmp_path, monkeypatch, capsys):
+    opened: list = []
+    
+    def recording_open(*args, **kwargs):
+        opened.append(file := open(*args, **kwargs))
+        return file
+    
+    monkeypatch.setattr(cli, "open", recording_open, raising=False)
+    (input_path := tmp_path / "views.txt").write_text("1\n", encoding="utf-8")
+    assert main(["view", str(input_path), "-o", str(tmp_path / "missing" / "out.jsonl")]) == 2
+    assert "out.jsonl" in capsys.readouterr().err
+    assert len(opened) == 1 and opened[0].closed
+
+def test_search_writes_one_line_per_page(tmp_path, stand_in_client, capsys):
+    status, records = run(
+        tmp_path,
+        ["frieren", "", "# comment", '{"term": "one piece", "category": "1_2", "sort_by": "seeders"}'],
+        "search",
+        "--pages", "2"
+        )
+    assert status == 0
+    assert sorted((record["input"], record["page"]) for record in records) == [
+        ("frieren", 1), ("frieren", 2), ('{"term": "one piece", "category": "1_2", "sort_by": "seeders"}', 1),
+        ('{"term": "one piece", "category": "1_2", "sort_by": "seeders"}', 2)
+    ]
+    assert all(record["result"]["torrents"] for record in records)
+    assert stand_in_client.requests == 4
+    assert "2 queries: 2 ok, 0 failed, 0 cancelled" in capsys.readouterr().err
+
+def test_invalid_search_lines_are_reported(tmp_path, stand_in_client):
+    status, records = run(tmp_path, ['{"term": "x", "seeders": 1}', '{"category": "9_9"}', '{"term":', "ok"], "search")
+    assert status == 1
+    errors: dict[str, str] = {record["input"]: record["error"] for record in records if "error" in record}
+    assert "Unknown search arguments: seeders" in errors['{"term": "x", "seeders": 1}']
+    assert set(errors) == {'{"term": "x", "seeders": 1}', '{"category": "9_9"}', '{"term":'}
+    assert stand_in_client.requests == 1
+
+def test_view_accepts_ids_and_urls(tmp_path, stand_in_client):
+    status, records = run(tmp_path, ["1", "https://nyaa.si/view/2/", "not an id"], "view", "-c", "2")
+    assert status == 1
+    results: dict[str, dict] = {record["input"]: record for record in records}
+    assert results["1"]["result"]["name"] and results["https://nyaa.si/view/2/"]["result"]["magnet_link"]
+    assert "Invalid view ID" in results["not an id"]["error"]
+
+def test_failed_requests_exit_with_status_1(tmp_path, stand_in_client, capsys):
+    stand_in_client.config = StandInConfig(error_rate=1.0)
+    status, records = run(tmp_path, ["1", "2"], "view")
+    assert status == 1
+    assert all("503" in record["error"] for record in records)
+    summary: str = capsys.readouterr().err
+    assert "2 queries: 0 ok, 2 failed" in summary
+    assert "2 requests in" in summary and ", 2 failed" in summary
+@pytest.mark.skipif(not hasattr(signal, "pthread_kill"), reason="POSIX signals")
+def test_interrupt_waits_for_queries_in_flight(tmp_path, stand_in_client, capsys):
+    stand_in_client.config = StandInConfig(latency=0.5)
+    threading.Timer(0.2, signal.pthread_kill, (threading.main_thread().ident, signal.SIGINT)).start()
+    status, records = run(tmp_path, [str(view_id) for view_id in range(1, 21)], "view", "-c", "2")
+    assert status == 130
+    # The two queries being sent finish, and no other query starts.
+    assert len(records) == 2 and all("result" in record for record in records)
+    assert "2 queries: 2 ok, 0 failed, 0 cancelled (interrupted)" in capsys.readouterr().err
\ No newline at end of file
@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+
+from nyaascraper import NyaaClient
+from nyaascraper.enums import SITE
+
+from tests.conftest import mock_client
+
+PAGE: str = """
+<table class="torrent-list"><tbody>
+{rows}
+</tbody></table>
+"""
+ROW: str = '<tr class="default"><td>torrent {index}</td></tr>'
+
+def page_handler(rows: int):
+    body: str = PAGE.format(rows="\n".join(ROW.format(index=index) for index in range(rows)))
+    return lambda request: httpx.Response(200, text=body)
+
+def test_search_count_reads_pagination_info(make_client):
+    async def main():
+        client = make_client(NyaaClient)
+        assert await client.search_count(term="frieren") == 1000
+        assert await client.search_count(term="frieren", site=SITE.FAP) == 1000
+    
+    asyncio.run(main())
+
+def test_search_count_counts_rows_of_single_page():
+    client = mock_client(NyaaClient, page_handler(7))
+    assert asyncio.run(client.search_count(term="frieren")) == 7
+
+def test_search_count_counts_rows_across_chunks():
+    body: bytes = PAGE.format(rows="\n".join(ROW.format(index=index) for index in range(40))).encode()
+    
+    async def chunks():
+        # Split rows across chunks, so rows overlapping two chunks must be counted once.
+        for start in range(0, len(body), 17):
+            yield body[start:start + 17]
+    
+    client = mock_client(NyaaClient, lambda request: httpx.Response(200, content=chunks()))
+    assert asyncio.run(client.search_count(term="frieren")) == 40
+
+def test_search_exists(make_client):
+    async def main():
+        assert await make_client(NyaaClient).search_exists(term="frieren")
+        assert not await mock_client(NyaaClient, page_handler(0)).search_exists(term="nothing")
+        assert await mock_client(NyaaClient, page_handler(1)).search_exists(term="one")
+    
+    asyncio.run(main())
+
+def test_search_count_matches_search(make_client):
+    async def main():
+        client = make_client(NyaaClient)
+        result = await client.search(term="frieren")
+        assert await client.search_count(term="frieren") == result.total_results
+    
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,121 @@
+from datetime import datetime
+import dataclasses
+import struct
+
+import pytest
+
+from nyaascraper import BloomFilter, DedupIndex, ScalableBloomFilter
+from nyaascraper.enums import FapCategory, FunCategory, TorrentType
+from nyaascraper.models import SearchResultTorrent
+
+def torrent(view_id: int, info_hash: str, category: FunCategory | FapCategory = FunCategory.ANIME_ENGLISH_TRANSLATED) -> SearchResultTorrent:
+    return SearchResultTorrent(
+        TorrentType.NORMAL, view_id, "name", category, "", "", f"magnet:?xt=urn:btih:{info_hash}", "1 MiB", datetime(2020, 1, 1), 1, 1, 1, 0
+        )
+
+def key(i: int) -> bytes:
+    return b"h" + i.to_bytes(20, "big")
+
+def test_torrents_are_identified_by_info_hash_and_view_id():
+    index = DedupIndex()
+    first: SearchResultTorrent = torrent(1, "ab" * 20)
+    assert index.add(first)
+    assert not index.add(first)
+    assert first in index
+    # View-IDs are per site.
+    assert index.add(torrent(1, "cd" * 20, FapCategory.ART_ANIME))
+    # The same info hash under another View-ID, in either case.
+    assert not index.add(torrent(2, "AB" * 20))
+    assert index.filter([torrent(3, "ef" * 20), first, torrent(3, "ef" * 20)]) == [torrent(3, "ef" * 20)]
+
+def test_older_keys_move_to_the_bloom_filters():
+    # A low error rate, so no torrent is taken for a seen one.
+    index = DedupIndex(window=10, error_rate=1e-6, initial_capacity=100)
+    torrents: list[SearchResultTorrent] = [torrent(i, f"{i:040x}") for i in range(500)]
+    assert index.filter(torrents) == torrents
+    assert len(index._recent) == 10
+    assert len(index._history.filters) > 1
+    assert all(seen in index for seen in torrents)
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom_filter = BloomFilter(1000, 0.01)
+    assert all(bloom_filter.add(key(i)) for i in range(0, 1000, 2))
+    assert not bloom_filter.add(key(0))
+    assert all(key(i) in bloom_filter for i in range(0, 1000, 2))
+    false_positives: int = sum(key(i) in bloom_filter for i in range(10_000, 20_000))
+    assert false_positives < 300
+    
+    with pytest.raises(ValueError):
+        BloomFilter(0, 0.01)
+    with pytest.raises(ValueError):
+        BloomFilter(10, 1.0)
+
+def test_scalable_bloom_filter_keeps_its_error_rate():
+    bloom_filter = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+    for i in range(20_000):
+        bloom_filter.add(key(i))
+    assert len(bloom_filter.filters) == 5
+    assert all(key(i) in bloom_filter for i in range(20_000))
+    false_positives: int = sum(key(i) in bloom_filter for i in range(100_000, 120_000))
+    assert false_positives < 0.01 * 20_000 * 1.5
+
+def test_save_and_load_round_trip(tmp_path):
+    index = DedupIndex(window=10, initial_capacity=100)
+    torrents: list[SearchResultTorrent] = [torrent(i, f"{i:040x}") for i in range(300)]
+    index.filter(torrents)
+    path = tmp_path / "dedup.bin"
+    index.save(path)
+    
+    loaded: DedupIndex = DedupIndex.load(path)
+    assert list(loaded._recent) == list(index._recent)
+    assert [bloom_filter._bits for bloom_filter in loaded._history.filters] == [bloom_filter._bits for bloom_filter in index._history.filters]
+    assert all(seen in loaded for seen in torrents)
+    assert loaded.add(torrent(1000, "ff" * 20))
+    assert not (tmp_path / "dedup.bin.part").exists()
+
+def corrupt(data: bytes, offset: int, value: bytes) -> bytes:
+    return data[:offset] + value + data[offset + len(value):]
+
+@pytest.mark.parametrize(("change", "message"), [
+    (lambda data: b"PK" + data[2:], "Not a dedup index"),
+    (lambda data: corrupt(data, 2, b"\x09"), "version 9"),
+    (lambda data: corrupt(data, 7, struct.pack("<d", 0.0)), "Corrupt dedup index header"),
+    (lambda data: corrupt(data, 15, struct.pack("<d", 0.5)), "Corrupt dedup index header"),
+    (lambda data: corrupt(data, 23, struct.pack("<d", 1.0)), "Corrupt dedup index header"),
+    (lambda data: data[:60], "Truncated"),
+    (lambda data: data[:-1], "Truncated"),
+    (lambda data: data + b"\x00", "Trailing data")
+])
+def test_load_rejects_corrupt_files(tmp_path, change, message):
+    index = DedupIndex(window=10, initial_capacity=100)
+    index.filter(torrent(i, f"{i:040x}") for i in range(100))
+    path = tmp_path / "dedup.bin"
+    index.save(path)
+    
+    path.write_bytes(change(path.read_bytes()))
+    with pytest.raises(ValueError, match=message):
+        DedupIndex.load(path)
+
+def test_load_rejects_corrupt_filter_headers(tmp_path):
+    index = DedupIndex(window=1, initial_capacity=100)
+    index.filter(torrent(i, f"{i:040x}") for i in range(10))
+    path = tmp_path / "dedup.bin"
+    index.save(path)
+    data: bytes = path.read_bytes()
+    filter_offset: int = struct.calcsize("<2sBIdddII") + sum(1 + len(recent) for recent in index._recent)
+    
+    hashes: int = data[filter_offset + 24]
+    # Zero hash functions, a bit array of 0 bits, another number of hash functions than the capacity and error rate imply,
+    # and a capacity implying petabytes of bits, which must not be allocated.
+    for field_offset, value in ((24, b"\x00"), (25, struct.pack("<Q", 0)), (24, bytes([hashes + 1])), (0, struct.pack("<Q", 1 << 60))):
+        path.write_bytes(corrupt(data, filter_offset + field_offset, value))
+        with pytest.raises(ValueError, match="Corrupt dedup index filter header"):
+            DedupIndex.load(path)
+    # A bit array longer than the rest of the file.
+    path.write_bytes(corrupt(data, filter_offset + 25, struct.pack("<Q", 1 << 40)))
+    with pytest.raises(ValueError, match="Truncated"):
+        DedupIndex.load(path)
+    # An invalid error rate.
+    path.write_bytes(corrupt(data, filter_offset + 8, struct.pack("<d", 2.0)))
+    with pytest.raises(ValueError, match="Corrupt dedup index filter header"):
+        DedupIndex.load(path)
\ No newline at end of file
@@ -0,0 +1,108 @@
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+
+from nyaascraper import NyaaClient
+from nyaascraper.circuit import CircuitBreaker
+from nyaascraper.download import DirectorySink
+from nyaascraper.enums import DownloadStatus
+from nyaascraper.exceptions import CircuitOpenError, InfoHashMismatchError
+
+from tests.conftest import mock_client
+
+def make_torrent_file(name: str) -> tuple[bytes, str]:
+    info: bytes = b"d6:lengthi1e4:name" + str(len(name)).encode() + b":" + name.encode() + b"e"
+    return b"d4:info" + info + b"e", hashlib.sha1(info).hexdigest()
+
+FILES: dict[str, tuple[bytes, str]] = {name: make_torrent_file(name) for name in ("a", "b", "c")}
+
+def torrent(name: str, info_hash: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        info_hash=info_hash or FILES[name][1],
+        magnet_link=None,
+        torrent_url=f"https://nyaa.si/download/{name}.torrent"
+        )
+
+def serve_files(requests: list[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        name: str = request.url.path.rsplit("/", 1)[-1].removesuffix(".torrent")
+        requests.append(name)
+        return httpx.Response(200, content=FILES[name][0])
+    
+    return handler
+
+async def collect(client: NyaaClient, torrents, sink, **kwargs) -> list:
+    return [result async for result in client.download_torrents(torrents, sink, **kwargs)]
+
+def test_downloads_verify_and_skip_duplicates(tmp_path: Path):
+    requests: list[str] = []
+    client = mock_client(NyaaClient, serve_files(requests))
+    
+    results = asyncio.run(collect(client, [torrent("a"), torrent("b"), torrent("a")], tmp_path, concurrency=1))
+    assert Counter(result.status for result in results) == {DownloadStatus.DOWNLOADED: 2, DownloadStatus.SKIPPED: 1}
+    assert (tmp_path / f"{FILES['a'][1]}.torrent").read_bytes() == FILES["a"][0]
+    assert requests == ["a", "b"]
+    
+    # Running the batch again skips what is already in the sink.
+    results = asyncio.run(collect(client, [torrent("a"), torrent("b"), torrent("c")], tmp_path))
+    assert [result.status for result in results].count(DownloadStatus.SKIPPED) == 2
+    assert requests == ["a", "b", "c"]
+
+def test_mismatching_torrent_file_fails(tmp_path: Path):
+    client = mock_client(NyaaClient, serve_files([]))
+    (result,) = asyncio.run(collect(client, [torrent("a", info_hash=FILES["b"][1])], tmp_path))
+    assert result.status is DownloadStatus.FAILED
+    assert isinstance(result.error, InfoHashMismatchError)
+    assert list(tmp_path.iterdir()) == []
+
+def test_duplicates_are_claimed_before_checking_the_sink(tmp_path: Path):
+    class SlowSink(DirectorySink):
+        async def exists(self, info_hash: str) -> bool:
+            exists: bool = await super().exists(info_hash)
+            await asyncio.sleep(0.01)
+            return exists
+    
+    requests: list[str] = []
+    client = mock_client(NyaaClient, serve_files(requests))
+    results = asyncio.run(collect(client, [torrent("a")] * 4, SlowSink(tmp_path), concurrency=4))
+    assert Counter(result.status for result in results) == {DownloadStatus.DOWNLOADED: 1, DownloadStatus.SKIPPED: 3}
+    assert requests == ["a"]
+
+def test_open_circuit_fails_downloads(tmp_path: Path):
+    client = mock_client(
+        NyaaClient,
+        lambda request: httpx.Response(503),
+        circuit_breaker=CircuitBreaker(failure_threshold=1)
+        )
+    
+    async def main():
+        return await asyncio.wait_for(collect(client, [torrent("a"), torrent("b"), torrent("c")], tmp_path, concurrency=1), 5)
+    
+    results = asyncio.run(main())
+    assert [result.status for result in results] == [DownloadStatus.FAILED] * 3
+    assert isinstance(results[0].error, httpx.HTTPStatusError)
+    assert all(isinstance(result.error, CircuitOpenError) for result in results[1:])
+
+def test_unexpected_error_stops_the_batch(tmp_path: Path):
+    class BrokenSink(DirectorySink):
+        async def write(self, info_hash: str, chunk: bytes) -> None:
+            if info_hash == FILES["a"][1]:
+                raise RuntimeError("broken")
+            await asyncio.sleep(0.01)
+            await super().write(info_hash, chunk)
+    
+    client = mock_client(NyaaClient, serve_files([]))
+    
+    async def main():
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(collect(client, [torrent("a"), torrent("b"), torrent("c")] * 4, BrokenSink(tmp_path), concurrency=3), 5)
+        # No worker is left waiting to put its result.
+        await asyncio.sleep(0.05)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    
+    assert asyncio.run(main()) == []
\ No newline at end of file
@@ -0,0 +1,137 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+import asyncio
+import csv
+import json
+import time
+
+import httpx
+import pytest
+
+from nyaascraper import NyaaClient, NyaaRSSClient, JSONLSink, CSVSink, ParquetSink
+from nyaascraper import export
+
+from benchmarks.server import NyaaStandIn
+
+@pytest.fixture(scope="module")
+def scraped() -> tuple:
+    async def main():
+        client = NyaaClient()
+        rss_client = NyaaRSSClient()
+        for each in (client, rss_client):
+            each._http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=NyaaStandIn()))
+        return await client.search(term="frieren"), await client.get_torrent_info(1), await rss_client.get_feed()
+    
+    return asyncio.run(main())
+
+async def export_records(sink, records) -> int:
+    async with sink:
+        return await sink.write_all(records)
+
+def test_jsonl_writes_any_model(tmp_path: Path, scraped):
+    result, info, _ = scraped
+    path: Path = tmp_path / "out.jsonl"
+    assert asyncio.run(export_records(JSONLSink(path, batch_size=10), [*result.torrents, info])) == 76
+    
+    lines: list[dict] = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(lines) == 76
+    assert lines[0]["view_id"] == result.torrents[0].view_id
+    assert lines[0]["category"] == result.torrents[0].category.value
+    assert len(lines[-1]["comments"]) == len(info.comments)
+    
+    # Appends to the file of a previous run.
+    asyncio.run(export_records(JSONLSink(path), result.torrents[:1]))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 77
+
+def test_csv_writes_header_once(tmp_path: Path, scraped):
+    result, _, _ = scraped
+    path: Path = tmp_path / "out.csv"
+    asyncio.run(export_records(CSVSink(path, batch_size=7), result.torrents))
+    asyncio.run(export_records(CSVSink(path), result.torrents[:5]))
+    
+    with open(path, encoding="utf-8", newline="") as file:
+        rows: list[dict] = list(csv.DictReader(file))
+    assert len(rows) == 80
+    assert rows[0]["timestamp"] == result.torrents[0].timestamp.isoformat()
+    assert int(rows[0]["size_bytes"]) > 0
+
+def test_tabular_sinks_reject_other_models(tmp_path: Path, scraped):
+    result, info, _ = scraped
+    
+    async def main():
+        async with CSVSink(tmp_path / "out.csv") as sink:
+            await sink.write(result.torrents[0])
+            with pytest.raises(TypeError):
+                await sink.write(info)
+            with pytest.raises(TypeError):
+                await sink.write(result)
+        with pytest.raises(ValueError):
+            await sink.write(result.torrents[0])
+    
+    asyncio.run(main())
+
+def test_partial_batch_is_written_after_flush_interval(tmp_path: Path, scraped):
+    result, _, _ = scraped
+    path: Path = tmp_path / "out.jsonl"
+    
+    async def main():
+        sink = JSONLSink(path, batch_size=1000, flush_interval=0.05, fsync=False)
+        await sink.write_all(result.torrents[:3])
+        await asyncio.sleep(0.3)
+        lines: int = len(path.read_text(encoding="utf-8").splitlines())
+        await sink.close()
+        return lines
+    
+    assert asyncio.run(main()) == 3
+
+def test_at_most_one_batch_is_not_on_disk(tmp_path: Path, scraped):
+    result, _, _ = scraped
+    
+    class SlowSink(JSONLSink):
+        def _write_batch(self, batch: list) -> None:
+            time.sleep(0.02)
+            super()._write_batch(batch)
+    
+    async def main():
+        unwritten: list[int] = []
+        async with SlowSink(tmp_path / "out.jsonl", batch_size=10, flush_interval=0.01, fsync=False) as sink:
+            for count, torrent in enumerate(result.torrents, 1):
+                await sink.write(torrent)
+                unwritten.append(count - sink.written)
+                await asyncio.sleep(0.002)
+        return unwritten, sink.written
+    
+    unwritten, written = asyncio.run(main())
+    assert written == 75
+    assert max(unwritten) <= 10
+
+@pytest.mark.skipif(export.pyarrow is None, reason="pyarrow is not installed")
+def test_parquet_writes_typed_utc_columns(tmp_path: Path, scraped):
+    import pyarrow.parquet
+    
+    _, _, feed = scraped
+    torrents = [*feed.torrents[:-1], replace(feed.torrents[-1], published_parsed=None)]
+    asyncio.run(export_records(ParquetSink(tmp_path, batch_size=30), torrents))
+    
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+    table = pyarrow.parquet.read_table(tmp_path)
+    assert table.num_rows == 75
+    # Parquet has no unit of seconds, so they are stored as milliseconds.
+    assert table.schema.field("timestamp").type.tz == "UTC"
+    assert table.schema.field("seeders").type == pyarrow.int64()
+    
+    timestamps: list = table.column("timestamp").to_pylist()
+    published = feed.torrents[0].published_parsed
+    assert timestamps[0] == datetime(*published[:6], tzinfo=timezone.utc)
+    assert timestamps[-1] is None
+    
+    # Continues after the files of a previous run.
+    asyncio.run(export_records(ParquetSink(tmp_path), torrents[:1]))
+    assert (tmp_path / "part-00003.parquet").exists()
+    
+    # Numbering continues after the highest index, even with a gap left by a deleted file.
+    (tmp_path / "part-00000.parquet").unlink()
+    asyncio.run(export_records(ParquetSink(tmp_path), torrents[:2]))
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"part-0000{index}.parquet" for index in (1, 2, 3, 4)]
+    assert pyarrow.parquet.read_table(tmp_path / "part-00003.parquet").num_rows == 1
\ No newline at end of file
@@ -0,0 +1,119 @@
+from datetime import datetime
+
+import pytest
+
+from nyaascraper import StatsHistory
+from nyaascraper.models import SearchResult, StatsSnapshot, TrendingTorrent
+
+HOUR: float = 3600.0
+
+def at(hours: float) -> datetime:
+    return datetime.utcfromtimestamp(hours * HOUR)
+
+def filled() -> StatsHistory:
+    history = StatsHistory()
+    history.add(5, 1, 2, 10, at=0)
+    history.add(3, 1, 1, 0, at=10)
+    history.add(5, 2, 2, 15, at=HOUR + 5)
+    history.add(3, 1, 1, 0, at=HOUR)
+    history.add(5, 0, 1, 30, at=2 * HOUR)
+    history.add(7, 9, 9, 100, at=2 * HOUR)
+    return history
+
+def test_history_rebuilds_counts_from_deltas():
+    history = filled()
+    assert history.history(5) == [
+        StatsSnapshot(at(0), 1, 2, 10),
+        StatsSnapshot(at(1), 2, 2, 15),
+        StatsSnapshot(at(2), 0, 1, 30)
+    ]
+    # Unchanged counts are not stored again.
+    assert history.history(3) == [StatsSnapshot(at(0), 1, 1, 0)]
+    assert history.history(7) == [StatsSnapshot(at(2), 9, 9, 100)]
+    assert history.history(4) == []
+    assert history.latest(5) == StatsSnapshot(at(2), 0, 1, 30)
+    assert history.latest(4) is None
+    assert len(history) == 3
+    
+    before: list[StatsSnapshot] = history.history(5)
+    history.seal()
+    assert history.history(5) == before
+    assert history.latest(3) == StatsSnapshot(at(0), 1, 1, 0)
+
+def test_new_torrents_with_lower_view_ids_are_merged_in_order():
+    history = StatsHistory()
+    history.add(10, 1, 1, 1, at=0)
+    history.add(2, 1, 1, 1, at=HOUR)
+    history.add(10, 2, 1, 1, at=2 * HOUR)
+    history.add(2, 3, 1, 1, at=2 * HOUR)
+    history.seal()
+    assert [snapshot.seeders for snapshot in history.history(2)] == [1, 3]
+    assert [snapshot.seeders for snapshot in history.history(10)] == [1, 2]
+    assert history.history(2)[0].timestamp == at(1)
+
+def test_trending_counts_completions_over_the_period():
+    history = filled()
+    now: float = 2 * HOUR + 10
+    # New torrents only count the times they were completed after they were first seen.
+    assert history.trending(hours=1, now=now) == [TrendingTorrent(5, 20, 0, 1, 30)]
+    # Buckets count whole as soon as they overlap the period.
+    assert history.trending(hours=0.5, now=now) == [TrendingTorrent(5, 20, 0, 1, 30)]
+    assert history.trending(hours=0.5, now=2.9 * HOUR) == [TrendingTorrent(5, 15, 0, 1, 30)]
+    history.seal()
+    assert history.trending(hours=3, now=now) == [TrendingTorrent(5, 20, 0, 1, 30)]
+    assert history.trending(hours=1, now=10 * HOUR) == []
+
+def test_trending_keeps_the_top_k():
+    history = StatsHistory()
+    for view_id in range(20):
+        history.add(view_id, 0, 0, 0, at=0)
+    for view_id in range(20):
+        history.add(view_id, 0, 0, view_id, at=HOUR)
+    top: list[TrendingTorrent] = history.trending(hours=2, k=3, now=HOUR)
+    assert [torrent.view_id for torrent in top] == [19, 18, 17]
+
+def test_retention_drops_old_buckets():
+    history = StatsHistory(retention=2 * HOUR)
+    for hour in range(5):
+        history.add(1, hour, 0, hour, at=hour * HOUR)
+    history.seal()
+    snapshots: list[StatsSnapshot] = history.history(1)
+    # The counts before the oldest bucket kept are dated to the last bucket dropped.
+    assert [snapshot.timestamp for snapshot in snapshots] == [at(1), at(2), at(3), at(4)]
+    assert [snapshot.seeders for snapshot in snapshots] == [1, 2, 3, 4]
+    assert history.latest(1) == StatsSnapshot(at(4), 4, 0, 4)
+
+def test_record_skips_stale_results():
+    result = SearchResult(torrents=[], displaying_from=0, displaying_to=0, total_results=0, current_page=1)
+    result.stale = True
+    history = StatsHistory()
+    assert history.record(result) == 0
+    assert len(history) == 0
+
+def test_save_and_load_round_trip(tmp_path):
+    history = filled()
+    history.add(2, 4, 4, 4, at=2 * HOUR)
+    path = tmp_path / "history.bin"
+    history.save(path)
+    
+    loaded: StatsHistory = StatsHistory.load(path)
+    for view_id in (2, 3, 5, 7):
+        assert loaded.history(view_id) == history.history(view_id)
+    assert loaded.trending(hours=3, now=2 * HOUR) == history.trending(hours=3, now=2 * HOUR)
+    assert len(loaded) == len(history)
+    assert not (tmp_path / "history.bin.part").exists()
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "history.bin"
+    filled().save(path)
+    data: bytes = path.read_bytes()
+    
+    path.write_bytes(b"PK" + data[2:])
+    with pytest.raises(ValueError, match="Not a stats history"):
+        StatsHistory.load(path)
+    path.write_bytes(data[:2] + b"\x09" + data[3:])
+    with pytest.raises(ValueError, match="version 9"):
+        StatsHistory.load(path)
+    path.write_bytes(data[:-3])
+    with pytest.raises(ValueError, match="Truncated"):
+        StatsHistory.load(path)
\ No newline at end of file
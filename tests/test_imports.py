@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.import_time import CASES, ROOT
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_statement_does_not_import_heavy_modules(name: str):
+    statement, forbidden, _ = CASES[name]
+    check: str = f"import sys; print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-c", f"{statement}\n{check}"],
+        cwd=ROOT / "src",
+        capture_output=True,
+        text=True,
+        check=True
+        )
+    assert completed.stdout.strip() == ""
+
+def test_lazy_attributes_resolve():
+    import nyaascraper
+    import nyaascraper.enums
+    import nyaascraper.utils
+    
+    for module in (nyaascraper, nyaascraper.enums, nyaascraper.utils):
+        for name in module._LAZY_ATTRIBUTES:
+            assert getattr(module, name) is not None, name
\ No newline at end of file
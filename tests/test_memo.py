@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+
+from nyaascraper import NyaaClient, ParseMemo
+from nyaascraper.circuit import StaleCache
+
+from benchmarks.server import FIXTURES_DIR
+from tests.conftest import mock_client
+
+def test_memo_hit_returns_own_model(make_client):
+    async def main():
+        memo = ParseMemo()
+        client = make_client(NyaaClient, memo=memo)
+        first = await client.search(term="frieren")
+        second = await client.search(term="frieren")
+        
+        assert memo.hits == 1 and memo.misses == 1
+        assert first is not second
+        assert first == second
+        assert first.torrents[0] is not second.torrents[0]
+        
+        first.torrents.clear()
+        second.torrents[0].name = "changed"
+        third = await client.search(term="frieren")
+        assert len(third.torrents) == 75
+        assert third.torrents[0].name != "changed"
+    
+    asyncio.run(main())
+
+def test_memo_evicts_least_recently_used():
+    memo = ParseMemo(max_size=10)
+    memo.put(("search", "a"), [1], 4)
+    memo.put(("search", "b"), [2], 4)
+    assert memo.get(("search", "a")) == [1]
+    memo.put(("search", "c"), [3], 4)
+    
+    assert memo.get(("search", "b")) is None
+    assert memo.get(("search", "a")) == [1]
+    assert memo.size == 8 and len(memo) == 2
+    
+    memo.put(("search", "d"), [4], 11)
+    assert memo.get(("search", "d")) is None
+
+def test_memo_put_copies_model():
+    memo = ParseMemo()
+    model: list[int] = [1, 2]
+    memo.put(("search", "a"), model, 1)
+    model.append(3)
+    assert memo.get(("search", "a")) == [1, 2]
+
+def test_stale_result_does_not_mark_memoized_model():
+    body: bytes = (FIXTURES_DIR / "search_fun.html").read_bytes()
+    failing: list[bool] = [False]
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        if failing[0]:
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200, content=body)
+    
+    async def main():
+        client = mock_client(NyaaClient, handler, memo=ParseMemo(), stale_cache=StaleCache())
+        fresh = await client.search(term="frieren")
+        failing[0] = True
+        stale = await client.search(term="frieren")
+        failing[0] = False
+        again = await client.search(term="frieren")
+        
+        assert not fresh.stale
+        assert stale.stale
+        assert not again.stale
+        assert stale.torrents is not again.torrents
+    
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from nyaascraper import HistogramMetrics, NyaaClient, NyaaRSSClient
+from nyaascraper.metrics import RequestTrace
+
+from tests.conftest import mock_client
+
+def test_clients_report_phases_and_counters(make_client):
+    async def main():
+        metrics = HistogramMetrics()
+        client = make_client(NyaaClient, metrics=metrics)
+        await client.search(term="frieren")
+        await client.get_torrent_info(1)
+        await make_client(NyaaRSSClient, metrics=metrics).get_feed()
+        return metrics
+    
+    metrics: HistogramMetrics = asyncio.run(main())
+    summary = metrics.summary()
+    for endpoint in ("search", "view", "rss"):
+        assert {"total", "parse", "extract"} <= summary[endpoint].keys()
+        assert metrics.get_count(endpoint, "requests") == 1
+        assert metrics.get_count(endpoint, "bytes_received") > 0
+    assert metrics.get_count("search", "rows") == 75
+    assert metrics.get_count("rss", "rows") == 75
+
+def test_errors_are_counted():
+    metrics = HistogramMetrics()
+    client = mock_client(NyaaClient, lambda request: httpx.Response(503), metrics=metrics)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.search(term="frieren"))
+    
+    assert metrics.get_count("search", "requests") == 1
+    assert metrics.get_count("search", "errors") == 1
+    assert metrics.percentile("search", "total", 50) is not None
+    assert metrics.percentile("search", "parse", 50) is None
+
+def test_request_trace_reports_connection_phases():
+    trace = RequestTrace()
+    trace.started_ns = 0
+    trace.events = {
+        "connect_tcp.started": 10,
+        "connect_tcp.complete": 30,
+        "send_request_headers.started": 40,
+        "send_request_body.complete": 50,
+        "receive_response_headers.complete": 150,
+        "receive_response_body.started": 150,
+        "receive_response_body.complete": 200
+    }
+    metrics = HistogramMetrics()
+    trace.report(metrics, "search")
+    
+    timings = {phase: metrics.percentile("search", phase, 100) for phase in ("pool_wait", "connect", "tls", "send", "server", "transfer", "total")}
+    assert timings == {
+        "pool_wait": 10e-9,
+        "connect": 20e-9,
+        "tls": None,
+        "send": 10e-9,
+        "server": 100e-9,
+        "transfer": 50e-9,
+        "total": 200e-9
+    }
+
+def test_histogram_percentiles_keep_recent_samples():
+    metrics = HistogramMetrics(max_samples=100)
+    for milliseconds in range(1, 201):
+        metrics.timing("search", "total", 0, milliseconds * 1_000_000)
+    
+    assert metrics.percentile("search", "total", 0) == 0.101
+    assert metrics.percentile("search", "total", 50) == 0.15
+    assert metrics.percentile("search", "total", 100) == 0.2
+    assert metrics.summary()["search"]["total"]["count"] == 100
+    
+    metrics.reset()
+    assert metrics.summary() == {}
\ No newline at end of file
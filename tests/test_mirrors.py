@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+
+from nyaascraper import NyaaClient, MirrorPool
+from nyaascraper.enums import SITE
+
+from benchmarks.server import FIXTURES_DIR
+from tests.conftest import mock_client
+
+SEARCH_PAGE: bytes = (FIXTURES_DIR / "search_fun.html").read_bytes()
+
+def mirror_handler(hits: list[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits.append(request.url.host)
+        if request.url.host == "overloaded.example":
+            return httpx.Response(503)
+        if request.url.host == "dead.example":
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200, content=SEARCH_PAGE)
+    
+    return handler
+
+def test_requests_fail_over_and_models_use_the_primary():
+    hits: list[str] = []
+    pool = MirrorPool(["https://overloaded.example", "https://dead.example", "https://good.example"], health_check_interval=None)
+    client = mock_client(NyaaClient, mirror_handler(hits), mirrors={SITE.FUN: pool})
+    
+    async def main():
+        return [await client.search(term="frieren") for _ in range(3)]
+    
+    results = asyncio.run(main())
+    # Both failing base URLs are down after two failures each, so the last search goes to the good one right away.
+    assert hits == ["overloaded.example", "dead.example", "good.example"] * 2 + ["good.example"]
+    assert results[-1].torrents[0].torrent_url.startswith("https://overloaded.example/")
+    
+    stats = {mirror.url: mirror for mirror in pool.stats()}
+    assert not stats["https://overloaded.example"].healthy
+    assert not stats["https://dead.example"].healthy
+    assert stats["https://good.example"].healthy and stats["https://good.example"].latency is not None
+    assert all(mirror.in_flight == 0 for mirror in stats.values())
+
+def test_error_is_raised_when_every_base_url_fails():
+    hits: list[str] = []
+    pool = MirrorPool(["https://overloaded.example", "https://dead.example"], health_check_interval=None)
+    client = mock_client(NyaaClient, mirror_handler(hits), mirrors={SITE.FUN: pool})
+    
+    try:
+        asyncio.run(client.search(term="frieren"))
+    except httpx.HTTPError:
+        pass
+    else:
+        raise AssertionError("The search did not fail")
+    assert hits == ["overloaded.example", "dead.example"]
+
+def test_route_prefers_unmeasured_then_fastest():
+    pool = MirrorPool(["https://a.example", "https://b.example", "https://c.example"], max_failures=1)
+    for url, latency in (("https://a.example", 0.3), ("https://b.example", 0.1)):
+        pool.started(url)
+        pool.succeeded(url, latency)
+    assert pool.route() == ["https://c.example", "https://b.example", "https://a.example"]
+    
+    pool.started("https://c.example")
+    pool.failed("https://c.example")
+    assert pool.route() == ["https://b.example", "https://a.example", "https://c.example"]
+
+def test_health_check_brings_base_url_back():
+    up: list[bool] = [False]
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200) if up[0] else httpx.Response(503)
+    
+    async def main():
+        pool = MirrorPool(["https://a.example"], max_failures=1)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            await pool.check(http_client)
+            healthy_while_down: bool = pool.stats()[0].healthy
+            up[0] = True
+            await pool.check(http_client)
+        return healthy_while_down, pool.stats()[0]
+    
+    healthy_while_down, stats = asyncio.run(main())
+    assert not healthy_while_down
+    assert stats.healthy and stats.failures == 0 and stats.latency is not None
\ No newline at end of file
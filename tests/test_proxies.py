@@ -0,0 +1,196 @@
+from contextlib import asynccontextmanager
+import asyncio
+import socket
+import time
+
+import httpx
+import pytest
+
+from nyaascraper import NyaaClient, MirrorPool, ProxyPool
+from nyaascraper.enums import SITE
+from nyaascraper.exceptions import DeadlineExceededError
+
+from benchmarks.proxy import ProxyStandIn, ProxyStandInConfig
+
+def dead_proxy() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+def proxied_client(proxies: ProxyPool, direct: list[str], mirrors: list[str] = ["http://nyaa.test"], health_check_interval: float | None = None) -> NyaaClient:
+    """
+    Build a client sending its requests through proxies to the plain HTTP base URLs of a mirror pool, recording any request sent directly.
+    """
+    def handler(request: httpx.Request) -> httpx.Response:
+        direct.append(f"{request.method} {request.url}")
+        raise httpx.ConnectError("sent without a proxy", request=request)
+    
+    client = NyaaClient(mirrors={SITE.FUN: MirrorPool(mirrors, health_check_interval=health_check_interval)}, proxies=proxies)
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+@pytest.mark.parametrize("status", [429, 403])
+def test_throttled_proxies_are_quarantined(status):
+    direct: list[str] = []
+    
+    async def main():
+        async with ProxyStandIn(ProxyStandInConfig(status=status, retry_after="120")) as throttled, ProxyStandIn() as good:
+            proxies = ProxyPool([throttled.url, good.url], rate=None, quarantine=1.0)
+            client = proxied_client(proxies, direct)
+            results = [await client.search(term="frieren") for _ in range(4)]
+            await client.aclose()
+            await proxies.aclose()
+            return results, proxies.stats(), len(throttled.requests), len(good.requests)
+    
+    results, (throttled_stats, good_stats), throttled_requests, good_requests = asyncio.run(main())
+    assert all(result.torrents for result in results)
+    # Sent again through the other proxy, and the throttled one is left alone for the Retry-After time.
+    assert (throttled_requests, good_requests) == (1, 4)
+    assert not throttled_stats.healthy and throttled_stats.throttled == 1 and throttled_stats.quarantined == 1
+    assert good_stats.healthy and good_stats.throttled == 0
+    assert direct == []
+
+def test_requests_fail_over_from_a_dead_proxy():
+    direct: list[str] = []
+    dead: str = dead_proxy()
+    
+    async def main():
+        async with ProxyStandIn() as good:
+            proxies = ProxyPool([dead, good.url], rate=None, max_failures=2)
+            client = proxied_client(proxies, direct)
+            results = [await client.search(term="frieren") for _ in range(3)]
+            await client.aclose()
+            await proxies.aclose()
+            return results, proxies.stats(), len(good.requests)
+    
+    results, (dead_stats, good_stats), good_requests = asyncio.run(main())
+    assert all(result.torrents for result in results)
+    # Quarantined after two connection errors in a row, so the third request goes to the good proxy only.
+    assert (dead_stats.requests, good_requests) == (2, 3)
+    assert not dead_stats.healthy and dead_stats.failures == 2 and dead_stats.throttled == 0
+    assert good_stats.healthy and good_stats.in_flight == 0
+    assert direct == []
+
+def test_each_proxy_has_its_own_budget():
+    direct: list[str] = []
+    
+    async def main():
+        async with ProxyStandIn() as first, ProxyStandIn() as second:
+            proxies = ProxyPool([first.url, second.url], rate=2.0, burst=1)
+            client = proxied_client(proxies, direct)
+            started: float = time.monotonic()
+            results = await asyncio.gather(*(client.search(term=f"term {i}") for i in range(6)))
+            elapsed: float = time.monotonic() - started
+            await client.aclose()
+            await proxies.aclose()
+            return results, elapsed, len(first.requests), len(second.requests)
+    
+    results, elapsed, first_requests, second_requests = asyncio.run(main())
+    assert all(result.torrents for result in results)
+    assert (first_requests, second_requests) == (3, 3)
+    # 1 request at once and 2 more at 2 per second through each proxy, rather than 5 more through a single one.
+    assert 0.95 <= elapsed < 2.0
+
+def test_deadline_passes_while_no_proxy_has_budget():
+    direct: list[str] = []
+    
+    async def main():
+        async with ProxyStandIn() as good:
+            proxies = ProxyPool([good.url], rate=1.0, burst=1)
+            client = proxied_client(proxies, direct)
+            await client.search(term="frieren")
+            with pytest.raises(DeadlineExceededError):
+                await client.search(term="frieren", deadline=time.monotonic() + 0.2)
+            await client.aclose()
+            await proxies.aclose()
+            return proxies.stats(), len(good.requests)
+    
+    (stats,), requests = asyncio.run(main())
+    assert requests == 1 and stats.in_flight == 0
+
+def test_acquire_falls_back_to_a_tried_proxy_rather_than_waiting():
+    async def main():
+        proxies = ProxyPool(["http://first.test:3128", "http://second.test:3128"], rate=None, quarantine=60.0)
+        proxies.throttled(await proxies.acquire(tried=["http://first.test:3128"]))
+        # The untried proxy is quarantined for a minute, while the tried one can send the request right away.
+        started: float = time.monotonic()
+        url: str = await proxies.acquire(deadline=time.monotonic() + 1.0, tried=["http://first.test:3128"])
+        elapsed: float = time.monotonic() - started
+        proxies.released(url)
+        await proxies.aclose()
+        return url, elapsed
+    
+    url, elapsed = asyncio.run(main())
+    assert url == "http://first.test:3128" and elapsed < 0.5
+
+def test_health_checks_give_up_while_every_proxy_is_quarantined():
+    direct: list[str] = []
+    
+    async def main():
+        async with ProxyStandIn(ProxyStandInConfig(status=429, retry_after="3600")) as throttled:
+            # The search takes the only request of the budget, so the health check waits, and the 429 quarantines the proxy meanwhile.
+            proxies = ProxyPool([throttled.url], rate=1.0, burst=1)
+            client = proxied_client(proxies, direct, ["http://nyaa.test", "http://mirror.test"], health_check_interval=0.0)
+            pool: MirrorPool = client.mirrors[SITE.FUN]
+            pool.HEALTH_CHECK_TIMEOUT = 0.5
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.search(term="frieren")
+            # Rather than waiting the hour the proxy is quarantined for.
+            await asyncio.wait_for(pool._health_check, 5.0)
+            await client.aclose()
+            await proxies.aclose()
+            return proxies.stats(), throttled.requests
+    
+    (proxy_stats,), requests = asyncio.run(main())
+    assert [method for method, _ in requests] == ["GET", "GET"] and direct == []
+    # The health check gave up without sending a request, and released nothing it did not take.
+    assert proxy_stats.quarantined == 1 and proxy_stats.in_flight == 0
+
+def test_mirror_health_checks_go_through_the_proxies():
+    direct: list[str] = []
+    
+    async def main():
+        async with ProxyStandIn() as good:
+            proxies = ProxyPool([good.url], rate=None)
+            client = proxied_client(proxies, direct, ["http://nyaa.test", "http://mirror.test"], health_check_interval=0.0)
+            await client.search(term="frieren")
+            await client.mirrors[SITE.FUN]._health_check
+            await client.aclose()
+            await proxies.aclose()
+            return good.requests, client.mirrors[SITE.FUN].stats(), proxies.stats()
+    
+    requests, mirror_stats, (proxy_stats,) = asyncio.run(main())
+    assert direct == []
+    assert sorted(request for request in requests if request[0] == "HEAD") == [("HEAD", "http://mirror.test/"), ("HEAD", "http://nyaa.test/")]
+    assert all(stats.healthy and stats.latency is not None for stats in mirror_stats)
+    assert proxy_stats.requests == 3 and proxy_stats.in_flight == 0
+
+def test_health_check_errors_are_raised_inside_the_egress():
+    errors: list[int] = []
+    
+    @asynccontextmanager
+    async def egress():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(403))) as http_client:
+            try:
+                yield http_client
+            except httpx.HTTPStatusError as error:
+                errors.append(error.response.status_code)
+                raise
+    
+    pool = MirrorPool(["http://nyaa.test"], health_check_interval=None)
+    asyncio.run(pool.check(egress))
+    (stats,) = pool.stats()
+    # The egress sees the 403 to quarantine its proxy, but the mirror answered, so it is healthy.
+    assert errors == [403]
+    assert stats.healthy and stats.failures == 0 and stats.latency is not None
+def test_proxy_stand_in_refuses_tunnels():
+    async def main():
+        async with ProxyStandIn() as proxy, httpx.AsyncClient(proxy=proxy.url) as client:
+            with pytest.raises(httpx.ProxyError):
+                await client.get("https://nyaa.si/")
+            return await client.get("http://nyaa.si/view/1"), proxy.requests
+    
+    response, requests = asyncio.run(main())
+    assert response.status_code == 200 and b"<html" in response.content.lower()
+    assert [method for method, _ in requests] == ["CONNECT", "GET"]
\ No newline at end of file
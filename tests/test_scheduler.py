@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from nyaascraper import RequestScheduler
+from nyaascraper.enums import Priority
+from nyaascraper.exceptions import DeadlineExceededError
+
+def test_cancelled_waiter_is_skipped_by_release():
+    async def main():
+        scheduler = RequestScheduler(max_concurrency=1)
+        await scheduler.acquire()
+        waiting = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        
+        # Released before the cancelled request runs again to remove itself from the queue.
+        waiting.cancel()
+        scheduler.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        
+        stats = scheduler.stats()[Priority.NORMAL]
+        assert (stats.in_flight, stats.queued, stats.dispatched) == (0, 0, 1)
+        await asyncio.wait_for(scheduler.acquire(), 1)
+        scheduler.release()
+    
+    asyncio.run(main())
+
+def test_interactive_requests_go_first():
+    async def main():
+        scheduler = RequestScheduler(max_concurrency=1)
+        order: list[str] = []
+        
+        async def request(priority: Priority, name: str) -> None:
+            async with scheduler.slot(priority):
+                order.append(name)
+                await asyncio.sleep(0)
+        
+        await scheduler.acquire()
+        tasks = [asyncio.create_task(request(Priority.BACKGROUND, f"b{index}")) for index in range(3)]
+        tasks += [asyncio.create_task(request(Priority.NORMAL, f"n{index}")) for index in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request(Priority.INTERACTIVE, "i")))
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+    
+    order: list[str] = asyncio.run(main())
+    assert order[0] == "i"
+    assert sorted(order) == ["b0", "b1", "b2", "i", "n0", "n1", "n2"]
+
+def test_classes_share_capacity_by_weight():
+    async def main():
+        scheduler = RequestScheduler(max_concurrency=1)
+        order: list[Priority] = []
+        
+        async def request(priority: Priority) -> None:
+            async with scheduler.slot(priority):
+                order.append(priority)
+                await asyncio.sleep(0)
+        
+        await scheduler.acquire()
+        tasks = [asyncio.create_task(request(priority)) for priority in (Priority.BACKGROUND, Priority.NORMAL) for _ in range(20)]
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+    
+    order: list[Priority] = asyncio.run(main())
+    assert order[:10].count(Priority.NORMAL) == 8
+
+def test_deadline_expires_queued_request():
+    async def main():
+        scheduler = RequestScheduler(max_concurrency=1)
+        await scheduler.acquire()
+        with pytest.raises(DeadlineExceededError):
+            await scheduler.acquire(deadline=time.monotonic() + 0.02)
+        with pytest.raises(DeadlineExceededError):
+            await scheduler.acquire(deadline=time.monotonic() - 1)
+        scheduler.release()
+        
+        stats = scheduler.stats()[Priority.NORMAL]
+        assert (stats.expired, stats.queued, stats.in_flight) == (2, 0, 0)
+    
+    asyncio.run(main())
+
+def test_rate_limit():
+    async def main():
+        scheduler = RequestScheduler(max_concurrency=10, rate=20, burst=2)
+        
+        async def request() -> None:
+            async with scheduler.slot():
+                pass
+        
+        started: float = time.monotonic()
+        await asyncio.gather(*(request() for _ in range(6)))
+        return time.monotonic() - started
+    
+    # The burst is sent at once, then one request every 50 ms.
+    assert 0.15 <= asyncio.run(main()) < 1.0
\ No newline at end of file
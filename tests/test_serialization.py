@@ -0,0 +1,100 @@
+from dataclasses import replace
+import asyncio
+import json
+import struct
+
+import pytest
+
+from nyaascraper import NyaaClient, NyaaRSSClient, SerializationFormat
+from nyaascraper import serialization
+from nyaascraper.enums import SITE, DownloadStatus
+from nyaascraper.exceptions import SerializationError
+from nyaascraper.models import File, Folder, DownloadResult
+
+FORMATS: list[SerializationFormat] = [SerializationFormat.JSON]
+if serialization.msgpack is not None:
+    FORMATS.append(SerializationFormat.MSGPACK)
+
+@pytest.fixture(scope="module")
+def scraped() -> dict[SITE, tuple]:
+    from benchmarks.server import NyaaStandIn
+    import httpx
+    
+    async def main():
+        models: dict[SITE, tuple] = {}
+        for site in SITE:
+            client = NyaaClient(site)
+            rss_client = NyaaRSSClient(site)
+            for each in (client, rss_client):
+                each._http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=NyaaStandIn()))
+            models[site] = (await client.search(term="frieren"), await client.get_torrent_info(1), await rss_client.get_feed())
+        return models
+    
+    return asyncio.run(main())
+
+def round_trip(model, format: SerializationFormat):
+    return type(model).from_bytes(model.to_bytes(format))
+
+def has_nested_folder(files) -> bool:
+    return any(isinstance(file, Folder) and any(isinstance(child, Folder) for child in file.files) for file in files)
+
+@pytest.mark.parametrize("format", FORMATS)
+@pytest.mark.parametrize("site", list(SITE))
+def test_scraped_models_round_trip(scraped, site: SITE, format: SerializationFormat):
+    result, info, feed = scraped[site]
+    assert has_nested_folder(info.files)
+    
+    for model in (result, result.torrents[0], info, info.submitter, info.comments[0], info.files[0], feed, feed.torrents[0]):
+        assert round_trip(model, format) == model
+    assert {torrent.category for torrent in round_trip(result, format).torrents} == {torrent.category for torrent in result.torrents}
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_folder_tree_round_trips(format: SerializationFormat):
+    tree = Folder("season", [File("a.mkv", "1 GiB"), Folder("extras", [Folder("empty", []), File("b.mkv", "2 MiB")])])
+    decoded = round_trip(tree, format)
+    assert decoded == tree
+    assert isinstance(decoded.files[1].files[0], Folder)
+    assert round_trip(File("c.mkv", "3 KiB"), format) == File("c.mkv", "3 KiB")
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_stale_flag_and_missing_published_date_round_trip(scraped, format: SerializationFormat):
+    result, info, feed = scraped[SITE.FUN]
+    for model in (replace(result, stale=True), replace(info, stale=True), replace(feed, stale=True)):
+        assert round_trip(model, format).stale
+    
+    torrent = replace(feed.torrents[0], published_parsed=None)
+    assert round_trip(torrent, format).published_parsed is None
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_download_result_round_trips(scraped, format: SerializationFormat):
+    _, info, feed = scraped[SITE.FAP]
+    downloaded = DownloadResult(info, info.info_hash, DownloadStatus.DOWNLOADED, 1234)
+    assert round_trip(downloaded, format) == downloaded
+    
+    failed = round_trip(DownloadResult(feed.torrents[0], None, DownloadStatus.FAILED, 0, ValueError("broken")), format)
+    assert failed.status is DownloadStatus.FAILED
+    assert str(failed.error) == "ValueError: broken"
+
+def test_schema_version_1_is_decoded(scraped):
+    result, info, feed = scraped[SITE.FUN]
+    for model, trim in ((result, 8), (info, 16), (feed, 3)):
+        data: bytes = model.to_bytes(SerializationFormat.JSON)
+        payload: list = json.loads(data[serialization.HEADER.size:])[:trim]
+        v1: bytes = serialization.HEADER.pack(serialization.MAGIC, 1, 0, data[4]) + json.dumps(payload).encode()
+        decoded = type(model).from_bytes(v1)
+        assert decoded == model
+        assert not decoded.stale
+
+def test_invalid_data_is_rejected(scraped):
+    data: bytes = scraped[SITE.FUN][0].to_bytes()
+    
+    with pytest.raises(SerializationError, match="Unknown schema version"):
+        serialization.from_bytes(data[:2] + struct.pack("!B", 255) + data[3:])
+    with pytest.raises(SerializationError, match="not a serialized model"):
+        serialization.from_bytes(b"XX" + data[2:])
+    with pytest.raises(SerializationError, match="shorter"):
+        serialization.from_bytes(data[:3])
+    with pytest.raises(SerializationError, match="Invalid payload"):
+        serialization.from_bytes(data[:serialization.HEADER.size] + b"[]")
+    with pytest.raises(TypeError):
+        serialization.to_bytes(object())
\ No newline at end of file
@@ -0,0 +1,166 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import httpx
+import pytest
+
+from nyaascraper import SyncNyaaClient, SyncNyaaRSSClient
+from nyaascraper.enums import SITE
+from nyaascraper.models import SearchResult, TorrentInfo
+
+from benchmarks.server import NyaaStandIn, StandInConfig
+
+def sync_client(client_class: type[SyncNyaaClient | SyncNyaaRSSClient], app=None, **kwargs) -> SyncNyaaClient | SyncNyaaRSSClient:
+    client = client_class(**kwargs)
+    client.async_client._http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app or NyaaStandIn()))
+    return client
+
+class Delayed:
+    """
+    Transport answering with the stand-in server after a delay, with 404 for the given View-IDs, and counting the requests in flight at once.
+    """
+    def __init__(self, delay: float, missing: set[str] = set()) -> None:
+        self.delay = delay
+        self.missing = missing
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self._stand_in = httpx.ASGITransport(app=NyaaStandIn())
+    
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if request.url.path.rsplit("/", 1)[-1] in self.missing:
+            return httpx.Response(404)
+        response: httpx.Response = await self._stand_in.handle_async_request(request)
+        await response.aread()
+        return response
+
+def client_threads() -> list[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name in ("nyaascraper-client", "nyaascraper-rss-client")]
+
+def test_blocking_calls_run_on_the_event_loop_thread():
+    with sync_client(SyncNyaaClient) as client:
+        result: SearchResult = client.search(term="frieren")
+        assert result.torrents
+        assert client.search_count(term="frieren") == result.total_results
+        assert client.search_exists(term="frieren")
+        assert client.get_torrent_info(1).name
+        
+        client.site = SITE.FAP
+        assert client.site is SITE.FAP and client.async_client.site is SITE.FAP
+        assert [thread.name for thread in client_threads()] == ["nyaascraper-client"]
+    assert client_threads() == []
+
+def test_batches_run_concurrently_and_keep_order():
+    with SyncNyaaClient() as client:
+        transport = Delayed(0.2, {"2", "3"})
+        client.async_client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+        results: list[TorrentInfo | Exception] = client.get_torrent_info_batch([1, 2, 3] * 2, concurrency=3, return_exceptions=True)
+        assert transport.max_in_flight == 3
+        assert [isinstance(result, httpx.HTTPStatusError) for result in results] == [False, True, True] * 2
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_torrent_info_batch([2, 3])
+        
+        transport.max_in_flight = 0
+        pages: list[SearchResult] = client.search_batch([{"term": "a"}, {"term": "b", "page": 2}, {"term": "c"}], concurrency=1)
+        assert len(pages) == 3 and all(page.torrents for page in pages)
+        assert transport.max_in_flight == 1
+
+def test_calls_from_many_threads_share_the_event_loop():
+    with SyncNyaaClient() as client:
+        transport = Delayed(0.5)
+        client.async_client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+        counts: list[int] = []
+        threads: list[threading.Thread] = [
+            threading.Thread(target=lambda: counts.append(client.search_count(term="frieren"))) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(counts) == 8
+        assert transport.max_in_flight == 8
+
+def test_iterators_are_closed_when_left_early():
+    with sync_client(SyncNyaaClient) as client:
+        torrents = client.iter_search(term="frieren", max_pages=3)
+        first = [next(torrents) for _ in range(5)]
+        torrents.close()
+        assert len(first) == 5
+        
+        async def pending() -> int:
+            return len(asyncio.all_tasks()) - 1
+        
+        assert client._runner.run(pending()) == 0
+
+def test_closed_client_and_calls_from_the_event_loop_raise():
+    client = sync_client(SyncNyaaClient)
+    
+    async def nested() -> SearchResult:
+        # A blocking call from the event loop thread would wait for itself forever.
+        return client.search(term="frieren")
+    
+    with pytest.raises(RuntimeError, match="event loop of the client"):
+        client._runner.run(nested())
+    
+    client.close()
+    client.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        client.search(term="frieren")
+
+def test_close_stops_the_event_loop_even_if_closing_the_client_fails():
+    client = sync_client(SyncNyaaClient)
+    
+    async def failing_aclose() -> None:
+        raise OSError("connection reset")
+    
+    client.async_client.aclose = failing_aclose
+    with pytest.raises(OSError):
+        client.close()
+    assert client._runner.stopped and client._runner.loop.is_closed()
+    assert not client_threads()
+
+def test_calls_racing_close_raise_instead_of_hanging():
+    client = sync_client(SyncNyaaClient)
+    outcomes: list[str] = []
+    
+    def call() -> None:
+        for _ in range(50):
+            try:
+                client._runner.run(asyncio.sleep(0.001))
+            except RuntimeError:
+                outcomes.append("closed")
+                return
+            except concurrent.futures.CancelledError:
+                outcomes.append("cancelled")
+                return
+        outcomes.append("done")
+    
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    client.close()
+    for thread in threads:
+        thread.join(timeout=5.0)
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(outcomes) == 8
+
+def test_rss_client():
+    stand_in = NyaaStandIn(StandInConfig())
+    with sync_client(SyncNyaaRSSClient, stand_in) as client:
+        feed = client.get_feed()
+        assert feed.torrents
+        feeds = client.get_feed_batch([{}, {"term": "frieren"}])
+        assert [len(batch_feed.torrents) for batch_feed in feeds] == [len(feed.torrents)] * 2
+        
+        requests: int = stand_in.requests
+        watched = client.watch(interval=0.01)
+        assert next(watched).view_id
+        watched.close()
+        assert stand_in.requests == requests + 1
\ No newline at end of file